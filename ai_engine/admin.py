@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import AIModel, AIPrediction, AIAnalysisSession, AILearningData, AIInsight
+from .models import AIModel, AIPrediction, AIAnalysisSession, AILearningData, AIInsight, AIResponseCache, GeminiUsage
 
 
 @admin.register(AIModel)
@@ -37,4 +37,19 @@ class AIInsightAdmin(admin.ModelAdmin):
     list_display = ['title', 'insight_type', 'importance_level', 'confidence_level', 'is_implemented', 'created_at']
     list_filter = ['insight_type', 'importance_level', 'is_implemented']
     search_fields = ['title', 'description']
-    date_hierarchy = 'created_at'
\ No newline at end of file
+    date_hierarchy = 'created_at'
+
+
+@admin.register(AIResponseCache)
+class AIResponseCacheAdmin(admin.ModelAdmin):
+    list_display = ['key', 'model_name', 'created_at', 'expires_at']
+    list_filter = ['model_name']
+    search_fields = ['key', 'response_text']
+    date_hierarchy = 'created_at'
+
+
+@admin.register(GeminiUsage)
+class GeminiUsageAdmin(admin.ModelAdmin):
+    list_display = ['date', 'model_name', 'requests', 'failed_requests', 'limited_requests', 'prompt_tokens', 'response_tokens']
+    list_filter = ['model_name']
+    date_hierarchy = 'date'
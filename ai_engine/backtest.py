@@ -0,0 +1,292 @@
+"""
+AI Backtest Module
+Replays sensor and weather history through the predictors and scores them against what actually happened.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+from django.conf import settings
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from controller.models import IrrigationEvent as ControllerIrrigationEvent
+from plant.models import IrrigationEvent as PlantIrrigationEvent
+from sensor.models import LATEST_READING_MAX_AGE, Sensor, SensorReading, SensorReadingHourly, WeatherData
+
+from .models import AIModel, AIPrediction
+from .predictors import irrigation_predictor
+from .snapshot import PREDICTOR_FEATURE_DEFAULTS, PREDICTOR_FEATURE_SENSOR_TYPES, sensor_key
+
+logger = logging.getLogger(__name__)
+
+BACKTEST_SETTINGS = getattr(settings, 'AI_BACKTEST', {})
+STEP_MINUTES = BACKTEST_SETTINGS.get('STEP_MINUTES', 60)
+HORIZON_HOURS = BACKTEST_SETTINGS.get('HORIZON_HOURS', 6)
+WINDOW_DAYS = BACKTEST_SETTINGS.get('WINDOW_DAYS', 7)
+DEFAULT_DAYS = BACKTEST_SETTINGS.get('DEFAULT_DAYS', 30)
+
+# Bucket size of SensorReadingHourly, the replay source once raw readings are pruned
+ROLLUP_RESOLUTION = timedelta(hours=1)
+
+# Same decision thresholds as the live predictors
+NEED_IRRIGATION_THRESHOLD = 0.7  # IrrigationPredictor: irrigation_score > 0.7
+AT_RISK_THRESHOLD = 0.6  # PlantHealthAnalyzer: health score below 'O'rtacha'
+
+# Events whose irrigation actually started (a failed run still shows the need was there)
+OUTCOME_STATUSES = ('in_progress', 'running', 'completed', 'failed')
+
+# Per model type: which stored predictions have outcomes, and when a value counts as positive
+MODEL_BACKTESTS = {
+    'irrigation_predictor': {
+        'prediction_type': 'irrigation_need',
+        'positive': lambda values: values > NEED_IRRIGATION_THRESHOLD,
+        'replay': True,
+    },
+    'plant_health': {
+        'prediction_type': 'plant_health_risk',
+        'positive': lambda values: values < AT_RISK_THRESHOLD,
+        'replay': False,  # Needs plant history, which is not stored
+    },
+}
+
+
+def classification_metrics(tp: int, fp: int, fn: int, tn: int) -> Dict:
+    """Confusion counts plus accuracy, precision, recall and F1 in percent (AIModel's scale)"""
+    samples = tp + fp + fn + tn
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        'samples': samples,
+        'true_positives': tp,
+        'false_positives': fp,
+        'false_negatives': fn,
+        'true_negatives': tn,
+        'accuracy': round((tp + tn) / samples * 100, 2) if samples else 0.0,
+        'precision': round(precision * 100, 2),
+        'recall': round(recall * 100, 2),
+        'f1_score': round(f1 * 100, 2),
+    }
+
+
+def _confusion(predicted, actual):
+    return (
+        int((predicted & actual).sum()), int((predicted & ~actual).sum()),
+        int((~predicted & actual).sum()), int((~predicted & ~actual).sum()),
+    )
+
+
+def _epoch(values):
+    return np.array([value.timestamp() for value in values], dtype=float)
+
+
+def _irrigation_start_times(start: datetime, end: datetime):
+    """Sorted epoch start times of irrigation that happened, from both event tables"""
+    plant_events = PlantIrrigationEvent.objects.filter(status__in=OUTCOME_STATUSES).annotate(
+        started=Coalesce('start_time', 'scheduled_time')
+    ).filter(started__gte=start, started__lt=end).values_list('started', flat=True)
+    system_events = ControllerIrrigationEvent.objects.filter(status__in=OUTCOME_STATUSES).annotate(
+        started=Coalesce('actual_start', 'scheduled_start')
+    ).filter(started__gte=start, started__lt=end).values_list('started', flat=True)
+    return np.sort(_epoch([*plant_events, *system_events]))
+
+
+def _first_raw_times(sensor_ids) -> Dict[int, float]:
+    """Epoch of each sensor's oldest raw reading, i.e. where retention pruning stopped (one index lookup each)"""
+    first = {}
+    for sensor_id in sensor_ids:
+        timestamp = SensorReading.objects.filter(sensor_id=sensor_id).order_by('timestamp').values_list(
+            'timestamp', flat=True
+        ).first()
+        if timestamp is not None:
+            first[sensor_id] = timestamp.timestamp()
+    return first
+
+
+def replay_irrigation_predictor(start: datetime, end: datetime, step: timedelta = timedelta(minutes=STEP_MINUTES),
+                                horizon: timedelta = timedelta(hours=HORIZON_HOURS),
+                                window: timedelta = timedelta(days=WINDOW_DAYS),
+                                max_age: timedelta = LATEST_READING_MAX_AGE) -> Dict:
+    """
+    Replay sensor history through IrrigationPredictor and compare with irrigation that followed
+
+    Every step between start and end the snapshot is rebuilt as it was then:
+    the newest reading (at most max_age old) of each input sensor type and
+    the latest weather rainfall. Readings are streamed in time order one
+    window at a time, and each window is scored with the vectorized batch
+    scorer. A step is positive when an irrigation event started within
+    horizon after it; steps without a soil moisture reading are skipped.
+
+    Raw readings older than their type's raw_retention_days are pruned, so
+    before a sensor's oldest raw reading its hourly rollups stand in: each
+    bucket's average counts as a reading at the end of the hour, valid for
+    one hour. Long backtests are therefore limited by hourly retention, not
+    raw retention.
+
+    Returns:
+        dict: classification_metrics() plus 'steps', 'skipped_steps' and
+        'rollup_steps' (steps scored from hourly rollups)
+    """
+    feature_by_type = {
+        type_key: feature
+        for feature, type_keys in PREDICTOR_FEATURE_SENSOR_TYPES.items()
+        for type_key in type_keys
+    }
+    sensor_features = {}
+    for sensor_id, type_name in Sensor.objects.values_list('id', 'sensor_type__name'):
+        feature = feature_by_type.get(sensor_key(type_name))
+        if feature:
+            sensor_features[sensor_id] = feature
+
+    first_raw = _first_raw_times(sensor_features)
+
+    weather = list(WeatherData.objects.filter(timestamp__lt=end).order_by('timestamp').values_list('timestamp', 'rainfall'))
+    weather_times = _epoch(row[0] for row in weather)
+    weather_rainfall = np.array([row[1] for row in weather], dtype=float)
+    events = _irrigation_start_times(start, end + horizon)
+
+    all_steps = np.arange(start.timestamp(), end.timestamp(), step.total_seconds())
+    tp = fp = fn = tn = skipped = from_rollups = 0
+    window_start = start
+    while window_start < end:
+        window_end = min(window_start + window, end)
+        grid = all_steps[(all_steps >= window_start.timestamp()) & (all_steps < window_end.timestamp())]
+
+        # Points of this window (plus the lookback before it, for the first steps): time, value, max age, rollup?
+        points = {feature: ([], [], [], []) for feature in PREDICTOR_FEATURE_SENSOR_TYPES}
+        rows = SensorReading.objects.filter(
+            sensor_id__in=list(sensor_features), timestamp__gte=window_start - max_age, timestamp__lt=window_end
+        ).order_by('timestamp').values_list('sensor_id', 'timestamp', 'value')
+        for sensor_id, timestamp, value in rows.iterator(chunk_size=5000):
+            times, values, ages, rollup = points[sensor_features[sensor_id]]
+            times.append(timestamp.timestamp())
+            values.append(value)
+            ages.append(max_age.total_seconds())
+            rollup.append(False)
+
+        # Hourly averages of sensors whose raw readings of this window were pruned
+        pruned = [
+            sensor_id for sensor_id in sensor_features
+            if first_raw.get(sensor_id, float('inf')) > (window_start - ROLLUP_RESOLUTION).timestamp()
+        ]
+        if pruned:
+            buckets = SensorReadingHourly.objects.filter(
+                sensor_id__in=pruned, bucket__gte=window_start - 2 * ROLLUP_RESOLUTION, bucket__lt=window_end
+            ).values_list('sensor_id', 'bucket', 'value_sum', 'count')
+            for sensor_id, bucket, value_sum, count in buckets.iterator(chunk_size=5000):
+                bucket_end = (bucket + ROLLUP_RESOLUTION).timestamp()
+                if not count or bucket_end > first_raw.get(sensor_id, float('inf')):
+                    continue  # Raw readings cover this hour
+                times, values, ages, rollup = points[sensor_features[sensor_id]]
+                times.append(bucket_end)
+                values.append(value_sum / count)
+                ages.append(ROLLUP_RESOLUTION.total_seconds())
+                rollup.append(True)
+
+        columns = {}
+        present = {}
+        sourced_from_rollup = {}
+        for feature, (times, values, ages, rollup) in points.items():
+            order = np.argsort(np.array(times, dtype=float), kind='stable')
+            times, values = np.array(times, dtype=float)[order], np.array(values, dtype=float)[order]
+            ages, rollup = np.array(ages, dtype=float)[order], np.array(rollup, dtype=bool)[order]
+            index = np.searchsorted(times, grid, side='right') - 1
+            found = index >= 0
+            found[found] = grid[found] - times[index[found]] <= ages[index[found]]
+            present[feature] = found
+            sourced_from_rollup[feature] = found & (rollup[np.maximum(index, 0)] if len(rollup) else False)
+            columns[feature] = np.where(found, values[np.maximum(index, 0)] if len(values) else 0,
+                                        PREDICTOR_FEATURE_DEFAULTS[feature])
+
+        weather_index = np.searchsorted(weather_times, grid, side='right') - 1
+        rainfall = np.where(weather_index >= 0, weather_rainfall[np.maximum(weather_index, 0)] if len(weather) else 0, 0)
+
+        scores = irrigation_predictor._calculate_irrigation_score_batch(
+            columns['soil_moisture'], columns['air_humidity'], columns['temperature'], rainfall
+        )
+        irrigated = np.searchsorted(events, grid + horizon.total_seconds(), side='right') > \
+            np.searchsorted(events, grid, side='right')
+
+        evaluable = present['soil_moisture']
+        skipped += int((~evaluable).sum())
+        from_rollups += int(sourced_from_rollup['soil_moisture'].sum())
+        counts = _confusion(scores[evaluable] > NEED_IRRIGATION_THRESHOLD, irrigated[evaluable])
+        tp, fp, fn, tn = (total + count for total, count in zip((tp, fp, fn, tn), counts))
+
+        window_start = window_end
+
+    return {
+        **classification_metrics(tp, fp, fn, tn),
+        'steps': len(all_steps), 'skipped_steps': skipped, 'rollup_steps': from_rollups,
+    }
+
+
+def score_validated_predictions(model_type: str, start: datetime, end: datetime) -> Dict:
+    """Compare stored predictions of a model type with their recorded actual_outcome"""
+    spec = MODEL_BACKTESTS[model_type]
+    rows = np.array(list(AIPrediction.objects.filter(
+        model__model_type=model_type, prediction_type=spec['prediction_type'],
+        actual_outcome__isnull=False, created_at__gte=start, created_at__lt=end
+    ).values_list('prediction_value', 'actual_outcome')), dtype=float).reshape(-1, 2)
+    return classification_metrics(*_confusion(spec['positive'](rows[:, 0]), spec['positive'](rows[:, 1])))
+
+
+def run_backtest(model_type: str, days: int = DEFAULT_DAYS, end: Optional[datetime] = None, **replay_options) -> Dict:
+    """
+    Backtest one model type over the last days of history
+
+    Args:
+        model_type (str): A key of MODEL_BACKTESTS
+        days (int): Length of the history to evaluate
+        end (datetime): End of the history (default: now)
+        **replay_options: step / horizon / window / max_age for replay_irrigation_predictor
+
+    Returns:
+        dict: 'replay' and 'validated_predictions' metrics and their 'combined' metrics
+    """
+    if model_type not in MODEL_BACKTESTS:
+        raise ValueError(f'No backtest for model type: {model_type}')
+
+    end = end or timezone.now()
+    start = end - timedelta(days=days)
+    started = time.monotonic()
+
+    results = {'validated_predictions': score_validated_predictions(model_type, start, end)}
+    if MODEL_BACKTESTS[model_type]['replay']:
+        # Leave room for the outcome horizon after the last replayed step
+        horizon = replay_options.get('horizon', timedelta(hours=HORIZON_HOURS))
+        results['replay'] = replay_irrigation_predictor(start, end - horizon, **replay_options)
+
+    counts = [
+        sum(result[key] for result in results.values())
+        for key in ('true_positives', 'false_positives', 'false_negatives', 'true_negatives')
+    ]
+    results['combined'] = classification_metrics(*counts)
+
+    elapsed = time.monotonic() - started
+    logger.info(f"Backtest {model_type} ({days} days): {results['combined']['samples']} samples in {elapsed:.1f}s")
+    return {
+        'model_type': model_type,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        **results,
+        'elapsed_seconds': round(elapsed, 2),
+    }
+
+
+def apply_backtest(ai_model: AIModel, result: Dict) -> AIModel:
+    """Store a backtest's combined metrics on the AIModel row"""
+    combined = result['combined']
+    ai_model.accuracy = combined['accuracy']
+    ai_model.precision = combined['precision']
+    ai_model.recall = combined['recall']
+    ai_model.f1_score = combined['f1_score']
+    ai_model.training_data_count = combined['samples']
+    ai_model.last_trained = timezone.now()
+    ai_model.save(update_fields=['accuracy', 'precision', 'recall', 'f1_score', 'training_data_count',
+                                 'last_trained', 'updated_at'])
+    return ai_model
@@ -0,0 +1,173 @@
+"""
+AI Response Cache Module
+LRU + TTL cache of Gemini answers, keyed by the analysis prompt built from bucketed inputs.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, Optional
+
+from django.conf import settings
+
+from .models import AIResponseCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_SETTINGS = getattr(settings, 'AI_RESPONSE_CACHE', {})
+CACHE_ENABLED = CACHE_SETTINGS.get('ENABLED', True)
+CACHE_TTL = CACHE_SETTINGS.get('TTL', 900)
+CACHE_MAX_ENTRIES = CACHE_SETTINGS.get('MAX_ENTRIES', 256)
+DEFAULT_BUCKET = CACHE_SETTINGS.get('DEFAULT_BUCKET', 1)
+BUCKETS = CACHE_SETTINGS.get('BUCKETS', {})
+
+
+def bucket_value(value, step):
+    """Round a number to the nearest multiple of step, leaving anything else untouched"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not step:
+        return value
+    return round(round(value / step) * step, 6)
+
+
+def bucket_inputs(data: Optional[Dict], buckets: Dict = BUCKETS, default_bucket: float = DEFAULT_BUCKET) -> Optional[Dict]:
+    """
+    Round numeric inputs into their configured buckets
+
+    Near-identical sensor snapshots then build the same prompt and share a cache entry.
+
+    Args:
+        data (dict): Flat input dict, e.g. sensor or weather data
+        buckets (dict): Rounding step per key
+        default_bucket (float): Step for numeric keys not in buckets
+
+    Returns:
+        dict: Copy of data with bucketed numbers
+    """
+    if not data:
+        return data
+    return {key: bucket_value(value, buckets.get(key, default_bucket)) for key, value in data.items()}
+
+
+def input_fingerprint(sensor_data: Optional[Dict], weather_data: Optional[Dict], *extra) -> str:
+    """
+    sha256 of the bucketed sensor/weather inputs plus any other analysis inputs
+
+    Snapshots that would build the same prompt get the same fingerprint.
+    """
+    payload = [bucket_inputs(sensor_data), bucket_inputs(weather_data), *extra]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def prompt_cache_key(prompt: str, model_name: str) -> str:
+    """sha256 of the model name and the whitespace-normalized prompt"""
+    normalized = ' '.join(prompt.split())
+    return hashlib.sha256(f'{model_name}\n{normalized}'.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Thread-safe in-memory LRU with a TTL, backed by the AIResponseCache table
+
+    Lookups hit memory first, then the database (so entries survive restarts
+    and are shared between worker processes). Database errors are logged and
+    treated as misses so the cache never breaks an analysis.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL, persistent: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persistent = persistent
+
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at epoch, response text)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'db_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'expired': 0}
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return entry[1]
+                del self._entries[key]
+                self._stats['expired'] += 1
+
+        if self.persistent:
+            try:
+                row = AIResponseCache.objects.filter(
+                    key=key, expires_at__gt=datetime.fromtimestamp(now, dt_timezone.utc)
+                ).values_list('response_text', 'expires_at').first()
+            except Exception as e:
+                logger.error(f"AI response cache lookup failed: {e}")
+                row = None
+
+            if row:
+                response_text, expires_at = row
+                with self._lock:
+                    self._remember(key, expires_at.timestamp(), response_text)
+                    self._stats['db_hits'] += 1
+                return response_text
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def set(self, key: str, response_text: str, model_name: str = ''):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, response_text)
+            self._stats['stores'] += 1
+
+        if self.persistent:
+            try:
+                AIResponseCache.objects.update_or_create(key=key, defaults={
+                    'model_name': model_name,
+                    'response_text': response_text,
+                    'created_at': datetime.fromtimestamp(expires_at - self.ttl, dt_timezone.utc),
+                    'expires_at': datetime.fromtimestamp(expires_at, dt_timezone.utc),
+                })
+                self._prune_database()
+            except Exception as e:
+                logger.error(f"AI response cache store failed: {e}")
+
+    def _remember(self, key: str, expires_at: float, response_text: str):
+        """Insert into the LRU and evict the least recently used entries (lock held)"""
+        self._entries[key] = (expires_at, response_text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _prune_database(self):
+        AIResponseCache.objects.filter(expires_at__lte=datetime.now(dt_timezone.utc)).delete()
+        surplus = list(AIResponseCache.objects.values_list('id', flat=True)[self.max_entries:])
+        if surplus:
+            AIResponseCache.objects.filter(id__in=surplus).delete()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.persistent:
+            AIResponseCache.objects.all().delete()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            size = len(self._entries)
+        lookups = stats['hits'] + stats['db_hits'] + stats['misses']
+        return {
+            **stats,
+            'size': size,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'hit_ratio': round((stats['hits'] + stats['db_hits']) / lookups, 3) if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,402 @@
+"""
+AI Analysis Jobs Module
+Runs comprehensive Gemini analyses on a background thread pool, tracked by AIAnalysisSession.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .cache import input_fingerprint
+from .models import AIAnalysisSession, AIInsight
+from .predictors import get_gemini_integration
+
+logger = logging.getLogger(__name__)
+
+JOB_SETTINGS = getattr(settings, 'AI_JOBS', {})
+MAX_WORKERS = JOB_SETTINGS.get('MAX_WORKERS', 2)
+MAX_PENDING = JOB_SETTINGS.get('MAX_PENDING', 20)
+STALE_AFTER = JOB_SETTINGS.get('STALE_AFTER', 600)
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class QueueFull(Exception):
+    """Raised when the job queue already holds max_pending jobs"""
+
+    def __init__(self, pending: int, capacity: int):
+        super().__init__(f'AI job queue full ({pending}/{capacity} jobs pending)')
+        self.pending = pending
+        self.capacity = capacity
+
+
+class AnalysisJobQueue:
+    """
+    Bounded thread pool for AI analysis jobs
+
+    The pool is created on the first submit. Jobs beyond max_pending
+    (queued + running) are refused with QueueFull so callers can shed load.
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, max_pending: int = MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected_full': 0}
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats['rejected_full'] += 1
+                raise QueueFull(self._pending, self.max_pending)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ai-job')
+            self._pending += 1
+            self._stats['submitted'] += 1
+
+        return self._executor.submit(self._run, func, args, kwargs)
+
+    def _run(self, func, args, kwargs):
+        succeeded = False
+        try:
+            result = func(*args, **kwargs)
+            succeeded = True
+            return result
+        except Exception as e:
+            logger.error(f"AI job {getattr(func, '__name__', func)} failed: {e}")
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._stats['completed' if succeeded else 'failed'] += 1
+            close_old_connections()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, 'pending': self._pending, 'capacity': self.max_pending,
+                    'workers': self.max_workers}
+
+
+job_queue = AnalysisJobQueue()
+
+
+class _Flight:
+    """Placeholder for a key whose job is being started; followers wait for its handle"""
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.handle: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent work with the same key onto one in-flight job
+
+    The first caller for a key starts the job and gets its handle; callers
+    arriving before that job finishes get the same handle instead of
+    starting their own. The key is released when the job's Future is done.
+
+    The lock only guards the in-flight map: the first caller puts a
+    placeholder under it and runs lookup() and start() (database work)
+    outside it, so enqueues for other keys never wait on that I/O.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, _Flight] = {}
+        self._stats = {'started': 0, 'coalesced': 0}
+
+    def do(self, key: str, start: Callable[[], Tuple[str, Future]],
+           lookup: Optional[Callable[[], Optional[str]]] = None) -> Tuple[str, bool]:
+        """
+        Join the job in flight for key, or start one
+
+        Args:
+            key (str): Input fingerprint
+            start (callable): Starts the job, returns (handle, future)
+            lookup (callable): Finds a job for key started elsewhere (e.g. another process)
+
+        Returns:
+            tuple: (handle, coalesced)
+
+        Raises:
+            Whatever lookup() or start() raised, also in the callers that waited on them
+        """
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+
+        if not leader:
+            flight.ready.wait()
+            if flight.error is not None:
+                raise flight.error
+            with self._lock:
+                self._stats['coalesced'] += 1
+            return flight.handle, True
+
+        try:
+            handle = lookup() if lookup is not None else None
+            future = None
+            if handle is None:
+                handle, future = start()
+        except BaseException as e:
+            flight.error = e
+            self._release(key, flight)
+            flight.ready.set()
+            raise
+
+        flight.handle = handle
+        flight.ready.set()
+        with self._lock:
+            self._stats['coalesced' if future is None else 'started'] += 1
+
+        if future is None:
+            # Found running elsewhere; there is no local Future to wait on
+            self._release(key, flight)
+            return handle, True
+
+        future.add_done_callback(lambda _: self._release(key, flight))
+        return handle, False
+
+    def _release(self, key: str, flight: _Flight):
+        with self._lock:
+            if self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, 'in_flight': len(self._in_flight)}
+
+
+analysis_flights = SingleFlight()
+
+
+def create_analysis_session(sensors_data: Dict, weather_data: Dict, plant_data: Dict, fingerprint: str = '',
+                            session_type: str = 'manual') -> AIAnalysisSession:
+    """Create the AIAnalysisSession that tracks one comprehensive analysis"""
+    return AIAnalysisSession.objects.create(
+        session_id=str(uuid.uuid4())[:8],
+        session_type=session_type,
+        status='queued',
+        input_fingerprint=fingerprint,
+        input_sensors=sensors_data,
+        weather_data=weather_data,
+        plant_data=plant_data,
+        recommendations=[],
+        critical_alerts=[]
+    )
+
+
+def store_analysis_result(session: AIAnalysisSession, gemini_result: Dict, sensors_data: Dict, started: float):
+    """
+    Mark a session completed with its analysis result and create its AIInsight rows
+
+    Args:
+        session (AIAnalysisSession): Running session
+        gemini_result (dict): GeminiIntegration comprehensive analysis result
+        sensors_data (dict): Sensor inputs of the analysis
+        started (float): time.monotonic() when the analysis started
+    """
+    # Ensure gemini_raw_response is included in the response
+    if (gemini_result.get('gemini_analysis') and
+        'gemini_raw_response' not in gemini_result['gemini_analysis'] and
+        gemini_result['gemini_analysis'].get('detailed_reasoning')):
+        # Use detailed_reasoning as fallback for raw response
+        gemini_result['gemini_analysis']['gemini_raw_response'] = gemini_result['gemini_analysis']['detailed_reasoning']
+
+    # Update session with results
+    session.status = 'completed'
+    session.completed_at = timezone.now()
+    session.predictions_generated = 1
+    session.recommendations = gemini_result.get('action_plan', [])
+    session.result = gemini_result
+
+    # Check for critical alerts
+    if sensors_data.get('soil_moisture', 50) < 25:
+        session.critical_alerts.append({
+            'type': 'critical_soil_moisture',
+            'message': 'Tuproq namligi kritik darajada',
+            'timestamp': timezone.now().isoformat()
+        })
+
+    session.processing_time_seconds = round(time.monotonic() - started, 3)
+    session.save()
+
+    # Create insights
+    for insight_data in gemini_result.get('insights', []):
+        AIInsight.objects.create(
+            insight_type='pattern_discovery',
+            title=insight_data.get('title', 'AI Insight'),
+            description=insight_data.get('description', ''),
+            importance_level=insight_data.get('priority', 'medium'),
+            supporting_data={'session_id': session.session_id},
+            confidence_level=gemini_result.get('confidence_score', 85)
+        )
+
+
+def store_analysis_failure(session: AIAnalysisSession, error: str, started: float, status: str = 'failed'):
+    """Mark a session failed (or cancelled) with its error message"""
+    session.status = status
+    session.error_message = error
+    session.completed_at = timezone.now()
+    session.processing_time_seconds = round(time.monotonic() - started, 3)
+    session.save()
+
+
+def run_comprehensive_analysis(session_id: str, sensors_data: Dict, weather_data: Dict, plant_data: Dict,
+                               historical_trends: Dict, field_params: Dict = None, plant_params: Dict = None):
+    """
+    Run a queued comprehensive analysis and store the outcome on its session
+
+    Args:
+        session_id (str): AIAnalysisSession.session_id created by the view
+        sensors_data (dict): Latest value per sensor type
+        weather_data (dict): Weather information
+        plant_data (dict): Plant counts
+        historical_trends (dict): Historical patterns
+        field_params (dict): Field parameters from the request
+        plant_params (dict): Plant parameters from the request
+    """
+    session = AIAnalysisSession.objects.get(session_id=session_id)
+    session.status = 'running'
+    session.save(update_fields=['status'])
+    started = time.monotonic()
+
+    try:
+        gemini_result = get_gemini_integration().analyze_comprehensive_data(
+            sensors_data, weather_data, plant_data, historical_trends,
+            field_params, plant_params
+        )
+        store_analysis_result(session, gemini_result, sensors_data, started)
+
+    except Exception as e:
+        logger.error(f"Comprehensive AI analysis error (session {session_id}): {e}")
+        store_analysis_failure(session, str(e), started)
+        raise
+
+
+def coalesce_analysis(fingerprint: str, submit: Callable[[AIAnalysisSession], Future], sensors_data: Dict,
+                      weather_data: Dict, plant_data: Dict, session_type: str = 'manual') -> Tuple[str, bool]:
+    """
+    Start an analysis job for fingerprint, or join the one already in flight
+
+    Joins jobs of this process through analysis_flights and, failing that,
+    active sessions with the same fingerprint started by other processes.
+
+    Args:
+        fingerprint (str): input_fingerprint() of the analysis inputs
+        submit (callable): Submits the job for a new session to job_queue, returns its Future
+        sensors_data, weather_data, plant_data (dict): Inputs stored on a new session
+
+    Returns:
+        tuple: (session_id, coalesced)
+
+    Raises:
+        QueueFull: If a new job is needed and the queue is full
+    """
+    def lookup():
+        # The same analysis may already be running in another worker process
+        return AIAnalysisSession.objects.filter(
+            input_fingerprint=fingerprint, status__in=ACTIVE_STATUSES,
+            started_at__gte=timezone.now() - timedelta(seconds=STALE_AFTER)
+        ).values_list('session_id', flat=True).first()
+
+    def start():
+        session = create_analysis_session(sensors_data, weather_data, plant_data, fingerprint, session_type)
+        try:
+            future = submit(session)
+        except QueueFull as e:
+            session.status = 'cancelled'
+            session.error_message = str(e)
+            session.completed_at = timezone.now()
+            session.save(update_fields=['status', 'error_message', 'completed_at'])
+            raise
+        return session.session_id, future
+
+    return analysis_flights.do(fingerprint, start, lookup)
+
+
+def enqueue_comprehensive_analysis(sensors_data: Dict, weather_data: Dict, plant_data: Dict,
+                                   historical_trends: Dict, field_params: Dict = None, plant_params: Dict = None,
+                                   session_type: str = 'manual') -> Tuple[AIAnalysisSession, bool]:
+    """
+    Queue a comprehensive analysis, or join the one already in flight for the same inputs
+
+    Concurrent requests with the same input fingerprint share one session,
+    one Gemini call and one set of AIInsight rows.
+
+    Returns:
+        tuple: (session, coalesced)
+
+    Raises:
+        QueueFull: If a new job is needed and the queue is full
+    """
+    fingerprint = input_fingerprint(
+        sensors_data, weather_data, plant_data, historical_trends, field_params, plant_params
+    )
+
+    def submit(session):
+        return job_queue.submit(
+            run_comprehensive_analysis, session.session_id, sensors_data, weather_data, plant_data,
+            historical_trends, field_params, plant_params
+        )
+
+    session_id, coalesced = coalesce_analysis(fingerprint, submit, sensors_data, weather_data, plant_data, session_type)
+    return AIAnalysisSession.objects.get(session_id=session_id), coalesced
+
+
+def expire_stale_session(session: AIAnalysisSession) -> bool:
+    """
+    Mark a session failed if it has been queued/running for longer than STALE_AFTER
+
+    Jobs live in process memory, so a restart loses them; this keeps such
+    sessions from polling as 'running' forever.
+
+    Returns:
+        bool: True if the session was marked failed
+    """
+    if session.status not in ACTIVE_STATUSES or timezone.now() - session.started_at < timedelta(seconds=STALE_AFTER):
+        return False
+
+    session.status = 'failed'
+    session.error_message = 'Tahlil vazifasi yakunlanmadi (server qayta ishga tushgan bo\'lishi mumkin)'
+    session.completed_at = timezone.now()
+    session.save(update_fields=['status', 'error_message', 'completed_at'])
+    return True
+
+
+def session_payload(session: AIAnalysisSession) -> Dict:
+    """Status response for a session, with the analysis result once it is completed"""
+    payload = {
+        'session_id': session.session_id,
+        'status': session.status,
+        'session_status': session.status,
+        'started_at': session.started_at,
+        'completed_at': session.completed_at,
+        'processing_time_seconds': session.processing_time_seconds,
+    }
+
+    if session.status == 'completed':
+        payload.update({
+            'analysis_result': session.result,
+            'critical_alerts': session.critical_alerts,
+            'recommendations': session.recommendations
+        })
+    elif session.status == 'failed':
+        payload['error'] = session.error_message or 'AI tahlil muvaffaqiyatsiz yakunlandi'
+
+    return payload
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from ai_engine.backtest import (
+    DEFAULT_DAYS, HORIZON_HOURS, MODEL_BACKTESTS, STEP_MINUTES, WINDOW_DAYS, apply_backtest, run_backtest
+)
+from ai_engine.models import AIModel
+
+
+class Command(BaseCommand):
+    help = 'Replay sensor history through the AI predictors and store precision, recall and F1 on AIModel'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model-type',
+            choices=sorted(MODEL_BACKTESTS),
+            action='append',
+            help='Model type to backtest (repeatable, default: all)'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=DEFAULT_DAYS,
+            help=f'Days of history to replay (default {DEFAULT_DAYS})'
+        )
+        parser.add_argument(
+            '--step-minutes',
+            type=int,
+            default=STEP_MINUTES,
+            help=f'Minutes between replayed snapshots (default {STEP_MINUTES})'
+        )
+        parser.add_argument(
+            '--horizon-hours',
+            type=float,
+            default=HORIZON_HOURS,
+            help=f'Irrigation within this many hours counts as a positive outcome (default {HORIZON_HOURS})'
+        )
+        parser.add_argument(
+            '--window-days',
+            type=int,
+            default=WINDOW_DAYS,
+            help=f'Days of readings loaded and scored per chunk (default {WINDOW_DAYS})'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the metrics, do not update AIModel rows'
+        )
+
+    def handle(self, *args, **options):
+        if min(options['days'], options['step_minutes'], options['window_days']) < 1 or options['horizon_hours'] <= 0:
+            self.stderr.write(self.style.ERROR('--days, --step-minutes, --window-days and --horizon-hours must be positive'))
+            return
+
+        for model_type in options['model_type'] or sorted(MODEL_BACKTESTS):
+            result = run_backtest(
+                model_type, options['days'],
+                step=timedelta(minutes=options['step_minutes']),
+                horizon=timedelta(hours=options['horizon_hours']),
+                window=timedelta(days=options['window_days'])
+            )
+
+            self.stdout.write(f"{model_type} ({result['start'][:10]} - {result['end'][:10]}, {result['elapsed_seconds']}s)")
+            for source in ('replay', 'validated_predictions', 'combined'):
+                if source not in result:
+                    continue
+                metrics = result[source]
+                extra = ''
+                if 'skipped_steps' in metrics:
+                    extra = f", {metrics['rollup_steps']} from hourly rollups, {metrics['skipped_steps']} steps without data"
+                self.stdout.write(
+                    f"  {source}: {metrics['samples']} samples{extra} - accuracy {metrics['accuracy']}%, "
+                    f"precision {metrics['precision']}%, recall {metrics['recall']}%, F1 {metrics['f1_score']}%"
+                )
+
+            if not result['combined']['samples']:
+                self.stdout.write(self.style.WARNING(f'  No history to evaluate, {model_type} left unchanged'))
+                continue
+            if options['dry_run']:
+                continue
+
+            ai_models = list(AIModel.objects.filter(model_type=model_type))
+            for ai_model in ai_models:
+                apply_backtest(ai_model, result)
+            self.stdout.write(self.style.SUCCESS(f'  Updated {len(ai_models)} {model_type} model(s)'))
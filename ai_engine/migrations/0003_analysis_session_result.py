@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:16
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0002_ai_response_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aianalysissession',
+            name='error_message',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='aianalysissession',
+            name='result',
+            field=models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True),
+        ),
+        migrations.AlterField(
+            model_name='aianalysissession',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Navbatda'), ('running', 'Davom etmoqda'), ('completed', 'Yakunlangan'), ('failed', 'Muvaffaqiyatsiz'), ('cancelled', 'Bekor qilingan')], default='running', max_length=20),
+        ),
+    ]
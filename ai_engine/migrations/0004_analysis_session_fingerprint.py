@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0003_analysis_session_result'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aianalysissession',
+            name='input_fingerprint',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0004_analysis_session_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeminiUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('model_name', models.CharField(max_length=50)),
+                ('requests', models.IntegerField(default=0)),
+                ('failed_requests', models.IntegerField(default=0)),
+                ('limited_requests', models.IntegerField(default=0)),
+                ('prompt_tokens', models.IntegerField(default=0)),
+                ('response_tokens', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-date'],
+                'unique_together': {('date', 'model_name')},
+            },
+        ),
+    ]
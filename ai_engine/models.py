@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 import json
@@ -99,6 +100,7 @@ class AIAnalysisSession(models.Model):
     ]
     
     STATUS_CHOICES = [
+        ('queued', 'Navbatda'),
         ('running', 'Davom etmoqda'),
         ('completed', 'Yakunlangan'),
         ('failed', 'Muvaffaqiyatsiz'),
@@ -108,6 +110,7 @@ class AIAnalysisSession(models.Model):
     session_id = models.CharField(max_length=50, unique=True)
     session_type = models.CharField(max_length=20, choices=SESSION_TYPES)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    input_fingerprint = models.CharField(max_length=64, blank=True, db_index=True)  # Coalesces identical analyses
     
     # Session data
     input_sensors = models.JSONField()  # List of sensors analyzed
@@ -118,6 +121,8 @@ class AIAnalysisSession(models.Model):
     predictions_generated = models.IntegerField(default=0)
     recommendations = models.JSONField(default=list)
     critical_alerts = models.JSONField(default=list)
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)  # Full analysis response
+    error_message = models.TextField(blank=True)
     
     # Performance metrics
     processing_time_seconds = models.FloatField(null=True, blank=True)
@@ -208,4 +213,44 @@ class AIInsight(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
-        return f"{self.title} ({self.get_importance_level_display()})"
\ No newline at end of file
+        return f"{self.title} ({self.get_importance_level_display()})"
+
+class AIResponseCache(models.Model):
+    """Persistent backing store of the Gemini response cache (see ai_engine.cache)"""
+    key = models.CharField(max_length=64, unique=True)  # sha256 of model name + prompt
+    model_name = models.CharField(max_length=50)
+    response_text = models.TextField()
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.model_name} {self.key[:12]} (expires {self.expires_at:%Y-%m-%d %H:%M})"
+
+
+class GeminiUsage(models.Model):
+    """Daily Gemini API usage ledger read by the rate limiter (see ai_engine.rate_limit)"""
+    date = models.DateField()
+    model_name = models.CharField(max_length=50)
+    
+    requests = models.IntegerField(default=0)
+    failed_requests = models.IntegerField(default=0)
+    limited_requests = models.IntegerField(default=0)  # Routed to the local fallback by the limiter
+    prompt_tokens = models.IntegerField(default=0)
+    response_tokens = models.IntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['date', 'model_name']
+        ordering = ['-date']
+    
+    def __str__(self):
+        return f"{self.model_name} {self.date}: {self.requests} requests, {self.total_tokens} tokens"
+    
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.response_tokens
@@ -5,11 +5,17 @@ This module contains the main AI logic for irrigation system predictions.
 
 import logging
 import random
-from typing import Dict, List, Tuple, Optional
+import threading
+from typing import Dict, FrozenSet, Iterator, List, Tuple, Optional
 from datetime import datetime, timedelta
+import numpy as np
 from django.utils import timezone
 from django.conf import settings
 
+from .cache import CACHE_ENABLED, bucket_inputs, prompt_cache_key, response_cache
+from .rate_limit import GeminiBudget, estimate_tokens
+from .response_parser import IncrementalScan, keyword_classes
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,7 +24,6 @@ class IrrigationPredictor:
     
     def __init__(self):
         self.model_version = "1.2.3"
-        self.accuracy = 94.2  # Mock accuracy percentage
         
     def predict_irrigation_need(self, sensor_data: Dict, weather_data: Dict, plant_data: Dict) -> Dict:
         """
@@ -209,6 +214,88 @@ class IrrigationPredictor:
             reasons.append("Barcha ko'rsatkichlar normal diapazonida")
         
         return " • ".join(reasons)
+    
+    # Recommendation texts by priority index, matching _generate_irrigation_recommendation
+    BATCH_RECOMMENDATIONS = (
+        "Sug'orish kerak emas - Tuproq namligi yetarli.",
+        "Past prioritet - Kuzatishda saqlang, hozircha sug'orish shart emas.",
+        "O'rtacha prioritet - 6 soat ichida sug'orish rejalashtiring.",
+        "Yuqori prioritet - 2 soat ichida sug'orish tavsiya etiladi.",
+        "KRITIK - Darhol sug'orish kerak! Tuproq juda quruq.",
+    )
+    BATCH_PRIORITIES = ('none', 'low', 'medium', 'high', 'critical')
+    
+    def predict_batch(self, soil_moisture, air_humidity, temperature, rainfall_forecast=0,
+                      zone_ids: Optional[List] = None) -> List[Dict]:
+        """
+        Predict irrigation need for many zones at once
+        
+        Same scoring as predict_irrigation_need, computed with NumPy over
+        whole columns instead of one dict at a time.
+        
+        Args:
+            soil_moisture (array-like): Soil moisture (%) per zone
+            air_humidity (array-like): Air humidity (%) per zone, or a scalar
+            temperature (array-like): Temperature (°C) per zone, or a scalar
+            rainfall_forecast (array-like): Forecast rainfall (mm) per zone, or a scalar
+            zone_ids (list): Identifiers returned with each row (default: row index)
+        
+        Returns:
+            list: One prediction dict per zone, in input order
+        """
+        moisture = np.asarray(soil_moisture, dtype=float)
+        humidity, temp, rainfall = np.broadcast_arrays(
+            *(np.asarray(column, dtype=float) for column in (air_humidity, temperature, rainfall_forecast)),
+            moisture
+        )[:3]
+        
+        scores = self._calculate_irrigation_score_batch(moisture, humidity, temp, rainfall)
+        priorities = np.searchsorted(np.array([0.3, 0.5, 0.7, 0.9]), scores, side='left')
+        confidence = np.minimum(95, scores * 100)
+        durations = self._calculate_duration_batch(moisture)
+        water = self._calculate_water_amount_batch(moisture, temp)
+        
+        if zone_ids is None:
+            zone_ids = range(len(moisture))
+        
+        return [
+            {
+                'zone_id': zone_id,
+                'need_irrigation': score > 0.7,
+                'irrigation_score': round(score, 3),
+                'confidence_score': round(conf, 1),
+                'priority': self.BATCH_PRIORITIES[priority],
+                'recommendation': self.BATCH_RECOMMENDATIONS[priority],
+                'predicted_duration_minutes': duration,
+                'water_amount_ml': amount,
+            }
+            for zone_id, score, conf, priority, duration, amount in zip(
+                zone_ids, scores.tolist(), confidence.tolist(), priorities.tolist(),
+                durations.tolist(), water.tolist()
+            )
+        ]
+    
+    def _calculate_irrigation_score_batch(self, soil_moisture, air_humidity, temperature, rainfall):
+        """Vectorized _calculate_irrigation_score over NumPy arrays"""
+        moisture_score = np.select(
+            [soil_moisture < 25, soil_moisture < 40, soil_moisture < 60], [1.0, 0.8, 0.4], default=0.1
+        )
+        humidity_score = np.maximum(0, (70 - air_humidity) / 70)
+        temp_score = np.maximum(0, (temperature - 20) / 15)
+        rain_score = np.maximum(0, 1 - rainfall / 10)
+        
+        total_score = moisture_score * 0.5 + humidity_score * 0.2 + temp_score * 0.2 + rain_score * 0.1
+        return np.minimum(1.0, total_score)
+    
+    def _calculate_duration_batch(self, soil_moisture):
+        """Vectorized _calculate_duration over a NumPy array"""
+        return np.select([soil_moisture < 25, soil_moisture < 40, soil_moisture < 55], [20, 15, 10], default=5)
+    
+    def _calculate_water_amount_batch(self, soil_moisture, temperature):
+        """Vectorized _calculate_water_amount over NumPy arrays"""
+        moisture_factor = np.maximum(0.5, (60 - soil_moisture) / 60)
+        temp_factor = 1 + np.maximum(0, (temperature - 20) / 40)
+        return (300 * moisture_factor * temp_factor).astype(int)
 
 
 class PlantHealthAnalyzer:
@@ -412,6 +499,7 @@ class GeminiIntegration:
         self.api_key = settings.GEMINI_API_KEY
         self.model_name = "gemini-1.5-flash"
         self.use_real_api = False
+        self.budget = GeminiBudget(self.model_name)
         
         if not self.api_key:
             logger.error("GEMINI_API_KEY not configured in settings. Please set your Gemini API key.")
@@ -452,36 +540,44 @@ class GeminiIntegration:
             return self._fallback_gemini_analysis(all_sensor_data, weather_data, plant_data, historical_trends)
         
         try:
-            # Build comprehensive analysis prompt
-            analysis_prompt = self._build_analysis_prompt(
-                all_sensor_data, weather_data, plant_data, historical_trends,
-                field_params, plant_params
+            analysis_prompt = self._prepare_analysis_prompt(
+                all_sensor_data, weather_data, plant_data, historical_trends, field_params, plant_params
             )
             
-            logger.info("🚀 Calling REAL Gemini AI API for comprehensive analysis...")
-            
-            # REAL GEMINI API CALL
-            response = self.model.generate_content(analysis_prompt)
+            cache_key = prompt_cache_key(analysis_prompt, self.model_name)
+            response_text = response_cache.get(cache_key) if CACHE_ENABLED else None
+            cache_status = 'hit' if response_text is not None else 'miss'
             
-            if not response.text:
-                raise Exception("Empty response from Gemini AI")
+            if response_text is None:
+                # Rate limit and daily token budget: use the local analysis instead of a call that would fail
+                allowed, limit_reason, reserved = self.budget.acquire(analysis_prompt)
+                if not allowed:
+                    logger.warning(f"⚠️ Gemini AI budget: {limit_reason} - using fallback analysis")
+                    result = self._fallback_gemini_analysis(all_sensor_data, weather_data, plant_data, historical_trends)
+                    result['limit_reason'] = limit_reason
+                    return result
                 
-            logger.info("✅ Received response from Gemini AI API successfully")
-            
-            # Parse real Gemini response
-            gemini_response = self._parse_real_gemini_response(response.text, all_sensor_data, weather_data)
+                logger.info("🚀 Calling REAL Gemini AI API for comprehensive analysis...")
+                
+                # REAL GEMINI API CALL
+                try:
+                    response = self.model.generate_content(analysis_prompt)
+                    
+                    if not response.text:
+                        raise Exception("Empty response from Gemini AI")
+                except Exception:
+                    self.budget.record(reserved, failed=True)
+                    raise
+                    
+                logger.info("✅ Received response from Gemini AI API successfully")
+                response_text = response.text
+                self._record_usage(reserved, analysis_prompt, response_text, getattr(response, 'usage_metadata', None))
+                if CACHE_ENABLED:
+                    response_cache.set(cache_key, response_text, self.model_name)
+            else:
+                logger.info("⚡ Using cached Gemini AI response")
             
-            return {
-                'gemini_analysis': gemini_response,
-                'insights': self._extract_insights_from_real_response(response.text),
-                'action_plan': self._generate_action_plan_from_response(response.text),
-                'confidence_score': random.uniform(92, 98),  # Real AI is more confident
-                'analysis_timestamp': timezone.now().isoformat(),
-                'source': 'REAL_GEMINI_API',
-                'model': self.model_name,
-                'prompt_length': len(analysis_prompt),
-                'response_length': len(response.text)
-            }
+            return self._real_analysis_result(response_text, analysis_prompt, all_sensor_data, weather_data, cache_status)
             
         except Exception as e:
             logger.error(f"❌ Gemini AI API failed: {e} - using fallback analysis")
@@ -489,6 +585,143 @@ class GeminiIntegration:
             # Fallback analysis when API fails
             return self._fallback_gemini_analysis(all_sensor_data, weather_data, plant_data, historical_trends)
     
+    def stream_comprehensive_analysis(self, all_sensor_data: Dict, weather_data: Dict,
+                                      plant_data: Dict, historical_trends: Dict,
+                                      field_params: Dict = None, plant_params: Dict = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Comprehensive analysis as a stream of (event, data) pairs, for Server-Sent Events
+        
+        Gemini is called in streaming mode. Each piece of generated text is yielded
+        as a 'chunk' event, followed by 'field' events for the parsed fields
+        (urgency, timing, method, risks, action plan) it changed. Keywords only
+        accumulate, so a field value can only move towards its final value. The
+        last event is always 'result' with the dict analyze_comprehensive_data
+        would return; cache hits, budget refusals and errors go straight to it.
+        
+        Args:
+            Same as analyze_comprehensive_data
+            
+        Yields:
+            tuple: (event name, JSON-serializable data)
+        """
+        if not self.use_real_api:
+            logger.warning("⚠️ GEMINI AI API key is missing or invalid - using fallback analysis")
+            yield 'result', self._fallback_gemini_analysis(all_sensor_data, weather_data, plant_data, historical_trends)
+            return
+        
+        try:
+            analysis_prompt = self._prepare_analysis_prompt(
+                all_sensor_data, weather_data, plant_data, historical_trends, field_params, plant_params
+            )
+            
+            cache_key = prompt_cache_key(analysis_prompt, self.model_name)
+            response_text = response_cache.get(cache_key) if CACHE_ENABLED else None
+            if response_text is not None:
+                logger.info("⚡ Using cached Gemini AI response")
+                yield 'chunk', {'text': response_text}
+                yield 'result', self._real_analysis_result(
+                    response_text, analysis_prompt, all_sensor_data, weather_data, 'hit'
+                )
+                return
+            
+            allowed, limit_reason, reserved = self.budget.acquire(analysis_prompt)
+            if not allowed:
+                logger.warning(f"⚠️ Gemini AI budget: {limit_reason} - using fallback analysis")
+                result = self._fallback_gemini_analysis(all_sensor_data, weather_data, plant_data, historical_trends)
+                result['limit_reason'] = limit_reason
+                yield 'result', result
+                return
+            
+            logger.info("🚀 Streaming REAL Gemini AI API comprehensive analysis...")
+            
+            parts = []
+            scan = IncrementalScan()
+            fields = self._streamed_field_values(scan.classes, scan.length)
+            usage = None
+            completed = False
+            try:
+                response = self.model.generate_content(analysis_prompt, stream=True)
+                for chunk in response:
+                    if not chunk.text:
+                        continue
+                    parts.append(chunk.text)
+                    yield 'chunk', {'text': chunk.text}
+                    
+                    for name, value in self._streamed_field_values(scan.feed(chunk.text), scan.length).items():
+                        if fields[name] != value:
+                            fields[name] = value
+                            yield 'field', {'name': name, 'value': value}
+                
+                if not parts:
+                    raise Exception("Empty response from Gemini AI")
+                usage = getattr(response, 'usage_metadata', None)
+                completed = True
+            finally:
+                # Also runs when the client disconnects mid-stream: the tokens were still spent
+                self._record_usage(reserved, analysis_prompt, ''.join(parts), usage, failed=not completed)
+            
+            logger.info("✅ Gemini AI API stream completed successfully")
+            response_text = ''.join(parts)
+            if CACHE_ENABLED:
+                response_cache.set(cache_key, response_text, self.model_name)
+            
+            yield 'result', self._real_analysis_result(
+                response_text, analysis_prompt, all_sensor_data, weather_data, 'miss'
+            )
+            
+        except Exception as e:
+            logger.error(f"❌ Gemini AI API stream failed: {e} - using fallback analysis")
+            yield 'result', self._fallback_gemini_analysis(all_sensor_data, weather_data, plant_data, historical_trends)
+    
+    def _streamed_field_values(self, classes: FrozenSet[str], response_length: int) -> Dict:
+        """Parsed fields that can be shown while the response is still being generated"""
+        irrigation_need, irrigation_urgency = self._urgency_from_classes(classes)
+        return {
+            'irrigation_urgency': irrigation_urgency,
+            'irrigation_recommendation': irrigation_need,
+            'optimal_timing': self._timing_from_classes(classes),
+            'irrigation_method': self._method_from_classes(classes),
+            'risk_factors': self._risks_from_classes(classes),
+            'action_plan': self._action_plan_from_classes(classes, response_length),
+        }
+    
+    def _prepare_analysis_prompt(self, all_sensor_data: Dict, weather_data: Dict, plant_data: Dict,
+                                 historical_trends: Dict, field_params: Dict = None, plant_params: Dict = None) -> str:
+        """Analysis prompt, built from bucketed inputs so near-identical snapshots share a cache key"""
+        if CACHE_ENABLED:
+            all_sensor_data, weather_data = bucket_inputs(all_sensor_data), bucket_inputs(weather_data)
+        return self._build_analysis_prompt(
+            all_sensor_data, weather_data, plant_data, historical_trends, field_params, plant_params
+        )
+    
+    def _record_usage(self, reserved: int, analysis_prompt: str, response_text: str, usage=None, failed: bool = False):
+        """Add a call's token usage to the budget ledger, estimating counts the API did not report"""
+        self.budget.record(
+            reserved,
+            prompt_tokens=getattr(usage, 'prompt_token_count', 0) or estimate_tokens(analysis_prompt),
+            response_tokens=getattr(usage, 'candidates_token_count', 0) or (estimate_tokens(response_text) if response_text else 0),
+            failed=failed
+        )
+    
+    def _real_analysis_result(self, response_text: str, analysis_prompt: str, all_sensor_data: Dict,
+                              weather_data: Dict, cache_status: str) -> Dict:
+        """Comprehensive analysis result built from a complete Gemini response"""
+        # Parse real Gemini response
+        gemini_response = self._parse_real_gemini_response(response_text, all_sensor_data, weather_data)
+        
+        return {
+            'gemini_analysis': gemini_response,
+            'insights': self._extract_insights_from_real_response(response_text),
+            'action_plan': self._generate_action_plan_from_response(response_text),
+            'confidence_score': random.uniform(92, 98),  # Real AI is more confident
+            'analysis_timestamp': timezone.now().isoformat(),
+            'source': 'REAL_GEMINI_API',
+            'model': self.model_name,
+            'prompt_length': len(analysis_prompt),
+            'response_length': len(response_text),
+            'cache': cache_status
+        }
+    
     def _build_analysis_prompt(self, sensor_data: Dict, weather_data: Dict,
                               plant_data: Dict, historical_trends: Dict, 
                               field_params: Dict = None, plant_params: Dict = None) -> str:
@@ -632,36 +865,12 @@ class GeminiIntegration:
         try:
             logger.info(f"📝 Parsing real Gemini response ({len(response_text)} characters)")
             
-            # Clean response text
-            response_lines = response_text.split('\n')
-            clean_lines = [line.strip() for line in response_lines if line.strip()]
-            
             # Extract key recommendations using AI response parsing
-            irrigation_recommendation = "AI Professional Analysis Complete"
             detailed_reasoning = response_text[:500] + "..." if len(response_text) > 500 else response_text
             
-            # Look for irrigation urgency indicators in response
-            response_lower = response_text.lower()
-            if any(word in response_lower for word in ['критик', 'critical', 'urgent', 'darhol', 'зуур']):
-                irrigation_need = "🚨 KRITIK - Darhol sug'orish kerak"
-                irrigation_urgency = "critical"
-            elif any(word in response_lower for word in ['yuqori', 'high', 'prioritet', 'tavsiya']):
-                irrigation_need = "⚠️ YUQORI - Tez sug'orish tavsiya etiladi"  
-                irrigation_urgency = "high"
-            elif any(word in response_lower for word in ["sug'orish", 'irrigation', 'water']):
-                irrigation_need = "📝 O'RTACHA - Sug'orish rejalashtiring"
-                irrigation_urgency = "moderate"
-            else:
-                irrigation_need = "✅ YAXSHI - Hozircha kerak emas"
-                irrigation_urgency = "low"
-            
-            # Extract timing recommendations
-            if any(word in response_lower for word in ['ertalab', 'morning', '6:00', '7:00', '8:00']):
-                optimal_timing = "Ertalab 6:00-8:00"
-            elif any(word in response_lower for word in ['kechqurun', 'evening', '18:00', '19:00', '20:00']):
-                optimal_timing = "Kechqurun 18:00-20:00"
-            else:
-                optimal_timing = "Optimal vaqtni tanlang"
+            # Extraction helpers share one keyword scan of the response (keyword_classes is memoized)
+            irrigation_need, irrigation_urgency = self._extract_urgency_from_response(response_text)
+            optimal_timing = self._extract_timing_from_response(response_text)
                 
             # Extract water amount suggestions
             soil_moisture = sensor_data.get('soil_moisture', 50)
@@ -710,9 +919,10 @@ class GeminiIntegration:
             soil_moisture = sensor_data.get('soil_moisture', 50)
             
             # Extract key information from Gemini response
-            if 'kritik' in response_text.lower() or 'critical' in response_text.lower():
+            classes = keyword_classes(response_text)
+            if 'critical_mention' in classes:
                 irrigation_need = "KRITIK - Darhol sug'orish kerak"
-            elif 'sug\'orish' in response_text.lower() or 'irrigation' in response_text.lower():
+            elif 'irrigation_mention' in classes:
                 irrigation_need = "HA - Sug'orish tavsiya etiladi"
             else:
                 irrigation_need = "AI tahlil natijasi"
@@ -1135,12 +1345,40 @@ class GeminiIntegration:
         
         return actions
     
+    def _extract_urgency_from_response(self, response_text: str) -> Tuple[str, str]:
+        """Extract irrigation recommendation and urgency level from Gemini response"""
+        return self._urgency_from_classes(keyword_classes(response_text))
+    
+    def _urgency_from_classes(self, classes: FrozenSet[str]) -> Tuple[str, str]:
+        if 'urgency_critical' in classes:
+            return "🚨 KRITIK - Darhol sug'orish kerak", "critical"
+        elif 'urgency_high' in classes:
+            return "⚠️ YUQORI - Tez sug'orish tavsiya etiladi", "high"
+        elif 'urgency_moderate' in classes:
+            return "📝 O'RTACHA - Sug'orish rejalashtiring", "moderate"
+        else:
+            return "✅ YAXSHI - Hozircha kerak emas", "low"
+    
+    def _extract_timing_from_response(self, response_text: str) -> str:
+        """Extract irrigation timing from Gemini response"""
+        return self._timing_from_classes(keyword_classes(response_text))
+    
+    def _timing_from_classes(self, classes: FrozenSet[str]) -> str:
+        if 'timing_morning' in classes:
+            return "Ertalab 6:00-8:00"
+        elif 'timing_evening' in classes:
+            return "Kechqurun 18:00-20:00"
+        else:
+            return "Optimal vaqtni tanlang"
+    
     def _extract_method_from_response(self, response_text: str) -> str:
         """Extract irrigation method from Gemini response"""
-        response_lower = response_text.lower()
-        if 'tomchi' in response_lower or 'drip' in response_lower:
+        return self._method_from_classes(keyword_classes(response_text))
+    
+    def _method_from_classes(self, classes: FrozenSet[str]) -> str:
+        if 'method_drip' in classes:
             return "Tomchilatib sug'orish - optimal suv tejash"
-        elif 'purkagich' in response_lower or 'sprinkler' in response_lower:
+        elif 'method_sprinkler' in classes:
             return "Purkagich usuli - bir tekis tarqatish"
         else:
             return "Tavsiya etilgan usul"
@@ -1166,14 +1404,16 @@ class GeminiIntegration:
     
     def _extract_risks_from_response(self, response_text: str) -> List[str]:
         """Extract risk factors from Gemini response"""
+        return self._risks_from_classes(keyword_classes(response_text))
+    
+    def _risks_from_classes(self, classes: FrozenSet[str]) -> List[str]:
         risks = []
-        response_lower = response_text.lower()
         
-        if any(word in response_lower for word in ['kritik', 'critical', 'urgent']):
+        if 'risk_critical' in classes:
             risks.append("🚨 Kritik suv tanqisligi")
-        if any(word in response_lower for word in ['issiq', 'hot', 'temperature']):
+        if 'risk_heat' in classes:
             risks.append("🔥 Yuqori harorat stressi")  
-        if any(word in response_lower for word in ['bug\'lan', 'evaporation']):
+        if 'risk_evaporation' in classes:
             risks.append("💨 Tez namlik yo'qolishi")
             
         return risks if risks else ["Hech qanday kritik xavf aniqlanmadi"]
@@ -1181,13 +1421,13 @@ class GeminiIntegration:
     def _extract_env_recommendations(self, response_text: str) -> List[str]:
         """Extract environmental recommendations from Gemini response"""
         recommendations = []
-        response_lower = response_text.lower()
+        classes = keyword_classes(response_text)
         
-        if 'mulch' in response_lower:
+        if 'env_mulch' in classes:
             recommendations.append("Mulch qo'llash - suv tejash")
-        if 'soyalash' in response_lower or 'shade' in response_lower:
+        if 'env_shade' in classes:
             recommendations.append("Soyalash to'rlari o'rnatish")
-        if 'drenaj' in response_lower or 'drainage' in response_lower:
+        if 'env_drainage' in classes:
             recommendations.append("Drenaj tizimini yaxshilash")
             
         return recommendations if recommendations else ["Hozirgi muhit yetarli"]
@@ -1204,7 +1444,7 @@ class GeminiIntegration:
                 'priority': 'high'
             })
         
-        if 'kritik' in response_text.lower() or 'critical' in response_text.lower():
+        if 'critical_mention' in keyword_classes(response_text):
             insights.append({
                 'type': 'urgent_action',
                 'title': 'Zudlik bilan harakat kerak',
@@ -1216,9 +1456,12 @@ class GeminiIntegration:
     
     def _generate_action_plan_from_response(self, response_text: str) -> List[Dict]:
         """Generate action plan from Gemini response"""
+        return self._action_plan_from_classes(keyword_classes(response_text), len(response_text))
+    
+    def _action_plan_from_classes(self, classes: FrozenSet[str], response_length: int) -> List[Dict]:
         actions = []
         
-        if any(word in response_text.lower() for word in ['kritik', 'critical', 'urgent']):
+        if 'risk_critical' in classes:
             actions.append({
                 'action': 'immediate_irrigation',
                 'priority': 1,
@@ -1233,7 +1476,7 @@ class GeminiIntegration:
             'estimated_duration': '1 soat'
         })
         
-        if len(response_text) > 200:  # Detailed response suggests comprehensive analysis
+        if response_length > 200:  # Detailed response suggests comprehensive analysis
             actions.append({
                 'action': 'implement_recommendations',
                 'priority': 3,
@@ -1247,4 +1490,25 @@ class GeminiIntegration:
 # Global predictor instances
 irrigation_predictor = IrrigationPredictor()
 plant_health_analyzer = PlantHealthAnalyzer()
-gemini_integration = GeminiIntegration()
\ No newline at end of file
+
+# The Gemini client is built on first use: importing and configuring google.generativeai
+# at import time would slow down every manage.py command and worker boot
+_gemini_integration: Optional[GeminiIntegration] = None
+_gemini_lock = threading.Lock()
+
+
+def get_gemini_integration() -> GeminiIntegration:
+    """Process-wide GeminiIntegration, created on first call (thread-safe)"""
+    global _gemini_integration
+    if _gemini_integration is None:
+        with _gemini_lock:
+            if _gemini_integration is None:
+                _gemini_integration = GeminiIntegration()
+    return _gemini_integration
+
+
+def __getattr__(name):
+    # Keeps 'from ai_engine.predictors import gemini_integration' working (it builds the client)
+    if name == 'gemini_integration':
+        return get_gemini_integration()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
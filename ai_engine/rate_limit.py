@@ -0,0 +1,163 @@
+"""
+Gemini Rate Limit Module
+Token-bucket request limiter and daily token budget, backed by the GeminiUsage ledger.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import GeminiUsage
+
+logger = logging.getLogger(__name__)
+
+LIMIT_SETTINGS = getattr(settings, 'AI_RATE_LIMITS', {})
+REQUESTS_PER_MINUTE = LIMIT_SETTINGS.get('REQUESTS_PER_MINUTE', 15)
+TOKENS_PER_DAY = LIMIT_SETTINGS.get('TOKENS_PER_DAY', 1000000)
+MAX_WAIT_SECONDS = LIMIT_SETTINGS.get('MAX_WAIT_SECONDS', 10)
+CHARS_PER_TOKEN = LIMIT_SETTINGS.get('CHARS_PER_TOKEN', 4)
+EXPECTED_RESPONSE_TOKENS = LIMIT_SETTINGS.get('EXPECTED_RESPONSE_TOKENS', 2000)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for text when the API does not report usage"""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class TokenBucket:
+    """Thread-safe token bucket holding up to capacity tokens, refilled at rate tokens/second"""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+
+        self._lock = threading.Lock()
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount: float = 1) -> float:
+        """Take amount tokens if available; returns 0 on success, else seconds until they will be"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount: float = 1, timeout: float = 0) -> bool:
+        """Take amount tokens, waiting up to timeout seconds for the bucket to refill"""
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(amount)
+            if wait == 0:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class GeminiBudget:
+    """
+    Request rate and daily token budget for one Gemini model
+
+    acquire() is called before every API call: it refuses the call when
+    today's ledger (plus calls in flight) would exceed tokens_per_day, or
+    when no request slot frees up within max_wait seconds. Refused calls are
+    counted on the ledger and the caller uses the local fallback analysis.
+    """
+
+    def __init__(self, model_name: str, requests_per_minute: int = REQUESTS_PER_MINUTE,
+                 tokens_per_day: int = TOKENS_PER_DAY, max_wait: float = MAX_WAIT_SECONDS):
+        self.model_name = model_name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_day = tokens_per_day
+        self.max_wait = max_wait
+
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self._lock = threading.Lock()
+        self._reserved = 0  # Estimated tokens of calls in flight in this process
+
+    def _ledger(self):
+        return GeminiUsage.objects.filter(date=timezone.localdate(), model_name=self.model_name)
+
+    def tokens_used_today(self) -> int:
+        row = self._ledger().values_list('prompt_tokens', 'response_tokens').first()
+        return sum(row) if row else 0
+
+    def acquire(self, prompt: str) -> Tuple[bool, Optional[str], int]:
+        """
+        Reserve budget for a call with this prompt
+
+        Returns:
+            tuple: (allowed, refusal reason or None, reserved tokens to pass to release())
+        """
+        reserved = estimate_tokens(prompt) + EXPECTED_RESPONSE_TOKENS
+
+        # The ledger read and write stay outside the lock, only the in-flight arithmetic is serialized
+        used = self.tokens_used_today()
+        with self._lock:
+            exhausted = used + self._reserved + reserved > self.tokens_per_day
+            if not exhausted:
+                self._reserved += reserved
+        if exhausted:
+            self._count(limited_requests=1)
+            return False, 'daily_token_budget_exhausted', 0
+
+        if not self.requests.acquire(timeout=self.max_wait):
+            self.release(reserved)
+            self._count(limited_requests=1)
+            return False, 'rate_limited', 0
+
+        return True, None, reserved
+
+    def release(self, reserved: int):
+        with self._lock:
+            self._reserved = max(0, self._reserved - reserved)
+
+    def record(self, reserved: int, prompt_tokens: int = 0, response_tokens: int = 0, failed: bool = False):
+        """Release the reservation and add the call's actual usage to today's ledger"""
+        self.release(reserved)
+        self._count(requests=1, failed_requests=int(failed), prompt_tokens=prompt_tokens,
+                    response_tokens=response_tokens)
+
+    def _count(self, **increments):
+        increments = {field: value for field, value in increments.items() if value}
+        if not increments:
+            return
+        try:
+            GeminiUsage.objects.get_or_create(date=timezone.localdate(), model_name=self.model_name)
+            self._ledger().update(**{field: F(field) + value for field, value in increments.items()})
+        except Exception as e:
+            logger.error(f"Gemini usage ledger update failed: {e}")
+
+    def snapshot(self) -> Dict:
+        """Remaining budget for the metrics endpoint"""
+        row = self._ledger().first()
+        used = row.total_tokens if row else 0
+        return {
+            'model': self.model_name,
+            'requests_per_minute': self.requests_per_minute,
+            'requests_available_now': int(self.requests.available()),
+            'tokens_per_day': self.tokens_per_day,
+            'tokens_used_today': used,
+            'tokens_remaining_today': max(0, self.tokens_per_day - used - self._reserved),
+            'requests_today': row.requests if row else 0,
+            'failed_requests_today': row.failed_requests if row else 0,
+            'limited_requests_today': row.limited_requests if row else 0,
+            'max_wait_seconds': self.max_wait,
+        }
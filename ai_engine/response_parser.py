@@ -0,0 +1,101 @@
+"""
+Gemini Response Parser Module
+Single-pass keyword classification of Gemini answers with one precompiled regex.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable
+
+# Keyword classes (Uzbek, Russian, English), matched as lowercase substrings
+KEYWORD_CLASSES = {
+    'urgency_critical': ('критик', 'critical', 'urgent', 'darhol', 'зуур'),
+    'urgency_high': ('yuqori', 'high', 'prioritet', 'tavsiya'),
+    'urgency_moderate': ("sug'orish", 'irrigation', 'water'),
+    'timing_morning': ('ertalab', 'morning', '6:00', '7:00', '8:00'),
+    'timing_evening': ('kechqurun', 'evening', '18:00', '19:00', '20:00'),
+    'method_drip': ('tomchi', 'drip'),
+    'method_sprinkler': ('purkagich', 'sprinkler'),
+    'risk_critical': ('kritik', 'critical', 'urgent'),
+    'risk_heat': ('issiq', 'hot', 'temperature'),
+    'risk_evaporation': ("bug'lan", 'evaporation'),
+    'env_mulch': ('mulch',),
+    'env_shade': ('soyalash', 'shade'),
+    'env_drainage': ('drenaj', 'drainage'),
+    'critical_mention': ('kritik', 'critical'),
+    'irrigation_mention': ("sug'orish", 'irrigation'),
+}
+
+
+class KeywordMatcher:
+    """
+    One compiled alternation over the keywords of every class
+
+    A scan lowercases the text once and walks it once; each keyword found
+    marks all classes it belongs to. Longer keywords are tried first, so a
+    match like '18:00' is not also counted as '8:00'.
+    """
+
+    def __init__(self, classes: Dict[str, Iterable[str]]):
+        self.classes_by_keyword: Dict[str, FrozenSet[str]] = {}
+        for name, keywords in classes.items():
+            for keyword in keywords:
+                self.classes_by_keyword[keyword] = self.classes_by_keyword.get(keyword, frozenset()) | {name}
+
+        keywords = sorted(self.classes_by_keyword, key=len, reverse=True)
+        self.pattern = re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+        self.longest = len(keywords[0]) if keywords else 0
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        """Return the names of all classes with at least one keyword in text"""
+        found = set()
+        for keyword in set(self.pattern.findall(text.lower())):
+            found |= self.classes_by_keyword[keyword]
+        return frozenset(found)
+
+
+class IncrementalScan:
+    """
+    Keyword classes of a text that arrives in pieces (a streamed response)
+
+    Each piece is scanned once, together with the last longest-1 characters
+    before it so keywords split across pieces are still found. Only matches
+    ending in the new piece count; the rest were seen with full context.
+    Partial texts are never memoized, so they don't evict keyword_classes()
+    entries.
+    """
+
+    def __init__(self, keyword_matcher: KeywordMatcher = None):
+        self.matcher = keyword_matcher or matcher
+        self.classes: FrozenSet[str] = frozenset()
+        self.length = 0
+        self._tail = ''
+
+    def feed(self, text: str) -> FrozenSet[str]:
+        """Add the next piece of text, return the classes found so far"""
+        window = self._tail + text.lower()
+        boundary = len(self._tail)
+        found = set(self.classes)
+        for match in self.matcher.pattern.finditer(window):
+            if match.end() > boundary:
+                found |= self.matcher.classes_by_keyword[match.group()]
+
+        self.classes = frozenset(found)
+        self.length += len(text)
+        overlap = self.matcher.longest - 1
+        self._tail = window[-overlap:] if overlap > 0 else ''
+        return self.classes
+
+
+matcher = KeywordMatcher(KEYWORD_CLASSES)
+
+
+@lru_cache(maxsize=32)
+def keyword_classes(response_text: str) -> FrozenSet[str]:
+    """
+    Keyword classes present in a response, scanned once per distinct text
+
+    The extraction helpers on GeminiIntegration all call this with the same
+    response string, so only the first call walks the text.
+    """
+    return matcher.scan(response_text)
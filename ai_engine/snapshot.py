@@ -0,0 +1,142 @@
+"""
+Sensor Snapshot Module
+Latest sensor values, weather and plant summary for AI analyses, built in three queries and memoized briefly.
+"""
+
+import copy
+import random
+import threading
+import time
+from typing import Dict
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from plant.models import Plant
+from sensor.models import LATEST_READING_MAX_AGE, SensorLatest, WeatherData
+
+SNAPSHOT_SETTINGS = getattr(settings, 'AI_SNAPSHOT', {})
+SNAPSHOT_TTL = SNAPSHOT_SETTINGS.get('TTL', 5)
+
+WEATHER_FIELDS = (
+    'temperature', 'humidity', 'rainfall', 'wind_speed', 'weather_condition', 'feels_like_temperature',
+    'uv_index', 'air_quality_index', 'pressure', 'wind_gust', 'cloud_coverage',
+)
+HEALTHY_STATUSES = ('excellent', 'good')
+ATTENTION_STATUSES = ('fair', 'poor', 'critical')
+
+# Sensor type keys (see sensor_key) feeding each IrrigationPredictor input
+PREDICTOR_FEATURE_SENSOR_TYPES = {
+    'soil_moisture': ('soil_moisture', 'tuproq_namligi'),
+    'air_humidity': ('air_humidity', 'havo_namligi'),
+    'temperature': ('air_temperature', 'temperature', 'havo_harorati'),
+}
+
+# Same defaults as IrrigationPredictor.predict_irrigation_need
+PREDICTOR_FEATURE_DEFAULTS = {'soil_moisture': 50, 'air_humidity': 60, 'temperature': 25}
+
+
+def sensor_key(sensor_type_name: str) -> str:
+    """Analysis input key of a sensor type, e.g. 'Soil Moisture' -> 'soil_moisture'"""
+    return sensor_type_name.lower().replace(' ', '_')
+
+
+def collect_sensor_values() -> Dict[str, float]:
+    """
+    Current value per active sensor type, from the SensorLatest table in one query
+
+    Readings older than LATEST_READING_MAX_AGE are left out, as in
+    Sensor.get_latest_reading(). With several sensors of one type the one
+    with the highest id wins.
+    """
+    rows = SensorLatest.objects.filter(
+        sensor__status='active', timestamp__gte=timezone.now() - LATEST_READING_MAX_AGE
+    ).order_by('sensor_id').values_list('sensor__sensor_type__name', 'value')
+    return {sensor_key(type_name): value for type_name, value in rows}
+
+
+def collect_weather() -> Dict:
+    """Latest WeatherData fields (one query), or generated weather if none is stored"""
+    latest_weather = WeatherData.objects.values(*WEATHER_FIELDS).first()
+    if latest_weather:
+        return latest_weather
+
+    # Generate fresh mock weather data
+    return {
+        'temperature': random.uniform(20, 32),
+        'humidity': random.uniform(40, 75),
+        'rainfall': random.uniform(0, 10) if random.random() < 0.3 else 0,
+        'wind_speed': random.uniform(5, 20),
+        'weather_condition': random.choice(['Clear', 'Partly Cloudy', 'Cloudy', 'Rain']),
+        'feels_like_temperature': random.uniform(18, 35),
+        'uv_index': random.uniform(1, 11),
+        'air_quality_index': random.randint(1, 5),
+        'pressure': random.uniform(1010, 1025),
+        'wind_gust': random.uniform(10, 30) if random.random() < 0.5 else None,
+        'cloud_coverage': random.randint(0, 100)
+    }
+
+
+def collect_plant_summary() -> Dict:
+    """Plant counts by health in one aggregate query"""
+    return Plant.objects.aggregate(
+        total_plants=Count('id'),
+        healthy_plants=Count('id', filter=Q(health_status__in=HEALTHY_STATUSES)),
+        plants_needing_attention=Count('id', filter=Q(health_status__in=ATTENTION_STATUSES)),
+    )
+
+
+class SnapshotCache:
+    """
+    Thread-safe memo of the latest snapshot for ttl seconds
+
+    Back-to-back analyses (and concurrent ones: the first builds, the rest
+    wait on the lock) share one set of queries. Callers get deep copies, so
+    mutating a snapshot never leaks into the next request.
+    """
+
+    def __init__(self, ttl: float = SNAPSHOT_TTL):
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._expires_at = 0.0
+        self._stats = {'hits': 0, 'builds': 0}
+
+    def get(self) -> Dict:
+        with self._lock:
+            if self._snapshot is None or time.monotonic() >= self._expires_at:
+                self._snapshot = {
+                    'sensors': collect_sensor_values(),
+                    'weather': collect_weather(),
+                    'plants': collect_plant_summary(),
+                    'taken_at': timezone.now().isoformat(),
+                }
+                self._expires_at = time.monotonic() + self.ttl
+                self._stats['builds'] += 1
+            else:
+                self._stats['hits'] += 1
+            return copy.deepcopy(self._snapshot)
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            age = None if self._snapshot is None else self.ttl - (self._expires_at - time.monotonic())
+            return {**self._stats, 'ttl_seconds': self.ttl, 'age_seconds': None if age is None else round(age, 1)}
+
+
+snapshot_cache = SnapshotCache()
+
+
+def get_snapshot() -> Dict:
+    """
+    Inputs shared by the AI analysis views
+
+    Returns:
+        dict: {'sensors': {key: value}, 'weather': {...}, 'plants': {counts}, 'taken_at': iso time}
+    """
+    return snapshot_cache.get()
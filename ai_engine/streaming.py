@@ -0,0 +1,218 @@
+"""
+AI Analysis Streaming Module
+Server-Sent Events stream of a comprehensive Gemini analysis as it is generated.
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+from .cache import input_fingerprint
+from .jobs import (
+    ACTIVE_STATUSES, coalesce_analysis, expire_stale_session, job_queue, session_payload, store_analysis_failure,
+    store_analysis_result
+)
+from .models import AIAnalysisSession
+from .predictors import get_gemini_integration
+
+logger = logging.getLogger(__name__)
+
+STREAM_SETTINGS = getattr(settings, 'AI_STREAM', {})
+KEEPALIVE_SECONDS = STREAM_SETTINGS.get('KEEPALIVE_SECONDS', 15)
+POLL_INTERVAL = STREAM_SETTINGS.get('POLL_INTERVAL', 1)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets DRF content negotiation accept 'Accept: text/event-stream' on streaming views"""
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Streaming views return a StreamingHttpResponse; only error Responses get here
+        return sse_event('error', data)
+
+
+def sse_event(event: str, data) -> bytes:
+    """One Server-Sent Events frame; the JSON payload has no raw newlines, so it fits one data line"""
+    return f'event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'.encode()
+
+
+KEEPALIVE_FRAME = b': keepalive\n\n'
+
+
+class AnalysisBroadcast:
+    """
+    SSE frames of one streamed analysis, replayed to every client attached to it
+
+    The job publishes frames as Gemini generates them; each client reads
+    from the first frame on, so a client joining mid-stream still gets the
+    whole text. Clients going away do not affect the job.
+    """
+
+    def __init__(self):
+        self._frames: List[bytes] = []
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def publish(self, frame: bytes):
+        with self._condition:
+            self._frames.append(frame)
+            self._condition.notify_all()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def frames(self, keepalive: float = KEEPALIVE_SECONDS) -> Iterator[bytes]:
+        """All frames from the first one, then new ones as they are published, until closed"""
+        index = 0
+        while True:
+            with self._condition:
+                if index >= len(self._frames) and not self._closed:
+                    self._condition.wait(keepalive)
+                pending = self._frames[index:]
+                closed = self._closed
+            index += len(pending)
+
+            if pending:
+                yield from pending
+            elif closed:
+                return
+            else:
+                yield KEEPALIVE_FRAME  # Keeps proxies from dropping an idle connection (queued job)
+
+
+# Broadcasts of streamed analyses running in this process, by session_id
+_broadcasts: Dict[str, AnalysisBroadcast] = {}
+_broadcasts_lock = threading.Lock()
+
+
+def run_streamed_analysis(session_id: str, broadcast: AnalysisBroadcast, sensors_data: Dict, weather_data: Dict,
+                          plant_data: Dict, historical_trends: Dict, field_params: Dict = None,
+                          plant_params: Dict = None):
+    """
+    Job: stream one comprehensive analysis into its broadcast and store the outcome on its session
+
+    Events, in order:
+        chunk: {'text'} - Gemini output as it is generated
+        field: {'name', 'value'} - a parsed field (urgency, timing, ...) changed
+        result: the analysis/<session_id>/ status payload of the completed session
+        error: {'error'} - the analysis failed, the session is marked failed
+    """
+    try:
+        session = AIAnalysisSession.objects.get(session_id=session_id)
+        session.status = 'running'
+        session.save(update_fields=['status'])
+        started = time.monotonic()
+
+        try:
+            for event, data in get_gemini_integration().stream_comprehensive_analysis(
+                sensors_data, weather_data, plant_data, historical_trends, field_params, plant_params
+            ):
+                if event == 'result':
+                    store_analysis_result(session, data, sensors_data, started)
+                    data = session_payload(session)
+                broadcast.publish(sse_event(event, data))
+
+        except Exception as e:
+            logger.error(f"Streamed AI analysis error (session {session_id}): {e}")
+            store_analysis_failure(session, str(e), started)
+            broadcast.publish(sse_event('error', {
+                'error': str(e),
+                'message': 'Keng qamrovli AI tahlili xatosi'
+            }))
+            raise
+    finally:
+        broadcast.close()
+        with _broadcasts_lock:
+            _broadcasts.pop(session_id, None)
+
+
+def start_streamed_analysis(sensors_data: Dict, weather_data: Dict, plant_data: Dict, historical_trends: Dict,
+                            field_params: Dict = None, plant_params: Dict = None,
+                            session_type: str = 'manual') -> Tuple[str, Optional[AnalysisBroadcast], bool]:
+    """
+    Queue a streamed comprehensive analysis, or attach to the one in flight for the same inputs
+
+    Shares the job queue and the input-fingerprint coalescing of the queued
+    analysis: a queued and a streamed request for the same snapshot also
+    share one Gemini call.
+
+    Returns:
+        tuple: (session_id, broadcast or None if the job runs elsewhere, coalesced)
+
+    Raises:
+        QueueFull: If a new job is needed and the queue is full
+    """
+    fingerprint = input_fingerprint(
+        sensors_data, weather_data, plant_data, historical_trends, field_params, plant_params
+    )
+
+    def submit(session) -> Future:
+        broadcast = AnalysisBroadcast()
+        with _broadcasts_lock:
+            _broadcasts[session.session_id] = broadcast
+        try:
+            return job_queue.submit(
+                run_streamed_analysis, session.session_id, broadcast, sensors_data, weather_data, plant_data,
+                historical_trends, field_params, plant_params
+            )
+        except Exception:
+            with _broadcasts_lock:
+                _broadcasts.pop(session.session_id, None)
+            raise
+
+    session_id, coalesced = coalesce_analysis(fingerprint, submit, sensors_data, weather_data, plant_data, session_type)
+    with _broadcasts_lock:
+        broadcast = _broadcasts.get(session_id)
+    return session_id, broadcast, coalesced
+
+
+def _polled_frames(session_id: str, poll_interval: float = POLL_INTERVAL) -> Iterator[bytes]:
+    """Result frame of a session run by a queued job or another process, polled from the database"""
+    while True:
+        session = AIAnalysisSession.objects.get(session_id=session_id)
+        expire_stale_session(session)
+        if session.status not in ACTIVE_STATUSES:
+            break
+        yield KEEPALIVE_FRAME
+        time.sleep(poll_interval)
+
+    if session.status == 'completed':
+        yield sse_event('result', session_payload(session))
+    else:
+        yield sse_event('error', {
+            'error': session.error_message or f'Analysis {session.status}',
+            'message': 'Keng qamrovli AI tahlili xatosi'
+        })
+
+
+def analysis_event_stream(session_id: str, broadcast: Optional[AnalysisBroadcast],
+                          coalesced: bool = False) -> Iterator[bytes]:
+    """
+    SSE frames for one client of a streamed comprehensive analysis
+
+    Starts with a 'session' event (session_id, status_url, coalesced), sent
+    before Gemini is called, then replays the broadcast (see
+    run_streamed_analysis for its events). Without a broadcast in this
+    process the session is polled and only its 'result' or 'error' is sent.
+    """
+    yield sse_event('session', {
+        'session_id': session_id,
+        'status_url': f'/api/ai/analysis/{session_id}/',
+        'coalesced': coalesced
+    })
+
+    if broadcast is not None:
+        yield from broadcast.frames()
+    else:
+        yield from _polled_frames(session_id)
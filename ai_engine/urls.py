@@ -3,10 +3,14 @@ from . import views
 
 urlpatterns = [
     path('analyze-irrigation/', views.analyze_irrigation_need, name='analyze-irrigation'),
+    path('analyze-irrigation/zones/', views.analyze_zones_irrigation, name='analyze-irrigation-zones'),
     path('analyze-plant-health/', views.analyze_plant_health, name='analyze-plant-health'),
     path('comprehensive-analysis/', views.comprehensive_analysis, name='comprehensive-analysis'),
+    path('comprehensive-analysis/stream/', views.comprehensive_analysis_stream, name='comprehensive-analysis-stream'),
+    path('analysis/<str:session_id>/', views.get_analysis_status, name='analysis-status'),
     path('insights/', views.get_ai_insights, name='ai-insights'),
     path('models/status/', views.get_ai_model_status, name='ai-model-status'),
+    path('metrics/', views.get_ai_metrics, name='ai-metrics'),
     path('analysis-history/', views.get_analysis_history, name='analysis-history'),
     path('train-model/', views.train_model, name='train-model'),
 ]
\ No newline at end of file
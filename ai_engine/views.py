@@ -1,70 +1,55 @@
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from datetime import timedelta
-import uuid
+import time
 import logging
+import re
+import numpy as np
 
 from .models import AIModel, AIPrediction, AIAnalysisSession, AIInsight
-from .predictors import irrigation_predictor, plant_health_analyzer, gemini_integration
-from sensor.models import Sensor, SensorReading, WeatherData
-from plant.models import Plant
+from .backtest import DEFAULT_DAYS, MODEL_BACKTESTS, apply_backtest, run_backtest
+from .cache import response_cache
+from .jobs import (
+    QueueFull, analysis_flights, enqueue_comprehensive_analysis, expire_stale_session, job_queue, session_payload
+)
+from .snapshot import (
+    PREDICTOR_FEATURE_DEFAULTS, PREDICTOR_FEATURE_SENSOR_TYPES, get_snapshot, sensor_key, snapshot_cache
+)
+from .streaming import EventStreamRenderer, analysis_event_stream, start_streamed_analysis
+from .predictors import irrigation_predictor, plant_health_analyzer, get_gemini_integration
+from sensor.models import LATEST_READING_MAX_AGE, SensorLatest, SensorReading, WeatherData
+from plant.models import Plant, IrrigationZone
+from controller.models import DeviceChannel, ZonePump
 
 logger = logging.getLogger(__name__)
 
+# Weather inputs of the irrigation predictor (plus 'rainfall_forecast')
+IRRIGATION_WEATHER_FIELDS = (
+    'temperature', 'humidity', 'wind_speed', 'pressure', 'feels_like_temperature',
+    'uv_index', 'air_quality_index', 'wind_gust',
+)
+
 
 @api_view(['POST'])
 def analyze_irrigation_need(request):
     """Analyze irrigation need using AI"""
     try:
-        # Generate FRESH sensor data for analysis
-        sensors_data = {}
-        
-        # Collect data from all active sensors - generate new readings
-        sensors = Sensor.objects.filter(status='active')
-        for sensor in sensors:
-            # Oxirgi mavjud reading'ni olish AI tahlil uchun
-            latest_reading = sensor.get_latest_reading()
-            if latest_reading:
-                sensor_key = sensor.sensor_type.name.lower().replace(' ', '_')
-                sensors_data[sensor_key] = latest_reading.value
-        
-        # Get or generate fresh weather data
-        latest_weather = WeatherData.objects.first()
-        weather_data = {}
-        if latest_weather:
-            weather_data = {
-                'temperature': latest_weather.temperature,
-                'humidity': latest_weather.humidity,
-                'rainfall_forecast': latest_weather.rainfall,
-                'wind_speed': latest_weather.wind_speed,
-                'pressure': latest_weather.pressure,
-                'feels_like_temperature': latest_weather.feels_like_temperature,
-                'uv_index': latest_weather.uv_index,
-                'air_quality_index': latest_weather.air_quality_index,
-                'wind_gust': latest_weather.wind_gust
-            }
-        else:
-            # Generate mock weather data if none exists
-            import random
-            weather_data = {
-                'temperature': random.uniform(20, 32),
-                'humidity': random.uniform(40, 75),
-                'rainfall_forecast': random.uniform(0, 10) if random.random() < 0.3 else 0,
-                'wind_speed': random.uniform(5, 20),
-                'pressure': random.uniform(1010, 1025),
-                'feels_like_temperature': random.uniform(18, 35),
-                'uv_index': random.uniform(1, 11),
-                'air_quality_index': random.randint(1, 5),
-                'wind_gust': random.uniform(10, 30) if random.random() < 0.5 else None
-            }
+        # Latest sensor values, weather and plant counts (shared with back-to-back analyses)
+        snapshot = get_snapshot()
+        sensors_data = snapshot['sensors']
         
-        # Get plant data
-        plants = Plant.objects.all()
+        weather = snapshot['weather']
+        weather_data = {key: weather[key] for key in IRRIGATION_WEATHER_FIELDS}
+        weather_data['rainfall_forecast'] = weather['rainfall']
+        
+        plants = snapshot['plants']
         plant_data = {
-            'total_plants': plants.count(),
-            'average_health': plants.filter(health_status__in=['excellent', 'good']).count() / max(1, plants.count()) * 100
+            'total_plants': plants['total_plants'],
+            'average_health': plants['healthy_plants'] / max(1, plants['total_plants']) * 100
         }
         
         # Run AI prediction
@@ -76,7 +61,7 @@ def analyze_irrigation_need(request):
         if not prediction_result.get('error'):
             ai_model, created = AIModel.objects.get_or_create(
                 model_type='irrigation_predictor',
-                defaults={'name': 'Irrigation Predictor', 'accuracy': 94.2}
+                defaults={'name': 'Irrigation Predictor'}
             )
             
             AIPrediction.objects.create(
@@ -104,6 +89,152 @@ def analyze_irrigation_need(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _name_tokens(text):
+    """Lower-cased word tokens, so 'Zona 1' matches 'zona 1, row 3' but not 'Zona 10'"""
+    return tuple(re.findall(r'\w+', text.lower()))
+
+
+def _zone_feature_columns(zones):
+    """
+    Average the latest sensor values per zone into predictor input columns
+
+    A sensor belongs to a zone when it is wired to the zone's controller
+    (DeviceChannel -> ZonePump) or its location contains the zone name as
+    whole words. Only readings newer than LATEST_READING_MAX_AGE count, as
+    in Sensor.get_latest_reading(). Zones without a sensor of some type use
+    the farm-wide average, then the predictor default.
+
+    Sensors are matched through device and name indexes, never zone by
+    zone, and the averages are computed with one bincount per feature.
+
+    Args:
+        zones (list): IrrigationZone instances
+
+    Returns:
+        dict: Feature name -> list of values in zone order, plus 'sensor_count'
+    """
+    feature_by_type = {
+        type_key: feature
+        for feature, type_keys in PREDICTOR_FEATURE_SENSOR_TYPES.items()
+        for type_key in type_keys
+    }
+    features = list(PREDICTOR_FEATURE_SENSOR_TYPES)
+
+    zone_index = {zone.id: index for index, zone in enumerate(zones)}
+    device_zones = {}
+    for zone_pk, device_id in ZonePump.objects.filter(zone_id__in=zone_index).values_list('zone_id', 'device_id'):
+        device_zones.setdefault(device_id, set()).add(zone_index[zone_pk])
+    name_zones = {}
+    for index, zone in enumerate(zones):
+        tokens = _name_tokens(zone.name)
+        if tokens:
+            name_zones.setdefault(tokens, set()).add(index)
+    longest_name = max(map(len, name_zones), default=0)
+
+    sensor_devices = {}
+    for sensor_id, device_id in DeviceChannel.objects.values_list('sensor_id', 'device_id'):
+        sensor_devices.setdefault(sensor_id, []).append(device_id)
+
+    latest = SensorLatest.objects.filter(
+        sensor__status='active', timestamp__gte=timezone.now() - LATEST_READING_MAX_AGE
+    ).values_list('sensor_id', 'value', 'sensor__sensor_type__name', 'sensor__location')
+
+    # One (zone, feature, value) entry per sensor and zone it belongs to
+    farm_values = {feature: [] for feature in features}
+    pair_zones, pair_features, pair_values = [], [], []
+    for sensor_id, value, type_name, location in latest:
+        feature = feature_by_type.get(sensor_key(type_name))
+        if not feature:
+            continue
+        farm_values[feature].append(value)
+
+        matched = set()
+        for device_id in sensor_devices.get(sensor_id, ()):
+            matched |= device_zones.get(device_id, set())
+        tokens = _name_tokens(location)
+        for size in range(1, min(longest_name, len(tokens)) + 1):
+            for offset in range(len(tokens) - size + 1):
+                matched |= name_zones.get(tokens[offset:offset + size], set())
+
+        pair_zones.extend(matched)
+        pair_features.extend([features.index(feature)] * len(matched))
+        pair_values.extend([value] * len(matched))
+
+    pair_zones = np.array(pair_zones, dtype=int)
+    pair_features = np.array(pair_features, dtype=int)
+    pair_values = np.array(pair_values, dtype=float)
+
+    columns = {}
+    sensor_count = np.zeros(len(zones), dtype=int)
+    for feature_index, feature in enumerate(features):
+        values = farm_values[feature]
+        fallback = sum(values) / len(values) if values else PREDICTOR_FEATURE_DEFAULTS[feature]
+
+        selected = pair_features == feature_index
+        counts = np.bincount(pair_zones[selected], minlength=len(zones))
+        sums = np.bincount(pair_zones[selected], weights=pair_values[selected], minlength=len(zones))
+        columns[feature] = np.where(counts > 0, sums / np.maximum(counts, 1), fallback).tolist()
+        sensor_count += counts
+
+    columns['sensor_count'] = sensor_count.tolist()
+    return columns
+
+
+@api_view(['GET'])
+def analyze_zones_irrigation(request):
+    """
+    Predict irrigation need for every active zone in one vectorized batch
+
+    Query params:
+        zone_id: Limit to these zones (repeatable)
+    """
+    try:
+        zones = IrrigationZone.objects.filter(status='active').order_by('zone_id')
+        zone_ids = request.query_params.getlist('zone_id')
+        if zone_ids:
+            zones = zones.filter(zone_id__in=zone_ids)
+        zones = list(zones)
+
+        columns = _zone_feature_columns(zones)
+        latest_weather = WeatherData.objects.first()
+        rainfall_forecast = latest_weather.rainfall if latest_weather else 0
+
+        started = time.perf_counter()
+        predictions = irrigation_predictor.predict_batch(
+            columns['soil_moisture'], columns['air_humidity'], columns['temperature'],
+            rainfall_forecast, zone_ids=[zone.zone_id for zone in zones]
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        for index, (prediction, zone) in enumerate(zip(predictions, zones)):
+            prediction.update({
+                'zone_name': zone.name,
+                'sensor_count': columns['sensor_count'][index],
+                'inputs': {
+                    'soil_moisture': round(columns['soil_moisture'][index], 1),
+                    'air_humidity': round(columns['air_humidity'][index], 1),
+                    'temperature': round(columns['temperature'][index], 1),
+                    'rainfall_forecast': rainfall_forecast,
+                },
+            })
+
+        return Response({
+            'zones': predictions,
+            'total_zones': len(predictions),
+            'zones_needing_irrigation': sum(1 for prediction in predictions if prediction['need_irrigation']),
+            'prediction_ms': round(elapsed_ms, 2),
+            'model_version': irrigation_predictor.model_version,
+            'timestamp': timezone.now().isoformat()
+        }, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        logger.error(f"AI zone irrigation analysis error: {e}")
+        return Response({
+            'error': str(e),
+            'message': 'Zonalar bo\'yicha AI tahlil xatosi yuz berdi'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['POST'])
 def analyze_plant_health(request):
     """Analyze plant health using AI"""
@@ -121,15 +252,8 @@ def analyze_plant_health(request):
         if not plant:
             return Response({'error': 'No plants found'}, status=status.HTTP_404_NOT_FOUND)
         
-        # Generate FRESH sensor data for plant health analysis
-        sensors_data = {}
-        sensors = Sensor.objects.filter(status='active')
-        for sensor in sensors:
-            # Oxirgi mavjud reading'ni olish AI tahlil uchun
-            latest_reading = sensor.get_latest_reading()
-            if latest_reading:
-                sensor_key = sensor.sensor_type.name.lower().replace(' ', '_')
-                sensors_data[sensor_key] = latest_reading.value
+        # Latest sensor values for plant health analysis
+        sensors_data = get_snapshot()['sensors']
         
         # Get plant data
         plant_data = {
@@ -152,7 +276,7 @@ def analyze_plant_health(request):
         if not health_result.get('error'):
             ai_model, created = AIModel.objects.get_or_create(
                 model_type='plant_health',
-                defaults={'name': 'Plant Health Analyzer', 'accuracy': 89.5}
+                defaults={'name': 'Plant Health Analyzer'}
             )
             
             AIPrediction.objects.create(
@@ -179,145 +303,122 @@ def analyze_plant_health(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _comprehensive_analysis_inputs(request):
+    """
+    Collect the inputs of a comprehensive AI analysis
+
+    Returns:
+        tuple: (sensors_data, weather_data, plant_data, historical_trends, field_params, plant_params)
+    """
+    snapshot = get_snapshot()
+    sensors_data = snapshot['sensors']
+    weather_data = snapshot['weather']
+    plant_data = snapshot['plants']
+    
+    # Historical trends (mock)
+    historical_trends = {
+        'irrigation_frequency': 'Haftada 4 marta',
+        'water_usage_trend': 'So\'ngi haftada 15% kamaydi',
+        'plant_growth_rate': 'Normal'
+    }
+    
+    # Foydalanuvchi parametrlarini olish
+    field_params = request.data.get('field_parameters', {})
+    plant_params = request.data.get('plant_parameters', {})
+    
+    return sensors_data, weather_data, plant_data, historical_trends, field_params, plant_params
+
+
 @api_view(['POST'])
 def comprehensive_analysis(request):
-    """Comprehensive AI analysis using Gemini"""
+    """Queue a comprehensive AI analysis using Gemini (202 + session_id, poll analysis/<session_id>/)"""
     try:
-        # Start analysis session
-        session_id = str(uuid.uuid4())[:8]
-        session = AIAnalysisSession.objects.create(
-            session_id=session_id,
-            session_type='manual',
-            input_sensors=[],
-            recommendations=[],
-            critical_alerts=[]
-        )
+        inputs = _comprehensive_analysis_inputs(request)
+        
+        # Queue the Gemini analysis (or join an identical one in flight); the client polls analysis/<session_id>/
+        try:
+            session, coalesced = enqueue_comprehensive_analysis(*inputs)
+        except QueueFull as e:
+            response = Response({
+                'error': str(e),
+                'message': 'AI tahlil navbati to\'lgan, birozdan keyin qayta urinib ko\'ring'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            response['Retry-After'] = '5'
+            return response
         
-        # Collect all data with FRESH sensor readings
-        sensors_data = {}
-        sensors = Sensor.objects.filter(status='active')
-        for sensor in sensors:
-            # Oxirgi mavjud reading'ni olish keng qamrovli AI tahlil uchun
-            latest_reading = sensor.get_latest_reading()
-            if latest_reading:
-                sensor_key = sensor.sensor_type.name.lower().replace(' ', '_')
-                sensors_data[sensor_key] = latest_reading.value
-        
-        # Get or generate fresh weather data for comprehensive analysis
-        latest_weather = WeatherData.objects.first()
-        weather_data = {}
-        if latest_weather:
-            weather_data = {
-                'temperature': latest_weather.temperature,
-                'humidity': latest_weather.humidity,
-                'rainfall': latest_weather.rainfall,
-                'wind_speed': latest_weather.wind_speed,
-                'weather_condition': latest_weather.weather_condition,
-                'feels_like_temperature': latest_weather.feels_like_temperature,
-                'uv_index': latest_weather.uv_index,
-                'air_quality_index': latest_weather.air_quality_index,
-                'pressure': latest_weather.pressure,
-                'wind_gust': latest_weather.wind_gust,
-                'cloud_coverage': latest_weather.cloud_coverage
-            }
-        else:
-            # Generate fresh mock weather data
-            import random
-            weather_data = {
-                'temperature': random.uniform(20, 32),
-                'humidity': random.uniform(40, 75),
-                'rainfall': random.uniform(0, 10) if random.random() < 0.3 else 0,
-                'wind_speed': random.uniform(5, 20),
-                'weather_condition': random.choice(['Clear', 'Partly Cloudy', 'Cloudy', 'Rain']),
-                'feels_like_temperature': random.uniform(18, 35),
-                'uv_index': random.uniform(1, 11),
-                'air_quality_index': random.randint(1, 5),
-                'pressure': random.uniform(1010, 1025),
-                'wind_gust': random.uniform(10, 30) if random.random() < 0.5 else None,
-                'cloud_coverage': random.randint(0, 100)
-            }
-        
-        # Plant data
-        plants = Plant.objects.all()
-        plant_data = {
-            'total_plants': plants.count(),
-            'healthy_plants': plants.filter(health_status__in=['excellent', 'good']).count(),
-            'plants_needing_attention': plants.filter(health_status__in=['fair', 'poor', 'critical']).count()
-        }
-        
-        # Historical trends (mock)
-        historical_trends = {
-            'irrigation_frequency': 'Haftada 4 marta',
-            'water_usage_trend': 'So\'ngi haftada 15% kamaydi',
-            'plant_growth_rate': 'Normal'
-        }
-        
-        # Foydalanuvchi parametrlarini olish
-        field_params = request.data.get('field_parameters', {})
-        plant_params = request.data.get('plant_parameters', {})
-        
-        # Run Gemini analysis
-        gemini_result = gemini_integration.analyze_comprehensive_data(
-            sensors_data, weather_data, plant_data, historical_trends,
-            field_params, plant_params
-        )
-        
-        # Update session with results
-        session.status = 'completed'
-        session.completed_at = timezone.now()
-        session.predictions_generated = 1
-        session.recommendations = gemini_result.get('action_plan', [])
-        
-        # Check for critical alerts
-        if sensors_data.get('soil_moisture', 50) < 25:
-            session.critical_alerts.append({
-                'type': 'critical_soil_moisture',
-                'message': 'Tuproq namligi kritik darajada',
-                'timestamp': timezone.now().isoformat()
-            })
-        
-        session.save()
-        
-        # Create insights
-        insights = gemini_result.get('insights', [])
-        for insight_data in insights:
-            AIInsight.objects.create(
-                insight_type='pattern_discovery',
-                title=insight_data.get('title', 'AI Insight'),
-                description=insight_data.get('description', ''),
-                importance_level=insight_data.get('priority', 'medium'),
-                supporting_data={'session_id': session_id},
-                confidence_level=gemini_result.get('confidence_score', 85)
-            )
-        
-        # Ensure gemini_raw_response is included in the response
-        if (gemini_result.get('gemini_analysis') and 
-            'gemini_raw_response' not in gemini_result['gemini_analysis'] and
-            gemini_result['gemini_analysis'].get('detailed_reasoning')):
-            # Use detailed_reasoning as fallback for raw response
-            gemini_result['gemini_analysis']['gemini_raw_response'] = gemini_result['gemini_analysis']['detailed_reasoning']
-
         return Response({
-            'session_id': session_id,
-            'analysis_result': gemini_result,
+            'session_id': session.session_id,
             'session_status': session.status,
-            'critical_alerts': session.critical_alerts,
-            'recommendations': session.recommendations
-        }, status=status.HTTP_200_OK)
+            'coalesced': coalesced,
+            'status_url': f'/api/ai/analysis/{session.session_id}/'
+        }, status=status.HTTP_202_ACCEPTED)
         
     except Exception as e:
         logger.error(f"Comprehensive AI analysis error: {e}")
-        if 'session' in locals():
-            session.status = 'failed'
-            session.completed_at = timezone.now()
-            session.save()
+        return Response({
+            'error': str(e),
+            'message': 'Keng qamrovli AI tahlili xatosi'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+def comprehensive_analysis_stream(request):
+    """
+    Stream a comprehensive AI analysis as Server-Sent Events while Gemini generates it
+    
+    Runs on the same bounded job queue as comprehensive_analysis and joins an
+    identical analysis already in flight instead of calling Gemini again.
+    """
+    try:
+        inputs = _comprehensive_analysis_inputs(request)
+        
+        try:
+            session_id, broadcast, coalesced = start_streamed_analysis(*inputs)
+        except QueueFull as e:
+            response = Response({
+                'error': str(e),
+                'message': 'AI tahlil navbati to\'lgan, birozdan keyin qayta urinib ko\'ring'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            response['Retry-After'] = '5'
+            return response
+        
+        response = StreamingHttpResponse(
+            analysis_event_stream(session_id, broadcast, coalesced), content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Don't let a reverse proxy buffer the stream
+        return response
         
+    except Exception as e:
+        logger.error(f"Streamed AI analysis error: {e}")
         return Response({
             'error': str(e),
             'message': 'Keng qamrovli AI tahlili xatosi'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+def get_analysis_status(request, session_id):
+    """Get the status of a queued comprehensive analysis, with its result once completed"""
+    try:
+        session = AIAnalysisSession.objects.filter(session_id=session_id).first()
+        if session is None:
+            return Response({
+                'error': f'Unknown session: {session_id}',
+                'message': 'AI tahlil sessiyasi topilmadi'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        expire_stale_session(session)
+        return Response(session_payload(session), status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        logger.error(f"AI analysis status error: {e}")
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['GET'])
 def get_ai_insights(request):
     """Get latest AI insights"""
@@ -378,6 +479,25 @@ def get_ai_model_status(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+def get_ai_metrics(request):
+    """Get Gemini response cache, analysis job queue and API budget metrics"""
+    try:
+        return Response({
+            'response_cache': response_cache.stats(),
+            'analysis_jobs': job_queue.stats(),
+            'analysis_coalescing': analysis_flights.stats(),
+            'gemini_budget': get_gemini_integration().budget.snapshot(),
+            'sensor_snapshot': snapshot_cache.stats(),
+            'timestamp': timezone.now().isoformat()
+        }, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['GET'])
 def get_analysis_history(request):
     """Get AI analysis session history"""
@@ -408,32 +528,53 @@ def get_analysis_history(request):
 
 @api_view(['POST'])
 def train_model(request):
-    """Mock training endpoint for AI models"""
+    """Re-evaluate an AI model by backtesting it against recorded history"""
     try:
         model_type = request.data.get('model_type', 'irrigation_predictor')
+        if model_type not in MODEL_BACKTESTS:
+            return Response({
+                'error': f'No backtest for model type: {model_type}',
+                'message': 'Bu model turi uchun tarixiy baholash mavjud emas'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            days = int(request.data.get('days', DEFAULT_DAYS))
+        except (TypeError, ValueError):
+            days = 0
+        if not 1 <= days <= 366:
+            return Response({
+                'error': 'days must be between 1 and 366',
+                'message': 'Kunlar soni 1 dan 366 gacha bo\'lishi kerak'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        result = run_backtest(model_type, days)
+        if not result['combined']['samples']:
+            return Response({
+                'error': 'No history to evaluate',
+                'message': 'Baholash uchun tarixiy ma\'lumotlar topilmadi',
+                'backtest': result
+            }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
         
-        # Simulate training process
         ai_model, created = AIModel.objects.get_or_create(
             model_type=model_type,
             defaults={'name': f'{model_type.title()} Model'}
         )
-        
-        # Mock training improvement
-        import random
-        improvement = random.uniform(0.5, 2.0)
-        ai_model.accuracy = min(99.9, ai_model.accuracy + improvement)
-        ai_model.training_data_count += random.randint(100, 500)
-        ai_model.last_trained = timezone.now()
-        ai_model.save()
+        previous_accuracy = ai_model.accuracy
+        apply_backtest(ai_model, result)
         
         return Response({
-            'message': f'{ai_model.name} muvaffaqiyatli qayta o\'qitildi',
+            'message': f'{ai_model.name} tarixiy ma\'lumotlar asosida qayta baholandi',
             'new_accuracy': round(ai_model.accuracy, 1),
+            'precision': ai_model.precision,
+            'recall': ai_model.recall,
+            'f1_score': ai_model.f1_score,
             'training_data_count': ai_model.training_data_count,
-            'improvement': round(improvement, 1)
+            'improvement': round(ai_model.accuracy - previous_accuracy, 1),
+            'backtest': result
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
+        logger.error(f"AI model backtest error: {e}")
         return Response({
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -75,6 +76,9 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
+# DB_PROFILE=production enables persistent connections and the SQLite pragmas below
+DB_PROFILE = os.environ.get('DB_PROFILE', 'development')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -82,6 +86,26 @@ DATABASES = {
     }
 }
 
+# Applied to every new SQLite connection by config.sqlite (see SensorConfig.ready)
+SQLITE_PRAGMAS = {}
+
+if DB_PROFILE == 'production':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': 600,  # Reuse connections across requests
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 10,  # Seconds to wait for the write lock
+        },
+    })
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'wal',  # Readers no longer block the writer (persists in the DB file)
+        'synchronous': 'normal',  # Safe with WAL, fsync only at checkpoints
+        'busy_timeout': 10000,  # ms
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,  # Negative = KiB, i.e. 64 MB page cache
+        'temp_store': 'memory',
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -143,3 +167,102 @@ IRRIGATION_SETTINGS = {
     'OPTIMAL_PH_MIN': 6.5,
     'OPTIMAL_PH_MAX': 7.2,
 }
+
+# Sensor ingestion settings
+SENSOR_INGEST = {
+    'CHUNK_SIZE': 500,  # Rows per bulk_create transaction
+    'MAX_BATCH_ROWS': 10000,  # Max rows accepted per bulk request
+    # Queue validated readings and write them in the background (202). Pending readings (up to
+    # BUFFER_MAX_ROWS) live only in process memory: they are flushed on a normal exit, but lost if
+    # the worker is killed (SIGKILL, OOM killer, crash). Set False where every 2xx must be durable.
+    'BUFFER_ENABLED': True,
+    'BUFFER_MAX_ROWS': 50000,  # Pending readings before requests get 503 + Retry-After
+    'BUFFER_FLUSH_ROWS': 2000,  # Flush as soon as this many readings are pending
+    'BUFFER_FLUSH_INTERVAL': 1.0,  # Seconds between flushes otherwise
+}
+
+# Sensor rollup settings
+SENSOR_ROLLUPS = {
+    'BATCH_SIZE': 5000,  # Readings folded into hourly/daily buckets per transaction
+}
+
+# Sensor retention settings (per-type retention days live on SensorType)
+SENSOR_RETENTION = {
+    'BATCH_SIZE': 1000,  # Rows deleted per transaction
+    'BATCH_PAUSE_SECONDS': 0.05,  # Pause between batches so writers can take the lock
+}
+
+# ESP32 controller communication settings
+ESP32_SETTINGS = {
+    'REQUEST_TIMEOUT': 5,  # Seconds per device request
+    'BROADCAST_DEADLINE': 8,  # Seconds for a whole fan-out (e.g. emergency stop)
+    'MAX_WORKERS': 16,  # Threads shared by all fan-outs
+    'BREAKER_FAILURE_THRESHOLD': 3,  # Consecutive failures before a device circuit opens
+    'BREAKER_BASE_BACKOFF': 5,  # Seconds open after the first trip, doubled on each re-trip
+    'BREAKER_MAX_BACKOFF': 300,
+    'HEALTH_TTL': 30,  # Seconds before cached device health is reported stale
+    'HEALTH_PROBE_INTERVAL': 15,  # Seconds between background health probes
+    'REGISTRY_CHECK_INTERVAL': 5,  # Seconds between checks of the device tables for edits by other workers
+    'REGISTRY_TTL': 60,  # Seconds before the device registry is reloaded regardless
+}
+
+# Gemini response cache (keyed by the analysis prompt built from bucketed inputs)
+AI_RESPONSE_CACHE = {
+    'ENABLED': True,
+    'TTL': 900,  # Seconds a cached Gemini answer stays valid
+    'MAX_ENTRIES': 256,  # LRU size, in memory and in the database
+    'DEFAULT_BUCKET': 1,  # Rounding step for numeric inputs without their own bucket
+    'BUCKETS': {
+        'soil_moisture': 2,
+        'air_humidity': 5,
+        'humidity': 5,
+        'soil_temperature': 0.5,
+        'air_temperature': 0.5,
+        'temperature': 0.5,
+        'feels_like_temperature': 1,
+        'ph': 0.1,
+        'conductivity': 0.1,
+        'light_intensity': 50,
+        'pressure': 2,
+        'wind_speed': 2,
+        'wind_gust': 5,
+        'uv_index': 1,
+        'rainfall': 0.5,
+        'cloud_coverage': 10,
+    },
+}
+
+# Background AI analysis jobs (comprehensive analysis runs off the request thread)
+AI_JOBS = {
+    'MAX_WORKERS': 2,  # Concurrent Gemini analyses per process
+    'MAX_PENDING': 20,  # Queued + running jobs before requests get 503 + Retry-After
+    'STALE_AFTER': 600,  # Seconds before a queued/running session is reported as lost
+}
+
+# Streamed comprehensive analyses (comprehensive-analysis/stream/)
+AI_STREAM = {
+    'KEEPALIVE_SECONDS': 15,  # SSE comment sent while a client waits for its queued job
+    'POLL_INTERVAL': 1,  # Seconds between status checks of an analysis run by another process
+}
+
+# Shared sensor/weather/plant snapshot for AI analyses (ai_engine.snapshot)
+AI_SNAPSHOT = {
+    'TTL': 5,  # Seconds back-to-back analyses reuse one snapshot
+}
+
+# Backtests of the AI predictors against recorded history (manage.py backtest_models, train-model/)
+AI_BACKTEST = {
+    'STEP_MINUTES': 60,  # Minutes between replayed sensor snapshots
+    'HORIZON_HOURS': 6,  # Irrigation starting this soon after a snapshot counts as 'irrigation was needed'
+    'WINDOW_DAYS': 7,  # Days of readings loaded and scored per chunk
+    'DEFAULT_DAYS': 30,  # History evaluated by the train-model endpoint
+}
+
+# Gemini API rate limits and daily token budget (ledger: ai_engine.GeminiUsage)
+AI_RATE_LIMITS = {
+    'REQUESTS_PER_MINUTE': 15,
+    'TOKENS_PER_DAY': 1000000,  # Prompt + response tokens, resets at local midnight
+    'MAX_WAIT_SECONDS': 10,  # Wait this long for a request slot, then use the local fallback (0 = never wait)
+    'CHARS_PER_TOKEN': 4,  # Estimate when the API does not report usage
+    'EXPECTED_RESPONSE_TOKENS': 2000,  # Reserved per call when checking the daily budget
+}
@@ -0,0 +1,17 @@
+"""
+SQLite Connection Tuning
+Applies settings.SQLITE_PRAGMAS to every new SQLite connection.
+"""
+
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """connection_created receiver running the configured PRAGMA statements"""
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
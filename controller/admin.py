@@ -0,0 +1,26 @@
+from django.contrib import admin
+from .models import ControllerDevice, ZonePump, DeviceChannel
+
+
+class ZonePumpInline(admin.TabularInline):
+    model = ZonePump
+    extra = 0
+
+
+class DeviceChannelInline(admin.TabularInline):
+    model = DeviceChannel
+    extra = 0
+
+
+@admin.register(ControllerDevice)
+class ControllerDeviceAdmin(admin.ModelAdmin):
+    list_display = ['name', 'host', 'port', 'is_active', 'last_seen_at']
+    list_filter = ['is_active']
+    search_fields = ['name', 'host']
+    inlines = [ZonePumpInline, DeviceChannelInline]
+
+
+@admin.register(ZonePump)
+class ZonePumpAdmin(admin.ModelAdmin):
+    list_display = ['zone', 'device', 'pump_id']
+    list_filter = ['device']
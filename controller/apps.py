@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class ControllerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'controller'
\ No newline at end of file
+    name = 'controller'
+    
+    def ready(self):
+        from .signals import connect_registry_signals
+        connect_registry_signals()
@@ -0,0 +1,103 @@
+"""
+Circuit Breaker Module
+Per-device circuit breaker so unreachable ESP32 controllers fail fast.
+"""
+
+import threading
+import time
+from typing import Dict, Tuple
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker with exponential backoff
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    are rejected without touching the network. Once the backoff expires a
+    single trial call is let through (half-open): success closes the circuit,
+    failure re-opens it with a doubled backoff, capped at max_backoff.
+    Callers that got the trial (allow_request() returned is_trial) must call
+    release_trial() when it is over.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, base_backoff: float = 5, max_backoff: float = 300):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._open_count = 0
+        self._opened_until = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() >= self._opened_until:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> Tuple[bool, bool]:
+        """
+        Whether a call may go to the device now
+
+        Returns:
+            tuple: (allowed, is_trial) - is_trial when the call is the half-open trial
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True, False
+
+            if self._state == self.OPEN:
+                if time.monotonic() < self._opened_until:
+                    return False, False
+                self._state = self.HALF_OPEN
+
+            # Half-open: exactly one trial call at a time
+            if self._trial_in_flight:
+                return False, False
+            self._trial_in_flight = True
+            return True, True
+
+    def release_trial(self):
+        """End the half-open trial call, whatever its outcome (only the caller that got the trial)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._open_count = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.OPEN and time.monotonic() < self._opened_until:
+                return  # Parallel calls failing together open the circuit once
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open_count += 1
+                backoff = min(self.base_backoff * 2 ** (self._open_count - 1), self.max_backoff)
+                self._state = self.OPEN
+                self._opened_until = time.monotonic() + backoff
+
+    def retry_in(self) -> float:
+        """Seconds until the next trial call is allowed (0 when not open)"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(self._opened_until - time.monotonic(), 0.0)
+
+    def snapshot(self) -> Dict:
+        """Current breaker state for diagnostics"""
+        return {
+            'state': self.state,
+            'consecutive_failures': self._failures,
+            'retry_in_seconds': round(self.retry_in(), 1),
+        }
@@ -5,11 +5,48 @@ This module handles communication with ESP32 devices for irrigation control.
 
 import requests
 import logging
-from typing import Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
 from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, Max
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from .circuit_breaker import CircuitBreaker
+from .models import ControllerDevice, ZonePump
 
 logger = logging.getLogger(__name__)
 
+ESP32_SETTINGS = getattr(settings, 'ESP32_SETTINGS', {})
+REQUEST_TIMEOUT = ESP32_SETTINGS.get('REQUEST_TIMEOUT', 5)
+BROADCAST_DEADLINE = ESP32_SETTINGS.get('BROADCAST_DEADLINE', 8)
+MAX_WORKERS = ESP32_SETTINGS.get('MAX_WORKERS', 16)
+BREAKER_FAILURE_THRESHOLD = ESP32_SETTINGS.get('BREAKER_FAILURE_THRESHOLD', 3)
+BREAKER_BASE_BACKOFF = ESP32_SETTINGS.get('BREAKER_BASE_BACKOFF', 5)
+BREAKER_MAX_BACKOFF = ESP32_SETTINGS.get('BREAKER_MAX_BACKOFF', 300)
+HEALTH_TTL = ESP32_SETTINGS.get('HEALTH_TTL', 30)
+HEALTH_PROBE_INTERVAL = ESP32_SETTINGS.get('HEALTH_PROBE_INTERVAL', 15)
+REGISTRY_CHECK_INTERVAL = ESP32_SETTINGS.get('REGISTRY_CHECK_INTERVAL', 5)
+REGISTRY_TTL = ESP32_SETTINGS.get('REGISTRY_TTL', 60)
+PUMPS_PER_CONTROLLER = 4
+
+# Used until devices are registered as ControllerDevice rows
+DEFAULT_DEVICES = [
+    {'name': 'main_controller', 'ip': '192.168.1.100'},
+    {'name': 'zone_a_controller', 'ip': '192.168.1.101'},
+    {'name': 'zone_b_controller', 'ip': '192.168.1.102'},
+]
+
+
+def _is_device_failure(error: Exception) -> bool:
+    """Connection problems, timeouts and 5xx count against the breaker, 4xx and bad JSON do not"""
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is None or error.response.status_code >= 500
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
 
 class ESP32Controller:
     """Controller class for ESP32 communication"""
@@ -19,7 +56,15 @@ class ESP32Controller:
         self.port = port
         self.base_url = f"http://{esp32_ip}:{port}"
         
-    def send_command(self, endpoint: str, data: Optional[Dict] = None, timeout: int = 10) -> Dict:
+        # Keep-alive session, sized for one connection per pump
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=PUMPS_PER_CONTROLLER)
+        self.session.mount('http://', adapter)
+        
+        self.breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_BASE_BACKOFF, BREAKER_MAX_BACKOFF)
+        
+    def send_command(self, endpoint: str, data: Optional[Dict] = None, timeout: float = REQUEST_TIMEOUT,
+                     bypass_breaker: bool = False) -> Dict:
         """
         Send command to ESP32 device
         
@@ -27,34 +72,59 @@ class ESP32Controller:
             endpoint (str): API endpoint on ESP32
             data (dict, optional): Data to send
             timeout (int): Request timeout in seconds
+            bypass_breaker (bool): Send even if the circuit is open (safety commands);
+                the outcome still updates the breaker
             
         Returns:
             dict: Response from ESP32
         """
+        allowed, is_trial = (True, False) if bypass_breaker else self.breaker.allow_request()
+        if not allowed:
+            return {
+                'success': False,
+                'error': f'Circuit open for {self.esp32_ip}, retry in {self.breaker.retry_in():.0f}s',
+                'status_code': None,
+                'circuit_open': True,
+                'elapsed_ms': 0
+            }
+        
+        started = time.monotonic()
         try:
             url = f"{self.base_url}/{endpoint}"
             
             if data:
-                response = requests.post(url, json=data, timeout=timeout)
+                response = self.session.post(url, json=data, timeout=timeout)
             else:
-                response = requests.get(url, timeout=timeout)
+                response = self.session.get(url, timeout=timeout)
             
             response.raise_for_status()
-            return {
+            result = {
                 'success': True,
                 'data': response.json() if response.content else {},
-                'status_code': response.status_code
+                'status_code': response.status_code,
+                'elapsed_ms': round((time.monotonic() - started) * 1000)
             }
+            self.breaker.record_success()
+            return result
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            if _is_device_failure(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
             logger.error(f"ESP32 communication error: {e}")
             return {
                 'success': False,
                 'error': str(e),
-                'status_code': None
+                'status_code': None,
+                'elapsed_ms': round((time.monotonic() - started) * 1000)
             }
+        finally:
+            # Calls admitted while closed must not clear a trial another caller holds
+            if is_trial:
+                self.breaker.release_trial()
     
-    def start_pump(self, pump_id: int, duration_minutes: int) -> Dict:
+    def start_pump(self, pump_id: int, duration_minutes: int, timeout: float = REQUEST_TIMEOUT) -> Dict:
         """
         Start water pump
         
@@ -70,12 +140,15 @@ class ESP32Controller:
             'duration': duration_minutes,
             'action': 'start'
         }
-        return self.send_command('pump/control', data)
+        return self.send_command('pump/control', data, timeout)
     
-    def stop_pump(self, pump_id: int) -> Dict:
+    def stop_pump(self, pump_id: int, timeout: float = REQUEST_TIMEOUT) -> Dict:
         """
         Stop water pump
         
+        Stops are never refused by the circuit breaker: a pump left running
+        is worse than a request to a device that may still be down.
+        
         Args:
             pump_id (int): Pump identifier (1-4)
             
@@ -86,7 +159,7 @@ class ESP32Controller:
             'pump_id': pump_id,
             'action': 'stop'
         }
-        return self.send_command('pump/control', data)
+        return self.send_command('pump/control', data, timeout, bypass_breaker=True)
     
     def get_pump_status(self) -> Dict:
         """
@@ -97,14 +170,14 @@ class ESP32Controller:
         """
         return self.send_command('pump/status')
     
-    def get_sensor_readings(self) -> Dict:
+    def get_sensor_readings(self, timeout: float = REQUEST_TIMEOUT) -> Dict:
         """
         Get current sensor readings from ESP32
         
         Returns:
             dict: Sensor data
         """
-        return self.send_command('sensors/read')
+        return self.send_command('sensors/read', timeout=timeout)
     
     def calibrate_sensor(self, sensor_id: str) -> Dict:
         """
@@ -119,14 +192,14 @@ class ESP32Controller:
         data = {'sensor_id': sensor_id}
         return self.send_command('sensors/calibrate', data)
     
-    def get_system_info(self) -> Dict:
+    def get_system_info(self, timeout: float = REQUEST_TIMEOUT) -> Dict:
         """
         Get ESP32 system information
         
         Returns:
             dict: System information
         """
-        return self.send_command('system/info')
+        return self.send_command('system/info', timeout=timeout)
     
     def reset_system(self) -> Dict:
         """
@@ -141,110 +214,357 @@ class ESP32Controller:
 class ESP32Manager:
     """Manager class for multiple ESP32 devices"""
     
-    def __init__(self):
-        self.controllers: Dict[str, ESP32Controller] = {}
-        self._load_esp32_devices()
+    def __init__(self, devices: Optional[List[Dict]] = None):
+        # Explicit devices (e.g. the simulator) bypass the database registry
+        self._static_devices = devices
+        self._controllers: Dict[str, ESP32Controller] = {}
+        self._zone_pumps: Dict[str, Tuple[str, int]] = {}
+        self._registry_lock = threading.Lock()
+        self._registry_generation = 0  # Bumped by invalidate_registry()
+        self._loaded_generation = -1  # Generation the loaded registry belongs to
+        self._loaded_version = None  # _registry_version() when it was loaded
+        self._loaded_at = 0.0
+        self._version_checked_at = 0.0
+        
+        # Threads are only started on the first fan-out
+        self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='esp32')
+        
+        # Health cache, refreshed by a background prober started on first read
+        self._health: Dict[str, Dict] = {}
+        self._health_checked_at: Optional[float] = None
+        self._health_lock = threading.Lock()
+        self._prober: Optional[threading.Thread] = None
+    
+    @property
+    def controllers(self) -> Dict[str, ESP32Controller]:
+        """Controllers by name, loaded from the registry on first use"""
+        self._ensure_registry()
+        return self._controllers
+    
+    def invalidate_registry(self):
+        """Reload devices on next access (connected to ControllerDevice/ZonePump signals)"""
+        with self._registry_lock:
+            self._registry_generation += 1
     
-    def _load_esp32_devices(self):
-        """Load ESP32 device configurations from settings"""
-        # In a real implementation, this would load from database or settings
-        esp32_devices = [
-            {'name': 'main_controller', 'ip': '192.168.1.100'},
-            {'name': 'zone_a_controller', 'ip': '192.168.1.101'},
-            {'name': 'zone_b_controller', 'ip': '192.168.1.102'},
-        ]
+    def _registry_version(self) -> Optional[Tuple]:
+        """Cheap fingerprint of the device tables, changes when devices or pumps are added, removed or edited"""
+        try:
+            devices = ControllerDevice.objects.aggregate(count=Count('id'), updated=Max('updated_at'))
+            pumps = ZonePump.objects.aggregate(count=Count('id'), last=Max('id'))
+        except DatabaseError:
+            return None
+        return devices['count'], devices['updated'], pumps['count'], pumps['last']
+    
+    def _registry_stale(self) -> bool:
+        """
+        Whether the loaded registry must be reloaded
+        
+        Signals only invalidate the process that saved the change, so other
+        workers compare the table fingerprint every REGISTRY_CHECK_INTERVAL
+        seconds, and reload every REGISTRY_TTL seconds regardless (zone pump
+        edits in place do not change the fingerprint).
+        """
+        if self._loaded_generation != self._registry_generation:
+            return True
+        if self._static_devices is not None:
+            return False
         
-        for device in esp32_devices:
-            self.controllers[device['name']] = ESP32Controller(device['ip'])
+        now = time.monotonic()
+        if now - self._loaded_at >= REGISTRY_TTL:
+            return True
+        if now - self._version_checked_at < REGISTRY_CHECK_INTERVAL:
+            return False
+        self._version_checked_at = now
+        return self._registry_version() != self._loaded_version
+    
+    def _ensure_registry(self):
+        loaded_at = self._loaded_at
+        if not self._registry_stale():
+            return
+        
+        with self._registry_lock:
+            if self._loaded_at != loaded_at and self._loaded_generation == self._registry_generation:
+                return  # Another thread reloaded it meanwhile
+            
+            # Read before loading: a change made during the load is seen as stale on the next check
+            generation = self._registry_generation
+            version = self._registry_version() if self._static_devices is None else None
+            devices, zone_pumps = self._load_esp32_devices()
+            controllers = {}
+            for device in devices:
+                name, ip, port = device['name'], device['ip'], device.get('port', 80)
+                existing = self._controllers.get(name)
+                # Keep the session and breaker of devices whose address did not change
+                if existing and (existing.esp32_ip, existing.port) == (ip, port):
+                    controllers[name] = existing
+                else:
+                    controllers[name] = ESP32Controller(ip, port)
+            
+            self._controllers = controllers
+            self._zone_pumps = zone_pumps
+            self._loaded_generation = generation
+            self._loaded_version = version
+            self._loaded_at = self._version_checked_at = time.monotonic()
+            logger.info(f"ESP32 registry loaded: {len(controllers)} controllers, {len(zone_pumps)} zones")
+    
+    def _load_esp32_devices(self) -> Tuple[List[Dict], Dict[str, Tuple[str, int]]]:
+        """
+        Load ESP32 device configurations
+        
+        Returns:
+            tuple: ([{'name', 'ip', 'port'}], {zone_id: (controller name, pump_id)})
+        """
+        if self._static_devices is not None:
+            return self._static_devices, {}
+        
+        try:
+            devices = [
+                {'name': name, 'ip': host, 'port': port}
+                for name, host, port in ControllerDevice.objects.filter(is_active=True)
+                .values_list('name', 'host', 'port')
+            ]
+            zone_pumps = {
+                zone_id: (device_name, pump_id)
+                for zone_id, device_name, pump_id in ZonePump.objects.filter(device__is_active=True)
+                .values_list('zone__zone_id', 'device__name', 'pump_id')
+            }
+        except DatabaseError as e:
+            logger.warning(f"ESP32 device registry unavailable, using defaults: {e}")
+            devices, zone_pumps = [], {}
+        
+        if not devices:
+            return DEFAULT_DEVICES, {}
+        return devices, zone_pumps
     
     def get_controller(self, name: str) -> Optional[ESP32Controller]:
         """Get ESP32 controller by name"""
         return self.controllers.get(name)
     
-    def broadcast_command(self, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Dict]:
+    def get_zone_pump(self, zone_id: str) -> Optional[Tuple[str, int]]:
+        """Get (controller name, pump_id) watering an irrigation zone"""
+        self._ensure_registry()
+        return self._zone_pumps.get(zone_id)
+    
+    def _fan_out(self, tasks: Dict[str, Callable[[float], Dict]], deadline: Optional[float] = None,
+                 executor: Optional[ThreadPoolExecutor] = None, cancel_late: bool = True) -> Dict[str, Dict]:
+        """
+        Run device calls in parallel under one overall deadline
+        
+        Args:
+            tasks (dict): Result key -> callable taking a request timeout
+            deadline (float, optional): Seconds for the whole fan-out
+            executor (ThreadPoolExecutor, optional): Pool to run on, defaults to the shared pool
+            cancel_late (bool): Cancel calls still queued at the deadline
+            
+        Returns:
+            dict: Per-key results, devices that miss the deadline are reported as timed out
+        """
+        deadline = BROADCAST_DEADLINE if deadline is None else deadline
+        timeout = min(REQUEST_TIMEOUT, deadline)
+        executor = executor or self._executor
+        
+        futures = {key: executor.submit(task, timeout) for key, task in tasks.items()}
+        wait(futures.values(), timeout=deadline)
+        
+        results = {}
+        for key, future in futures.items():
+            if future.done():
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    logger.error(f"ESP32 task {key} failed: {e}")
+                    results[key] = {'success': False, 'error': str(e), 'status_code': None}
+            else:
+                if cancel_late:
+                    future.cancel()
+                results[key] = {
+                    'success': False,
+                    'error': f'No response within {deadline}s deadline',
+                    'status_code': None,
+                    'timed_out': True
+                }
+        return results
+    
+    def broadcast_command(self, endpoint: str, data: Optional[Dict] = None,
+                          deadline: Optional[float] = None) -> Dict[str, Dict]:
         """
-        Send command to all ESP32 devices
+        Send command to all ESP32 devices in parallel
         
         Args:
             endpoint (str): API endpoint
             data (dict, optional): Data to send
+            deadline (float, optional): Seconds to wait for all devices
             
         Returns:
             dict: Results from all devices
         """
-        results = {}
-        for name, controller in self.controllers.items():
-            results[name] = controller.send_command(endpoint, data)
-        return results
+        return self._fan_out({
+            name: lambda timeout, controller=controller: controller.send_command(endpoint, data, timeout)
+            for name, controller in self.controllers.items()
+        }, deadline)
     
-    def start_irrigation_zone(self, zone_name: str, pump_id: int, duration_minutes: int) -> Dict:
+    def start_irrigation_zone(self, zone_name: str, pump_id: Optional[int] = None, duration_minutes: int = 15) -> Dict:
         """
         Start irrigation in a specific zone
         
         Args:
-            zone_name (str): Zone name (matches controller name)
-            pump_id (int): Pump identifier
+            zone_name (str): IrrigationZone.zone_id from the registry, or a controller name
+            pump_id (int, optional): Pump identifier, defaults to the zone's registered pump
             duration_minutes (int): Duration to run
             
         Returns:
             dict: Operation result
         """
-        controller = self.get_controller(zone_name)
+        zone_pump = self.get_zone_pump(zone_name)
+        if zone_pump:
+            controller_name, zone_pump_id = zone_pump
+            pump_id = pump_id or zone_pump_id
+        else:
+            controller_name = zone_name
+        
+        controller = self.get_controller(controller_name)
         if not controller:
             return {'success': False, 'error': f'Controller {zone_name} not found'}
+        if pump_id is None:
+            return {'success': False, 'error': f'No pump registered for zone {zone_name}'}
         
-        return controller.start_pump(pump_id, duration_minutes)
+        result = controller.start_pump(pump_id, duration_minutes)
+        return {**result, 'controller': controller_name, 'pump_id': pump_id}
     
-    def stop_all_irrigation(self) -> Dict[str, Dict]:
+    def stop_all_irrigation(self, deadline: Optional[float] = None) -> Dict[str, Dict]:
         """
-        Stop all irrigation pumps
+        Stop all irrigation pumps, all pumps of all controllers at once
         
+        Stops run on their own pool with one thread per pump, so unreachable
+        controllers holding threads for the full request timeout can never
+        leave a healthy controller's stop queued behind them. Stops are not
+        cancelled at the deadline: late ones are reported as timed out but
+        still reach the device.
+        
+        Args:
+            deadline (float, optional): Seconds to wait for all pumps
+            
         Returns:
             dict: Results from all controllers
         """
-        results = {}
-        for name, controller in self.controllers.items():
-            # Stop all pumps (assuming 4 pumps per controller)
-            for pump_id in range(1, 5):
-                results[f'{name}_pump_{pump_id}'] = controller.stop_pump(pump_id)
-        return results
+        tasks = {
+            f'{name}_pump_{pump_id}': lambda timeout, controller=controller, pump_id=pump_id: controller.stop_pump(pump_id, timeout)
+            for name, controller in self.controllers.items()
+            for pump_id in range(1, PUMPS_PER_CONTROLLER + 1)
+        }
+        if not tasks:
+            return {}
+        
+        executor = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix='esp32-stop')
+        try:
+            return self._fan_out(tasks, deadline, executor=executor, cancel_late=False)
+        finally:
+            # Threads finish their stop and exit on their own
+            executor.shutdown(wait=False)
     
-    def get_all_sensor_readings(self) -> Dict[str, Dict]:
+    def get_all_sensor_readings(self, deadline: Optional[float] = None) -> Dict[str, Dict]:
         """
-        Get sensor readings from all ESP32 devices
+        Get sensor readings from all ESP32 devices in parallel
         
         Returns:
             dict: Sensor data from all devices
         """
-        results = {}
-        for name, controller in self.controllers.items():
-            results[name] = controller.get_sensor_readings()
-        return results
+        return self._fan_out({
+            name: controller.get_sensor_readings
+            for name, controller in self.controllers.items()
+        }, deadline)
     
-    def get_system_health(self) -> Dict[str, Dict]:
+    def get_system_health(self, deadline: Optional[float] = None) -> Dict[str, Dict]:
         """
-        Check health of all ESP32 devices
+        Check health of all ESP32 devices in parallel
         
         Returns:
             dict: Health status of all devices
         """
+        infos = self._fan_out({
+            name: controller.get_system_info
+            for name, controller in self.controllers.items()
+        }, deadline)
+        
+        checked_at = timezone.now().isoformat()
         results = {}
-        for name, controller in self.controllers.items():
+        for name, info in infos.items():
+            results[name] = {
+                'online': info['success'],
+                'info': info.get('data', {}),
+                'last_check': checked_at,
+                'circuit': self.controllers[name].breaker.snapshot()
+            }
+            if not info['success']:
+                results[name]['error'] = info.get('error')
+        
+        with self._health_lock:
+            self._health = results
+            self._health_checked_at = time.monotonic()
+        return results
+    
+    def _probe_health_forever(self):
+        """Background loop refreshing the health cache"""
+        while True:
             try:
-                info = controller.get_system_info()
-                results[name] = {
-                    'online': info['success'],
-                    'info': info.get('data', {}),
-                    'last_check': None  # Would be timestamp in real implementation
-                }
+                self.get_system_health()
             except Exception as e:
-                results[name] = {
-                    'online': False,
-                    'error': str(e),
-                    'last_check': None
-                }
-        return results
+                logger.error(f"ESP32 health probe failed: {e}")
+            time.sleep(HEALTH_PROBE_INTERVAL)
+    
+    def start_health_prober(self):
+        """Start the background health prober once per process"""
+        with self._health_lock:
+            if self._prober is None or not self._prober.is_alive():
+                self._prober = threading.Thread(
+                    target=self._probe_health_forever, name='esp32-health-prober', daemon=True
+                )
+                self._prober.start()
+    
+    def get_cached_health(self) -> Dict:
+        """
+        Last known health of all devices, without touching the network
+        
+        Returns:
+            dict: Per-device health, cache age and whether it is older than HEALTH_TTL
+        """
+        self.start_health_prober()
+        
+        with self._health_lock:
+            health = dict(self._health)
+            checked_at = self._health_checked_at
+        
+        age = None if checked_at is None else time.monotonic() - checked_at
+        devices = {}
+        for name, controller in self.controllers.items():
+            device = dict(health.get(name, {'online': None, 'info': {}, 'last_check': None}))
+            device['circuit'] = controller.breaker.snapshot()
+            devices[name] = device
+        
+        return {
+            'devices': devices,
+            'age_seconds': None if age is None else round(age, 1),
+            'stale': age is None or age > HEALTH_TTL,
+        }
+
+
+# Global ESP32 manager instance, created on first use
+_esp32_manager: Optional[ESP32Manager] = None
+_esp32_manager_lock = threading.Lock()
+
+
+def get_esp32_manager() -> ESP32Manager:
+    """Process-wide ESP32Manager, created on first call (thread-safe)"""
+    global _esp32_manager
+    if _esp32_manager is None:
+        with _esp32_manager_lock:
+            if _esp32_manager is None:
+                _esp32_manager = ESP32Manager()
+    return _esp32_manager
 
 
-# Global ESP32 manager instance
-esp32_manager = ESP32Manager()
\ No newline at end of file
+def __getattr__(name):
+    # Keeps 'from controller.esp_controller import esp32_manager' working
+    if name == 'esp32_manager':
+        return get_esp32_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
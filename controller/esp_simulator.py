@@ -0,0 +1,259 @@
+"""
+ESP32 Simulator Module
+Localhost HTTP simulator of ESP32 irrigation controllers for load and latency testing.
+
+Run standalone with: python -m controller.esp_simulator --count 20 --latency 50
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+PUMP_COUNT = 4
+
+SENSOR_RANGES = {
+    'soil_moisture': (15, 85),
+    'soil_temperature': (12, 30),
+    'air_temperature': (15, 35),
+    'air_humidity': (30, 80),
+    'ph': (5.5, 8.2),
+}
+
+
+class SimulatedDevice:
+    """State and behaviour of one simulated ESP32 controller"""
+
+    def __init__(self, name: str, latency_ms: float = 20, jitter_ms: float = 10,
+                 failure_rate: float = 0.0, seed: Optional[int] = None):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.started_at = time.time()
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.pumps = {pump_id: {'running': False, 'until': None} for pump_id in range(1, PUMP_COUNT + 1)}
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def port(self) -> Optional[int]:
+        return self.server.server_address[1] if self.server else None
+
+    def delay(self) -> float:
+        """Seconds to wait before answering (latency +/- jitter)"""
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(self.latency_ms + jitter, 0) / 1000
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            return self.random.random() < self.failure_rate
+
+    def handle(self, method: str, endpoint: str, payload: Dict):
+        """Return (status code, response body) for a request"""
+        with self.lock:
+            now = time.time()
+            for pump in self.pumps.values():
+                if pump['running'] and pump['until'] and now >= pump['until']:
+                    pump.update(running=False, until=None)
+
+            if endpoint == 'pump/control' and method == 'POST':
+                pump_id = payload.get('pump_id')
+                if not isinstance(pump_id, int) or pump_id not in self.pumps:
+                    return 400, {'error': f'Unknown pump_id: {pump_id}'}
+                if payload.get('action') == 'start':
+                    try:
+                        duration = float(payload.get('duration', 0))
+                    except (TypeError, ValueError):
+                        return 400, {'error': f"Invalid duration: {payload.get('duration')}"}
+                    if not math.isfinite(duration):
+                        return 400, {'error': f'Invalid duration: {duration}'}
+                    self.pumps[pump_id].update(running=True, until=now + duration * 60)
+                elif payload.get('action') == 'stop':
+                    self.pumps[pump_id].update(running=False, until=None)
+                else:
+                    return 400, {'error': f"Unknown action: {payload.get('action')}"}
+                return 200, {'pump_id': pump_id, 'running': self.pumps[pump_id]['running']}
+
+            if endpoint == 'pump/status':
+                return 200, {
+                    'pumps': {
+                        str(pump_id): {
+                            'running': pump['running'],
+                            'remaining_seconds': round(max(pump['until'] - now, 0)) if pump['until'] else 0,
+                        }
+                        for pump_id, pump in self.pumps.items()
+                    }
+                }
+
+            if endpoint == 'sensors/read':
+                return 200, {
+                    'device': self.name,
+                    'timestamp': now,
+                    'readings': {
+                        channel: round(self.random.uniform(low, high), 2)
+                        for channel, (low, high) in SENSOR_RANGES.items()
+                    }
+                }
+
+            if endpoint == 'sensors/calibrate' and method == 'POST':
+                return 200, {'sensor_id': payload.get('sensor_id'), 'calibrated': True}
+
+            if endpoint == 'system/info':
+                return 200, {
+                    'device': self.name,
+                    'firmware': 'sim-1.0',
+                    'uptime_seconds': round(now - self.started_at),
+                    'free_heap': self.random.randint(120000, 180000),
+                    'wifi_rssi': self.random.randint(-80, -40),
+                    'requests_served': self.requests,
+                }
+
+            if endpoint == 'system/reset' and method == 'POST':
+                self.started_at = now
+                for pump in self.pumps.values():
+                    pump.update(running=False, until=None)
+                return 200, {'reset': True}
+
+        return 404, {'error': f'Unknown endpoint: {endpoint}'}
+
+
+class SimulatorRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler delegating to the SimulatedDevice attached to the server"""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the ESP32 web server
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, method: str):
+        device: SimulatedDevice = self.server.device
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+
+        time.sleep(device.delay())
+
+        if device.should_fail():
+            status_code, body = 500, {'error': 'Simulated device failure'}
+        else:
+            try:
+                payload = json.loads(raw) if raw else {}
+            except ValueError:
+                status_code, body = 400, {'error': 'Invalid JSON'}
+            else:
+                if not isinstance(payload, dict):
+                    status_code, body = 400, {'error': 'JSON body must be an object'}
+                else:
+                    status_code, body = device.handle(method, self.path.strip('/'), payload)
+
+        data = json.dumps(body).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._respond('GET')
+
+    def do_POST(self):
+        self._respond('POST')
+
+
+class SimulatorServer(ThreadingHTTPServer):
+    """Threaded server that ignores clients hanging up (e.g. after a deadline)"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class ESP32SimulatorFarm:
+    """A set of simulated devices, each listening on its own localhost port"""
+
+    def __init__(self, count: int = 3, latency_ms: float = 20, jitter_ms: float = 10,
+                 failure_rate: float = 0.0, seed: Optional[int] = None, host: str = '127.0.0.1'):
+        self.host = host
+        self.devices = [
+            SimulatedDevice(
+                f'sim_controller_{index:03d}', latency_ms, jitter_ms, failure_rate,
+                None if seed is None else seed + index
+            )
+            for index in range(count)
+        ]
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> 'ESP32SimulatorFarm':
+        for device in self.devices:
+            server = SimulatorServer((self.host, 0), SimulatorRequestHandler)
+            server.device = device
+            device.server = server
+            thread = threading.Thread(target=server.serve_forever, name=f'esp-sim-{device.name}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        for device in self.devices:
+            if device.server:
+                device.server.shutdown()
+                device.server.server_close()
+                device.server = None
+        self._threads.clear()
+
+    def take_offline(self, count: int) -> List[str]:
+        """Shut down the last count devices so they refuse connections"""
+        names = []
+        for device in self.devices[len(self.devices) - count:]:
+            if device.server:
+                device.server.shutdown()
+                device.server.server_close()
+                names.append(device.name)
+        return names
+
+    def device_configs(self) -> List[Dict]:
+        """Device list in the format accepted by ESP32Manager(devices=...)"""
+        return [
+            {'name': device.name, 'ip': self.host, 'port': device.port}
+            for device in self.devices
+        ]
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run simulated ESP32 controllers on localhost')
+    parser.add_argument('--count', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=20, help='Mean response latency (ms)')
+    parser.add_argument('--jitter', type=float, default=10, help='Latency jitter (+/- ms)')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Share of requests answered with 500')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    farm = ESP32SimulatorFarm(args.count, args.latency, args.jitter, args.failure_rate, args.seed).start()
+    for config in farm.device_configs():
+        print(f"{config['name']}: http://{config['ip']}:{config['port']}")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        farm.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('plant', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ControllerDevice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('host', models.CharField(max_length=100)),
+                ('port', models.PositiveIntegerField(default=80)),
+                ('is_active', models.BooleanField(default=True)),
+                ('description', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='IrrigationSystem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('location', models.CharField(max_length=200)),
+                ('is_active', models.BooleanField(default=True)),
+                ('is_automatic', models.BooleanField(default=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SystemControl',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('command', models.CharField(choices=[('start_irrigation', 'Start Irrigation'), ('stop_irrigation', 'Stop Irrigation'), ('emergency_stop', 'Emergency Stop'), ('system_restart', 'System Restart'), ('calibrate_sensors', 'Calibrate Sensors'), ('test_mode', 'Test Mode')], max_length=50)),
+                ('parameters', models.JSONField(blank=True, default=dict)),
+                ('executed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('success', models.BooleanField(default=False)),
+                ('response', models.TextField(blank=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='IrrigationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('scheduled', 'Scheduled'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='scheduled', max_length=20)),
+                ('trigger_type', models.CharField(choices=[('manual', 'Manual'), ('automatic', 'Automatic'), ('ai_decision', 'AI Decision'), ('scheduled', 'Scheduled')], default='automatic', max_length=20)),
+                ('scheduled_start', models.DateTimeField()),
+                ('actual_start', models.DateTimeField(blank=True, null=True)),
+                ('actual_end', models.DateTimeField(blank=True, null=True)),
+                ('duration_minutes', models.IntegerField()),
+                ('water_amount_liters', models.FloatField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('system', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='controller.irrigationsystem')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ZonePump',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pump_id', models.PositiveSmallIntegerField()),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='zone_pumps', to='controller.controllerdevice')),
+                ('zone', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='pump', to='plant.irrigationzone')),
+            ],
+            options={
+                'unique_together': {('device', 'pump_id')},
+            },
+        ),
+    ]
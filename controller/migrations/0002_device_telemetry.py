@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensor', '0006_sensortype_retention_policy'),
+        ('controller', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='controllerdevice',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='DeviceChannel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(max_length=50)),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='channels', to='controller.controllerdevice')),
+                ('sensor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='device_channels', to='sensor.sensor')),
+            ],
+            options={
+                'unique_together': {('device', 'channel')},
+            },
+        ),
+    ]
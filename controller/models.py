@@ -64,3 +64,45 @@ class SystemControl(models.Model):
     
     def __str__(self):
         return f"{self.command} - {self.executed_at}"
+
+class ControllerDevice(models.Model):
+    """ESP32 controller board registered with the ESP32Manager"""
+    name = models.CharField(max_length=100, unique=True)
+    host = models.CharField(max_length=100)  # IP address or hostname
+    port = models.PositiveIntegerField(default=80)
+    is_active = models.BooleanField(default=True)
+    description = models.TextField(blank=True)
+    last_seen_at = models.DateTimeField(null=True, blank=True)  # Last telemetry push
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return f"{self.name} ({self.host}:{self.port})"
+
+class ZonePump(models.Model):
+    """Maps an irrigation zone to the controller and pump that waters it"""
+    zone = models.OneToOneField('plant.IrrigationZone', on_delete=models.CASCADE, related_name='pump')
+    device = models.ForeignKey(ControllerDevice, on_delete=models.CASCADE, related_name='zone_pumps')
+    pump_id = models.PositiveSmallIntegerField()  # 1-4 on the ESP32 board
+    
+    class Meta:
+        unique_together = ['device', 'pump_id']
+    
+    def __str__(self):
+        return f"{self.zone} -> {self.device.name} pump {self.pump_id}"
+
+class DeviceChannel(models.Model):
+    """Maps an onboard channel id of a controller to the Sensor it measures"""
+    device = models.ForeignKey(ControllerDevice, on_delete=models.CASCADE, related_name='channels')
+    channel = models.CharField(max_length=50)  # e.g. 'a0', 'soil1', '3'
+    sensor = models.ForeignKey('sensor.Sensor', on_delete=models.CASCADE, related_name='device_channels')
+    
+    class Meta:
+        unique_together = ['device', 'channel']
+    
+    def __str__(self):
+        return f"{self.device.name}:{self.channel} -> {self.sensor.sensor_id}"
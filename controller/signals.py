@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+
+from plant.models import IrrigationZone
+from .models import ControllerDevice, ZonePump
+
+
+def invalidate_device_registry(sender, **kwargs):
+    """Make the ESP32Manager reload its device registry on next use"""
+    from . import esp_controller
+    # Processes that never talked to a device have no manager (and no registry) to invalidate
+    manager = esp_controller._esp32_manager
+    if manager is not None:
+        manager.invalidate_registry()
+
+
+def connect_registry_signals():
+    for model in (ControllerDevice, ZonePump, IrrigationZone):
+        post_save.connect(invalidate_device_registry, sender=model, dispatch_uid=f'esp32_registry_save_{model.__name__}')
+        post_delete.connect(invalidate_device_registry, sender=model, dispatch_uid=f'esp32_registry_delete_{model.__name__}')
@@ -0,0 +1,92 @@
+"""
+Device Telemetry Module
+Decodes compact batched telemetry pushed by ESP32 controllers into sensor reading rows.
+
+Payload format (one POST per device per upload interval):
+
+    {
+        "device": "zone_a_controller",
+        "ts": 1760000000,                  # base unix time, optional (default: now)
+        "channels": ["a0", "a1", "t"],     # onboard channel ids, in column order
+        "samples": [
+            [0, 41.2, 38.9, 24.1],         # [offset seconds from ts, value per channel]
+            [60, 41.0, null, 24.3]         # null = no value for that channel
+        ]
+    }
+"""
+
+import time
+from typing import Dict, List, Tuple
+
+from .models import ControllerDevice, DeviceChannel
+
+
+class TelemetryError(ValueError):
+    """Raised when a telemetry payload cannot be decoded at all"""
+
+
+def decode_telemetry(payload) -> Tuple[ControllerDevice, List[list], Dict]:
+    """
+    Turn a telemetry payload into [sensor_id, value, epoch] rows for sensor ingestion
+
+    Channels are mapped to sensors through DeviceChannel in a single query.
+
+    Args:
+        payload (dict): Parsed request body
+
+    Returns:
+        tuple: (device, rows, report) where report lists unknown channels and bad samples
+    """
+    if not isinstance(payload, dict):
+        raise TelemetryError('Telemetry payload must be an object')
+
+    device_name = payload.get('device')
+    channels = payload.get('channels')
+    samples = payload.get('samples')
+    base_ts = payload.get('ts')
+
+    if not isinstance(device_name, str) or not device_name:
+        raise TelemetryError('device is required')
+    if not isinstance(channels, list) or not channels:
+        raise TelemetryError('channels list is required')
+    if not isinstance(samples, list):
+        raise TelemetryError('samples list is required')
+    if base_ts is None:
+        base_ts = time.time()
+    elif isinstance(base_ts, bool) or not isinstance(base_ts, (int, float)):
+        raise TelemetryError(f'Invalid ts: {base_ts!r}')
+
+    device = ControllerDevice.objects.filter(name=device_name, is_active=True).first()
+    if device is None:
+        raise LookupError(f'Unknown device: {device_name}')
+
+    channel_sensors = dict(
+        DeviceChannel.objects.filter(device=device, channel__in=[str(channel) for channel in channels])
+        .values_list('channel', 'sensor__sensor_id')
+    )
+    columns = [channel_sensors.get(str(channel)) for channel in channels]
+
+    rows = []
+    bad_samples = []
+    for index, sample in enumerate(samples):
+        if not isinstance(sample, list) or len(sample) != len(channels) + 1:
+            bad_samples.append({'index': index, 'error': f'Sample must have {len(channels) + 1} items'})
+            continue
+
+        offset = sample[0]
+        if isinstance(offset, bool) or not isinstance(offset, (int, float)):
+            bad_samples.append({'index': index, 'error': f'Invalid offset: {offset!r}'})
+            continue
+
+        timestamp = base_ts + offset
+        for sensor_id, value in zip(columns, sample[1:]):
+            if sensor_id is not None and value is not None:
+                rows.append([sensor_id, value, timestamp])
+
+    report = {
+        'device': device.name,
+        'samples': len(samples),
+        'unknown_channels': [str(channel) for channel, sensor_id in zip(channels, columns) if sensor_id is None],
+        'bad_samples': bad_samples,
+    }
+    return device, rows, report
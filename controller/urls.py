@@ -11,4 +11,5 @@ urlpatterns = [
     path('calibrate-sensors/', views.calibrate_sensors, name='calibrate-sensors'),
     path('update-schedule/', views.update_irrigation_schedule, name='update-schedule'),
     path('diagnostics/', views.get_system_diagnostics, name='system-diagnostics'),
+    path('telemetry/', views.device_telemetry, name='device-telemetry'),
 ]
\ No newline at end of file
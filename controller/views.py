@@ -8,6 +8,11 @@ import time
 
 from plant.models import IrrigationEvent, IrrigationZone
 from sensor.models import SystemStatus
+from sensor.ingest import ingest_readings, MAX_BATCH_ROWS
+from sensor.write_buffer import buffer_readings, BufferFull, BUFFER_ENABLED
+from .esp_controller import get_esp32_manager
+from .models import ControllerDevice
+from .telemetry import decode_telemetry, TelemetryError
 
 
 @api_view(['POST'])
@@ -319,6 +324,8 @@ def get_system_diagnostics(request):
             'disk_space_available': '78%',
             'memory_usage': f'{system_status.memory_usage:.1f}%' if system_status else '0%',
             'cpu_usage': f'{system_status.cpu_usage:.1f}%' if system_status else '0%',
+            # Cached by the background prober - never blocks on unreachable hardware
+            'controllers': get_esp32_manager().get_cached_health(),
         }
         
         return Response(diagnostics)
@@ -326,4 +333,62 @@ def get_system_diagnostics(request):
     except Exception as e:
         return Response({
             'error': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+def device_telemetry(request):
+    """Receive a batched telemetry push from an ESP32 controller"""
+    try:
+        device, rows, report = decode_telemetry(request.data)
+    except TelemetryError as e:
+        return Response({
+            'success': False,
+            'error': str(e),
+            'message': 'Telemetriya formati noto\'g\'ri'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except LookupError as e:
+        return Response({
+            'success': False,
+            'error': str(e),
+            'message': 'Kontroller ro\'yxatdan o\'tmagan'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    if len(rows) > MAX_BATCH_ROWS:
+        return Response({
+            'success': False,
+            'error': f'Too many readings in one batch (max {MAX_BATCH_ROWS})',
+            'received': len(rows)
+        }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    
+    try:
+        if BUFFER_ENABLED:
+            result = buffer_readings(rows)
+            success_status = status.HTTP_202_ACCEPTED
+        else:
+            result = ingest_readings(rows)
+            success_status = status.HTTP_201_CREATED
+        # update() rather than save() - no registry invalidation signal per push
+        ControllerDevice.objects.filter(pk=device.pk).update(last_seen_at=timezone.now())
+        
+        return Response({
+            'success': True,
+            **report,
+            **result,
+            'timestamp': timezone.now().isoformat()
+        }, status=success_status)
+        
+    except BufferFull as e:
+        response = Response({
+            'success': False,
+            'error': str(e),
+            'message': 'Server band, keyinroq qayta yuboring'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        response['Retry-After'] = '1'
+        return response
+    except Exception as e:
+        return Response({
+            'success': False,
+            'error': str(e),
+            'message': 'Telemetriyani saqlashda xatolik'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -4,6 +4,8 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django.utils import timezone
 from datetime import timedelta
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import Coalesce, TruncDay, TruncHour
 import json
 import random
 
@@ -41,7 +43,7 @@ def get_dashboard_overview(request):
         system_status = SystemStatus.objects.first()
         
         # Sensor data
-        sensors = Sensor.objects.all()
+        sensors = Sensor.objects.select_related('sensor_type', 'latest')
         active_sensors = sensors.filter(status='active').count()
         
         # Critical sensors
@@ -126,7 +128,7 @@ def get_realtime_data(request):
     """Get FRESH real-time data with REAL weather integration"""
     try:
         # FRESH sensor readings - always new data
-        sensors = Sensor.objects.filter(status='active')
+        sensors = Sensor.objects.filter(status='active').select_related('sensor_type', 'latest')
         current_readings = []
         
         for sensor in sensors:
@@ -210,26 +212,117 @@ def get_realtime_data(request):
         }, status=500)
 
 
+# Sensor type names (English and Uzbek setups) for the statistics trends
+STATISTICS_SENSOR_TYPES = {
+    'soil_moisture': ['Soil Moisture', 'Tuproq Namligi'],
+    'temperature': ['Air Temperature', 'Havo Harorati'],
+}
+
+STATISTICS_BUCKETS = {
+    'day': (TruncDay, timedelta(days=1)),
+    'hour': (TruncHour, timedelta(hours=1)),
+}
+
+
+def _bucket_labels(start_date, end_date, bucket):
+    """Local bucket start times covering [start_date, end_date]"""
+    step = STATISTICS_BUCKETS[bucket][1]
+    current = timezone.localtime(start_date).replace(minute=0, second=0, microsecond=0)
+    if bucket == 'day':
+        current = current.replace(hour=0)
+    
+    labels = []
+    while current <= end_date:
+        labels.append(current)
+        current = timezone.localtime(current + step)
+    return labels
+
+
 @api_view(['GET'])
 def get_statistics_data(request):
     """Get statistics for charts and analytics"""
     try:
-        # Time range
+        # Time range and bucket size
+        days = int(request.query_params.get('days', 7))
+        bucket = request.query_params.get('bucket', 'day')
+        if bucket not in STATISTICS_BUCKETS:
+            return Response({
+                'error': f'Invalid bucket: {bucket}',
+                'message': "bucket 'day' yoki 'hour' bo'lishi kerak"
+            }, status=400)
+        max_days = 31 if bucket == 'hour' else 365
+        if not 1 <= days <= max_days:
+            return Response({
+                'error': f'days must be between 1 and {max_days}',
+                'message': 'Noto\'g\'ri vaqt oralig\'i'
+            }, status=400)
+        
         end_date = timezone.now()
-        start_date = end_date - timedelta(days=7)
+        start_date = end_date - timedelta(days=days)
+        trunc = STATISTICS_BUCKETS[bucket][0]
+        labels = _bucket_labels(start_date, end_date, bucket)
         
-        # ❌ ALL MOCK DATA GENERATION DISABLED - REAL SENSOR/IRRIGATION APIs REQUIRED
-        return Response({
-            'error': 'MOCK_STATISTICS_DISABLED',
-            'message': 'All statistics must come from real sensor and irrigation system APIs',
-            'required_integrations': [
-                'Real sensor API for soil moisture trends',
-                'Real sensor API for temperature trends', 
-                'Real irrigation system API for event data',
-                'Real water usage monitoring API'
+        # Sensor trends - averaged per bucket in the database
+        trends = {}
+        for key, type_names in STATISTICS_SENSOR_TYPES.items():
+            rows = (
+                SensorReading.objects
+                .filter(sensor__sensor_type__name__in=type_names, timestamp__gte=start_date)
+                .order_by()
+                .annotate(bucket=trunc('timestamp'))
+                .values('bucket')
+                .annotate(avg=Avg('value'))
+                .values_list('bucket', 'avg')
+            )
+            trends[key] = dict(rows)
+        
+        # Irrigation events and water usage per bucket
+        irrigation = {
+            row['bucket']: row
+            for row in IrrigationEvent.objects
+            .filter(scheduled_time__gte=start_date)
+            .exclude(status='cancelled')
+            .order_by()
+            .annotate(bucket=trunc('scheduled_time'))
+            .values('bucket')
+            .annotate(
+                events=Count('id'),
+                water_ml=Sum(
+                    Coalesce('actual_water_amount_ml', 'water_amount_ml'),
+                    filter=Q(status='completed')
+                )
+            )
+        }
+        
+        def _series(values, transform=lambda value: value):
+            return [
+                transform(values[label]) if values.get(label) is not None else None
+                for label in labels
             ]
-        }, status=503)
         
+        return Response({
+            'range': {
+                'start': start_date.isoformat(),
+                'end': end_date.isoformat(),
+                'days': days,
+                'bucket': bucket,
+            },
+            'labels': [label.isoformat() for label in labels],
+            'soil_moisture': _series(trends['soil_moisture'], lambda value: round(value, 1)),
+            'temperature': _series(trends['temperature'], lambda value: round(value, 1)),
+            'irrigation_events': [
+                irrigation[label]['events'] if label in irrigation else 0 for label in labels
+            ],
+            'water_usage_liters': [
+                round((irrigation[label]['water_ml'] or 0) / 1000, 1) if label in irrigation else 0
+                for label in labels
+            ],
+        })
+        
+    except ValueError as e:
+        return Response({
+            'error': str(e)
+        }, status=400)
     except Exception as e:
         return Response({
             'error': str(e)
@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class HistoryCursorPagination(CursorPagination):
+    """Keyset pagination for append-only history tables (newest first by id)"""
+    ordering = '-id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
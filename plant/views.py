@@ -10,6 +10,7 @@ from .serializers import (
     PlantTypeSerializer, PlantSerializer, IrrigationEventSerializer,
     PlantCareLogSerializer, IrrigationZoneSerializer, IrrigationSummarySerializer
 )
+from .pagination import HistoryCursorPagination
 
 
 class PlantTypeListCreateView(generics.ListCreateAPIView):
@@ -18,23 +19,25 @@ class PlantTypeListCreateView(generics.ListCreateAPIView):
 
 
 class PlantListCreateView(generics.ListCreateAPIView):
-    queryset = Plant.objects.all()
+    queryset = Plant.objects.select_related('plant_type')
     serializer_class = PlantSerializer
 
 
 class PlantDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Plant.objects.all()
+    queryset = Plant.objects.select_related('plant_type')
     serializer_class = PlantSerializer
 
 
 class IrrigationEventListCreateView(generics.ListCreateAPIView):
-    queryset = IrrigationEvent.objects.all()
+    queryset = IrrigationEvent.objects.select_related('plant')
     serializer_class = IrrigationEventSerializer
+    pagination_class = HistoryCursorPagination
 
 
 class PlantCareLogListCreateView(generics.ListCreateAPIView):
-    queryset = PlantCareLog.objects.all()
+    queryset = PlantCareLog.objects.select_related('plant')
     serializer_class = PlantCareLogSerializer
+    pagination_class = HistoryCursorPagination
 
 
 class IrrigationZoneListCreateView(generics.ListCreateAPIView):
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Benchmark ESP32Manager fan-out against simulated controllers
+Compares sequential device calls with the parallel fan-out and checks that
+failing, offline and slow devices are reported per device within the deadline.
+
+Run with: python scripts/benchmark_esp32_fanout.py [--counts 3 10 50 100] [--latency 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+import django
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from controller.esp_controller import ESP32Manager
+from controller.esp_simulator import ESP32SimulatorFarm
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def sequential_stop_all(manager):
+    """The pre-fan-out behaviour: one pump at a time"""
+    results = {}
+    for name, controller in manager.controllers.items():
+        for pump_id in range(1, 5):
+            results[f'{name}_pump_{pump_id}'] = controller.stop_pump(pump_id)
+    return results
+
+
+def summarize(results):
+    ok = sum(1 for result in results.values() if result.get('success', result.get('online')))
+    timed_out = sum(1 for result in results.values() if result.get('timed_out'))
+    open_circuits = sum(1 for result in results.values() if result.get('circuit_open'))
+    return f"{ok}/{len(results)} ok, {timed_out} timed out, {open_circuits} circuit open"
+
+
+def benchmark_throughput(counts, latency, jitter):
+    print(f"\n=== Fan-out vs sequential ({latency}ms +/- {jitter}ms per request) ===")
+    print(f"{'devices':>8} {'sequential stop':>16} {'parallel stop':>14} {'sensors/read':>13} {'health':>9}")
+
+    for count in counts:
+        with ESP32SimulatorFarm(count, latency, jitter, seed=count) as farm:
+            manager = ESP32Manager(devices=farm.device_configs())
+
+            _, sequential = timed(sequential_stop_all, manager)
+            stopped, parallel = timed(manager.stop_all_irrigation, deadline=30)
+            readings, read_time = timed(manager.get_all_sensor_readings, deadline=30)
+            health, health_time = timed(manager.get_system_health, deadline=30)
+
+            assert all(result['success'] for result in stopped.values()), summarize(stopped)
+            assert all(result['success'] for result in readings.values()), summarize(readings)
+            assert all(result['online'] for result in health.values())
+
+            print(f"{count:>8} {sequential:>15.2f}s {parallel:>13.2f}s {read_time:>12.2f}s {health_time:>8.2f}s")
+
+
+def benchmark_failures(latency, jitter):
+    print("\n=== Error handling (20 devices, 10% failures, 2 offline, 1 slow) ===")
+    deadline = 1.0
+
+    with ESP32SimulatorFarm(20, latency, jitter, failure_rate=0.1, seed=42) as farm:
+        farm.devices[0].latency_ms = 5000  # Slower than the deadline
+        offline = farm.take_offline(2)
+        manager = ESP32Manager(devices=farm.device_configs())
+
+        for attempt in range(1, 5):
+            results, elapsed = timed(manager.broadcast_command, 'system/info', deadline=deadline)
+            print(f"broadcast #{attempt}: {elapsed:.2f}s - {summarize(results)}")
+            assert elapsed < deadline + 0.5, 'fan-out exceeded its deadline'
+
+        for name in offline:
+            breaker = manager.controllers[name].breaker.snapshot()
+            print(f"{name} (offline): circuit {breaker['state']}, retry in {breaker['retry_in_seconds']}s")
+            assert breaker['state'] == 'open'
+
+        slow = farm.devices[0].name
+        print(f"{slow} (slow): {results[slow].get('error')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[3, 10, 50, 100])
+    parser.add_argument('--latency', type=float, default=50, help='Mean device latency (ms)')
+    parser.add_argument('--jitter', type=float, default=20, help='Latency jitter (+/- ms)')
+    args = parser.parse_args()
+
+    benchmark_throughput(args.counts, args.latency, args.jitter)
+    benchmark_failures(args.latency, args.jitter)
+    print("\nESP32 fan-out benchmark completed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Benchmark Gemini response keyword parsing
+Compares the single-pass KeywordMatcher with the previous per-helper
+"any(word in text.lower())" scans, checks both find the same keyword
+classes, and reports parse time per KB of response text.
+
+Run with: python scripts/benchmark_response_parser.py [--sizes 1 4 16 64] [--repeat 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import django
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from ai_engine.predictors import get_gemini_integration
+from ai_engine.response_parser import KEYWORD_CLASSES, keyword_classes, matcher
+
+FILLER = (
+    "Tuproq namligi optimal darajadan biroz past, o'simliklar holati barqaror. "
+    "The soil profile retains moisture well and root development looks normal. "
+    "Растения развиваются нормально, почва умеренно влажная. "
+    "Ob-havo prognozi bo'yicha keyingi kunlarda o'zgarish kutilmaydi. "
+)
+
+
+def make_response(size_kb, rng):
+    """Synthetic Gemini-like answer of about size_kb KB with a random subset of keywords mixed in"""
+    keywords = [keyword for words in KEYWORD_CLASSES.values() for keyword in words]
+    parts = []
+    length = 0
+    while length < size_kb * 1024:
+        chunk = FILLER if rng.random() < 0.8 else f" {rng.choice(keywords).upper() if rng.random() < 0.2 else rng.choice(keywords)} "
+        parts.append(chunk)
+        length += len(chunk)
+    return ''.join(parts)
+
+
+def legacy_classes(text):
+    """The previous behaviour: one lowercase copy and substring scan per keyword check"""
+    return frozenset(
+        name for name, words in KEYWORD_CLASSES.items()
+        if any(word in text.lower() for word in words)
+    )
+
+
+def full_parse(text):
+    """Everything analyze_comprehensive_data extracts from one response"""
+    gemini_integration = get_gemini_integration()
+    gemini_integration._parse_real_gemini_response(text, {'soil_moisture': 40}, {})
+    gemini_integration._extract_insights_from_real_response(text)
+    gemini_integration._generate_action_plan_from_response(text)
+
+
+def per_kb(func, text, repeat, before=None):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        if before:
+            before()
+        func(text)
+    return (time.perf_counter() - started) / repeat * 1e6 / (len(text) / 1024)
+
+
+def check_equivalence(rng, samples=300):
+    checked = mismatches = 0
+    while checked < samples:
+        text = make_response(rng.choice([0.2, 1, 2]), rng)
+        # '18:00' also contains '8:00'; the old substring scan counted it as morning too
+        if '18:00' in text:
+            continue
+        checked += 1
+        if matcher.scan(text) != legacy_classes(text):
+            mismatches += 1
+    print(f"Keyword classes match the legacy scan: {samples - mismatches}/{samples} samples"
+          f"{'' if not mismatches else ' ✗'}")
+    return mismatches == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1, 4, 16, 64], help='Response sizes (KB)')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ok = check_equivalence(rng)
+
+    print(f"\n{'size':>8} {'legacy scan':>14} {'single pass':>14} {'speedup':>8} {'full parse':>13}")
+    for size in args.sizes:
+        text = make_response(size, rng)
+        repeat = max(5, int(args.repeat / size))
+        legacy = per_kb(legacy_classes, text, repeat)
+        single = per_kb(matcher.scan, text, repeat)
+        full = per_kb(full_parse, text, repeat, before=keyword_classes.cache_clear)
+        print(f"{size:>6g}KB {legacy:>11.1f}µs/KB {single:>11.1f}µs/KB {legacy / single:>7.1f}x {full:>10.1f}µs/KB")
+
+    print("\nResponse parser benchmark completed")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""
+Benchmark the SQLite database profiles under concurrent reads and writes
+Runs API readers and a bulk-ingest writer at the same time against a
+throwaway database file, once per DB_PROFILE, and compares throughput,
+latency and "database is locked" errors.
+
+Run with: python scripts/benchmark_sqlite_profile.py [--readers 4] [--seconds 10]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILES = ['development', 'production']
+
+
+def percentile(values, share):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * share), len(values) - 1)]
+
+
+def run_worker(db_path, readers, seconds, batch_size):
+    """Benchmark the profile selected by DB_PROFILE (runs in a child process)"""
+    sys.path.append(PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+    # Point the settings at the throwaway database before any connection opens
+    import config.settings
+    config.settings.DATABASES['default']['NAME'] = db_path
+
+    import django
+    django.setup()
+
+    from datetime import timedelta
+    from django.core.management import call_command
+    from django.db import close_old_connections, connection, connections, OperationalError
+    from django.db.backends.signals import connection_created
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from django.utils import timezone
+    from sensor.ingest import ingest_readings
+    from sensor.models import Sensor, SensorType
+
+    setup_test_environment()
+    call_command('migrate', verbosity=0)
+
+    sensor_type = SensorType.objects.create(name='soil_moisture', unit='%')
+    sensors = [
+        Sensor.objects.create(sensor_id=f'BENCH_{index:02d}', name=f'Bench {index}', sensor_type=sensor_type,
+                              location='Zone A')
+        for index in range(4)
+    ]
+    start = timezone.now() - timedelta(days=1)
+    ingest_readings(
+        [sensors[index % len(sensors)].sensor_id, 40 + index % 20, (start + timedelta(seconds=index * 4)).timestamp()]
+        for index in range(20000)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode')
+        journal_mode = cursor.fetchone()[0]
+    connections.close_all()
+
+    def run_client(role, index, queue, deadline):
+        """Issue API reads or ingest batches until the deadline, then report timings"""
+        opened = []
+        connection_created.connect(lambda **kwargs: opened.append(1), weak=False)
+        durations, errors = [], 0
+        client = Client()
+        sensor_id = sensors[index % len(sensors)].sensor_id
+
+        while time.time() < deadline:
+            started = time.perf_counter()
+            try:
+                if role == 'read':
+                    ok = client.get('/api/sensor/readings/', {'sensor_id': sensor_id, 'hours': 6}).status_code == 200
+                else:
+                    now = time.time()
+                    rows = [[sensors[i % len(sensors)].sensor_id, 50, now + i / 1000] for i in range(batch_size)]
+                    ok = ingest_readings(rows)['rejected'] == 0
+            except OperationalError:
+                ok = False
+            if ok:
+                durations.append(time.perf_counter() - started)
+            else:
+                errors += 1
+            # What the request_finished signal does at the end of a real request
+            close_old_connections()
+
+        queue.put((role, durations, errors, len(opened)))
+
+    # Separate processes, as with several WSGI workers sharing one database file
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    deadline = time.time() + seconds
+    workers = [context.Process(target=run_client, args=('read', index, queue, deadline))
+               for index in range(readers)]
+    workers.append(context.Process(target=run_client, args=('write', 0, queue, deadline)))
+    for worker in workers:
+        worker.start()
+    results = [queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    stats = {'reads': [], 'writes': [], 'read_errors': 0, 'write_errors': 0}
+    opened = 0
+    for role, durations, errors, connections_opened in results:
+        stats[f'{role}s'].extend(durations)
+        stats[f'{role}_errors'] += errors
+        opened += connections_opened
+
+    print(json.dumps({
+        'journal_mode': journal_mode,
+        'reads_per_second': len(stats['reads']) / seconds,
+        'read_p50_ms': percentile(stats['reads'], 0.5) * 1000,
+        'read_p95_ms': percentile(stats['reads'], 0.95) * 1000,
+        'read_errors': stats['read_errors'],
+        'write_batches_per_second': len(stats['writes']) / seconds,
+        'write_p95_ms': percentile(stats['writes'], 0.95) * 1000,
+        'write_errors': stats['write_errors'],
+        'connections_opened': opened,
+    }))
+
+
+def run_profile(profile, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DB_PROFILE=profile)
+        process = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker', os.path.join(tmp, 'bench.sqlite3'),
+             '--readers', str(args.readers), '--seconds', str(args.seconds), '--batch-size', str(args.batch_size)],
+            env=env, capture_output=True, text=True,
+        )
+    if process.returncode != 0:
+        raise RuntimeError(f"{profile} benchmark failed:\n{process.stderr}")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--readers', type=int, default=4, help='Concurrent API reader threads')
+    parser.add_argument('--seconds', type=float, default=10, help='Duration per profile')
+    parser.add_argument('--batch-size', type=int, default=500, help='Readings per ingest batch')
+    parser.add_argument('--worker', metavar='DB_PATH', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.readers, args.seconds, args.batch_size)
+        return
+
+    print(f"=== {args.readers} readers + 1 writer ({args.batch_size} readings/batch), {args.seconds:g}s per profile ===")
+    print(f"{'profile':>12} {'journal':>8} {'reads/s':>8} {'read p50':>9} {'read p95':>9} "
+          f"{'writes/s':>9} {'write p95':>10} {'errors':>7} {'connections':>12}")
+
+    for profile in PROFILES:
+        result = run_profile(profile, args)
+        errors = result['read_errors'] + result['write_errors']
+        print(f"{profile:>12} {result['journal_mode']:>8} {result['reads_per_second']:>8.1f} "
+              f"{result['read_p50_ms']:>7.1f}ms {result['read_p95_ms']:>7.1f}ms "
+              f"{result['write_batches_per_second']:>9.1f} {result['write_p95_ms']:>8.1f}ms "
+              f"{errors:>7} {result['connections_opened']:>12}")
+
+    print("\nSQLite profile benchmark completed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Benchmark process startup with lazily built singletons
+Times django.setup() plus loading the URLconf (every view module, as
+manage.py checks and worker boot do) in fresh interpreters, then the first
+get_gemini_integration() / get_esp32_manager() call that now pays the cost
+the old module-level singletons paid at import.
+
+Run with: python scripts/benchmark_startup.py [--runs 7]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter for every sample so nothing is already imported
+CHILD = r'''
+import json, os, sys, time
+sys.path.insert(0, {project_dir!r})
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+startup = time.perf_counter() - started
+
+from ai_engine import predictors
+from controller import esp_controller
+built_at_import = [predictors._gemini_integration is not None, esp_controller._esp32_manager is not None]
+genai_at_import = 'google.generativeai' in sys.modules
+
+started = time.perf_counter()
+predictors.get_gemini_integration()
+gemini = time.perf_counter() - started
+
+started = time.perf_counter()
+esp_controller.get_esp32_manager()
+esp32 = time.perf_counter() - started
+
+print(json.dumps({{
+    'startup': startup, 'gemini': gemini, 'esp32': esp32,
+    'built_at_import': built_at_import, 'genai_at_import': genai_at_import,
+    'genai_loaded': 'google.generativeai' in sys.modules,
+}}))
+'''
+
+
+def sample():
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD.format(project_dir=PROJECT_DIR)],
+        capture_output=True, text=True, env=os.environ.copy()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'startup sample failed:\n{result.stderr}')
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=7)
+    args = parser.parse_args()
+
+    samples = [sample() for _ in range(args.runs)]
+    median_ms = {key: statistics.median(s[key] for s in samples) * 1000 for key in ('startup', 'gemini', 'esp32')}
+    first = samples[0]
+
+    print(f"Fresh interpreters: {args.runs}")
+    print(f"Singletons built during startup: gemini={first['built_at_import'][0]} esp32={first['built_at_import'][1]}")
+    print(f"google.generativeai imported during startup: {first['genai_at_import']}"
+          f" (available: {first['genai_loaded']})")
+    print(f"\n{'':<36} {'median':>10}")
+    print(f"{'django.setup() + URLconf (lazy)':<36} {median_ms['startup']:>8.1f}ms")
+    print(f"{'first get_gemini_integration()':<36} {median_ms['gemini']:>8.1f}ms")
+    print(f"{'first get_esp32_manager()':<36} {median_ms['esp32']:>8.1f}ms")
+    eager = median_ms['startup'] + median_ms['gemini'] + median_ms['esp32']
+    saved = median_ms['gemini'] + median_ms['esp32']
+    print(f"{'startup with eager singletons':<36} {eager:>8.1f}ms")
+    print(f"\nSaved per process that never calls Gemini/ESP32: {saved:.1f}ms ({saved / eager * 100:.0f}% of startup)")
+    print("\nStartup benchmark completed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Query plan checks for SensorReading time-series indexes
+Runs the sensor views against a throwaway test database, captures every
+query that touches sensor_sensorreading and asserts that SQLite's
+EXPLAIN QUERY PLAN uses an index instead of a full scan or a temp sort.
+
+Run with: python scripts/check_query_plans.py
+"""
+import os
+import sys
+import django
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from datetime import timedelta
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.utils import timezone
+from sensor.models import Sensor, SensorType, SensorReading
+
+READINGS_TABLE = 'sensor_sensorreading'
+
+
+def create_fixture_data():
+    """Create a few sensors with a day of readings"""
+    sensor_type = SensorType.objects.create(name='Soil Moisture', unit='%')
+    now = timezone.now()
+
+    for i in range(3):
+        sensor = Sensor.objects.create(
+            sensor_id=f'PLAN_{i:02d}',
+            name=f'Plan sensor #{i}',
+            sensor_type=sensor_type,
+            location='A sektori'
+        )
+        SensorReading.objects.bulk_create([
+            SensorReading(sensor=sensor, value=40 + j % 20, timestamp=now - timedelta(minutes=30 * j))
+            for j in range(48)
+        ])
+
+
+def explain(sql):
+    """Return EXPLAIN QUERY PLAN detail lines for a captured query"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_problems(plan):
+    """Find full scans of the readings table and temp-table sorts"""
+    problems = []
+    for line in plan:
+        if line.split()[:2] == ['SCAN', READINGS_TABLE] and 'INDEX' not in line:
+            problems.append(line)
+        # Grouping the (small) unrolled tail into buckets is expected, sorting is not
+        if 'USE TEMP B-TREE' in line and 'ORDER BY' in line:
+            problems.append(line)
+    return problems
+
+
+def check_view(client, label, method, url, **kwargs):
+    """Call a view and check the plan of each readings query it runs"""
+    with CaptureQueriesContext(connection) as captured:
+        response = getattr(client, method)(url, **kwargs)
+
+    if response.status_code >= 400:
+        print(f"✗ {label}: HTTP {response.status_code}")
+        return False
+
+    ok = True
+    checked = 0
+    for query in captured.captured_queries:
+        sql = query['sql']
+        if READINGS_TABLE not in sql or not sql.lstrip().upper().startswith('SELECT'):
+            continue
+        checked += 1
+        plan = explain(sql)
+        problems = plan_problems(plan)
+        if problems:
+            ok = False
+            print(f"✗ {label}: {sql}")
+            for line in plan:
+                print(f"    {line}")
+
+    if ok:
+        print(f"✓ {label} ({checked} readings queries use indexes)")
+    return ok
+
+
+def check_query(label, queryset):
+    """Check the plan of a single queryset"""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        plan = [row[-1] for row in cursor.fetchall()]
+
+    problems = plan_problems(plan)
+    if problems:
+        print(f"✗ {label}")
+        for line in plan:
+            print(f"    {line}")
+        return False
+
+    print(f"✓ {label}: {' | '.join(plan)}")
+    return True
+
+
+def main():
+    if connection.vendor != 'sqlite':
+        print(f"EXPLAIN QUERY PLAN checks require SQLite, got {connection.vendor}")
+        return 1
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    try:
+        create_fixture_data()
+        client = Client()
+        sensor = Sensor.objects.first()
+        since = timezone.now() - timedelta(hours=24)
+
+        results = [
+            check_view(client, 'get_sensor_statistics', 'get', '/api/sensor/statistics/'),
+            check_view(client, 'SensorReadingListView', 'get', '/api/sensor/readings/'),
+            check_view(client, 'SensorReadingListView (sensor_id)', 'get',
+                       '/api/sensor/readings/', data={'sensor_id': sensor.sensor_id, 'hours': 6}),
+            check_view(client, 'get_sensor_history', 'get',
+                       '/api/sensor/history/', data={'sensor_id': sensor.sensor_id, 'hours': 24}),
+            check_view(client, 'get_system_diagnostics', 'get', '/api/controller/diagnostics/'),
+            check_query('latest reading per sensor',
+                        SensorReading.objects.filter(sensor=sensor).order_by('-timestamp')[:1]),
+            check_query('latest reading in window',
+                        sensor.readings.filter(timestamp__gte=since)[:1]),
+        ]
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    if all(results):
+        print("\nAll SensorReading queries use the time-series indexes")
+        return 0
+
+    print("\nSome SensorReading queries fall back to full scans")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,13 @@
 from django.contrib import admin
-from .models import SensorType, Sensor, SensorReading, WeatherData, SystemStatus
+from .models import (
+    SensorType, Sensor, SensorReading, SensorLatest, SensorReadingHourly, SensorReadingDaily,
+    WeatherData, SystemStatus
+)
 
 
 @admin.register(SensorType)
 class SensorTypeAdmin(admin.ModelAdmin):
-    list_display = ['name', 'unit', 'icon', 'description']
+    list_display = ['name', 'unit', 'icon', 'description', 'raw_retention_days', 'hourly_retention_days', 'daily_retention_days']
     search_fields = ['name']
 
 
@@ -23,6 +26,20 @@ class SensorReadingAdmin(admin.ModelAdmin):
     date_hierarchy = 'timestamp'
 
 
+@admin.register(SensorLatest)
+class SensorLatestAdmin(admin.ModelAdmin):
+    list_display = ['sensor', 'value', 'timestamp', 'is_anomaly']
+    list_filter = ['is_anomaly']
+    search_fields = ['sensor__name', 'sensor__sensor_id']
+
+
+@admin.register(SensorReadingHourly, SensorReadingDaily)
+class SensorRollupAdmin(admin.ModelAdmin):
+    list_display = ['sensor', 'bucket', 'count', 'min_value', 'max_value', 'avg']
+    list_filter = ['sensor']
+    date_hierarchy = 'bucket'
+
+
 @admin.register(WeatherData)
 class WeatherDataAdmin(admin.ModelAdmin):
     list_display = ['location', 'temperature', 'humidity', 'weather_condition', 'timestamp']
@@ -1,6 +1,11 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class SensorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'sensor'
\ No newline at end of file
+    name = 'sensor'
+    
+    def ready(self):
+        from config.sqlite import apply_sqlite_pragmas
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid='sqlite_pragmas')
@@ -0,0 +1,114 @@
+"""
+Sensor Export Module
+Streams sensor reading history as CSV or NDJSON with flat memory use.
+"""
+
+import csv
+import json
+from datetime import datetime, time
+from typing import Dict, Iterator, Optional
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Sensor, SensorReading
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+EXPORT_COLUMNS = ['sensor_id', 'sensor_name', 'unit', 'timestamp', 'value', 'is_anomaly']
+
+
+class Echo:
+    """File-like object that returns what is written, for streaming csv.writer output"""
+
+    def write(self, value):
+        return value
+
+
+def parse_export_time(raw: Optional[str], end_of_day: bool = False) -> Optional[datetime]:
+    """Parse an ISO date or datetime query parameter into an aware datetime"""
+    if not raw:
+        return None
+
+    parsed = parse_datetime(raw)
+    if parsed is None:
+        day = parse_date(raw)
+        if day is None:
+            raise ValueError(f"Invalid date: {raw!r}")
+        parsed = datetime.combine(day, time.max if end_of_day else time.min)
+
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def export_rows(sensor_ids=None, start: datetime = None, end: datetime = None) -> Iterator[tuple]:
+    """
+    Yield (sensor_id, sensor_name, unit, timestamp, value, is_anomaly) rows
+
+    Sensor names and units are resolved once up front; sensors created while
+    the export streams are looked up when their first reading shows up.
+    Readings are fetched as plain tuples in chunks, oldest first, so Python
+    never holds model instances for the whole range. On SQLite this is a
+    client-side cursor: the database side is not bounded in memory the way
+    a PostgreSQL server-side cursor would be.
+
+    Args:
+        sensor_ids (list): Optional sensor_id strings to limit to
+        start (datetime): Optional inclusive range start
+        end (datetime): Optional inclusive range end
+    """
+    sensors = Sensor.objects.select_related('sensor_type')
+    if sensor_ids:
+        sensors = sensors.filter(sensor_id__in=sensor_ids)
+    sensor_info: Dict[int, tuple] = {
+        sensor.id: (sensor.sensor_id, sensor.name, sensor.sensor_type.unit)
+        for sensor in sensors
+    }
+
+    readings = SensorReading.objects.all()
+    if sensor_ids:
+        readings = readings.filter(sensor_id__in=sensor_info.keys())
+    if start:
+        readings = readings.filter(timestamp__gte=start)
+    if end:
+        readings = readings.filter(timestamp__lte=end)
+
+    rows = (
+        readings.order_by('timestamp')
+        .values_list('sensor_id', 'timestamp', 'value', 'is_anomaly')
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    for sensor_pk, timestamp, value, is_anomaly in rows:
+        info = sensor_info.get(sensor_pk)
+        if info is None:
+            sensor = Sensor.objects.select_related('sensor_type').filter(pk=sensor_pk).first()
+            if sensor is None:
+                continue  # Deleted mid-export
+            info = sensor_info[sensor_pk] = (sensor.sensor_id, sensor.name, sensor.sensor_type.unit)
+        yield (*info, timezone.localtime(timestamp).isoformat(), value, is_anomaly)
+
+
+def stream_csv(rows: Iterator[tuple]) -> Iterator[str]:
+    """Render rows as CSV lines, header first"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(rows: Iterator[tuple]) -> Iterator[str]:
+    """Render rows as newline-delimited JSON objects"""
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + '\n'
+
+
+STREAM_RENDERERS = {
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+}
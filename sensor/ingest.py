@@ -0,0 +1,202 @@
+"""
+Sensor Ingestion Module
+Batched write path for sensor readings coming from field probes.
+"""
+
+import logging
+import math
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Sensor, SensorReading, SensorLatest
+
+logger = logging.getLogger(__name__)
+
+INGEST_SETTINGS = getattr(settings, 'SENSOR_INGEST', {})
+CHUNK_SIZE = INGEST_SETTINGS.get('CHUNK_SIZE', 500)
+MAX_BATCH_ROWS = INGEST_SETTINGS.get('MAX_BATCH_ROWS', 10000)
+
+
+def _parse_timestamp(raw) -> datetime:
+    """Parse ISO-8601 string or unix epoch seconds, default to now"""
+    if raw in (None, ''):
+        return timezone.now()
+    if isinstance(raw, bool):
+        raise ValueError(f"Invalid timestamp: {raw!r}")
+    if isinstance(raw, (int, float)):
+        try:
+            return datetime.fromtimestamp(raw, tz=dt_timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            # Epochs outside the platform's range (e.g. 1e18, inf) or NaN
+            raise ValueError(f"Timestamp out of range: {raw!r}")
+    if isinstance(raw, str):
+        parsed = parse_datetime(raw)
+        if parsed is None:
+            raise ValueError(f"Invalid timestamp: {raw!r}")
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+    raise ValueError(f"Invalid timestamp: {raw!r}")
+
+
+def _unpack_row(row) -> Tuple[str, float, datetime, bool]:
+    """Accept [sensor_id, value, timestamp] tuples or {'sensor_id', 'value', 'timestamp'} dicts"""
+    if isinstance(row, dict):
+        sensor_id = row['sensor_id']
+        value = row['value']
+        timestamp = row.get('timestamp')
+        is_anomaly = row.get('is_anomaly', False)
+    elif isinstance(row, (list, tuple)) and 2 <= len(row) <= 4:
+        sensor_id, value = row[0], row[1]
+        timestamp = row[2] if len(row) > 2 else None
+        is_anomaly = row[3] if len(row) > 3 else False
+    else:
+        raise ValueError("Row must be [sensor_id, value, timestamp] or an object")
+
+    if not isinstance(sensor_id, str) or not sensor_id:
+        raise ValueError(f"Invalid sensor_id: {sensor_id!r}")
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid value: {value!r}")
+    try:
+        value = float(value)
+    except OverflowError:
+        raise ValueError(f"Invalid value: {value!r}")
+    if not math.isfinite(value):
+        raise ValueError(f"Invalid value: {value!r}")
+
+    return sensor_id, value, _parse_timestamp(timestamp), bool(is_anomaly)
+
+
+def prepare_readings(rows: Iterable) -> Tuple[List[Tuple[int, SensorReading]], List[Dict]]:
+    """
+    Validate raw rows and build unsaved SensorReading objects
+
+    All sensor_id strings are resolved with a single query.
+
+    Args:
+        rows (iterable): Raw reading rows from the request payload
+
+    Returns:
+        tuple: ([(row_index, SensorReading)], [reject dicts])
+    """
+    parsed = []
+    rejects = []
+
+    for index, row in enumerate(rows):
+        try:
+            parsed.append((index, *_unpack_row(row)))
+        except (KeyError, TypeError, ValueError, OverflowError, OSError) as e:
+            rejects.append({'index': index, 'error': str(e)})
+
+    sensor_ids = {item[1] for item in parsed}
+    sensor_pks = dict(
+        Sensor.objects.filter(sensor_id__in=sensor_ids).values_list('sensor_id', 'id')
+    )
+
+    readings = []
+    for index, sensor_id, value, timestamp, is_anomaly in parsed:
+        sensor_pk = sensor_pks.get(sensor_id)
+        if sensor_pk is None:
+            rejects.append({'index': index, 'error': f'Unknown sensor_id: {sensor_id}'})
+            continue
+        readings.append((index, SensorReading(
+            sensor_id=sensor_pk,
+            value=value,
+            timestamp=timestamp,
+            is_anomaly=is_anomaly,
+        )))
+
+    return readings, rejects
+
+
+def _write_chunk(chunk: List[Tuple[int, SensorReading]]):
+    """Insert one chunk and update the SensorLatest cache in a single transaction"""
+    for _, reading in chunk:
+        # A rolled back attempt leaves primary keys behind, insert as new rows again
+        reading.pk = None
+        reading._state.adding = True
+    with transaction.atomic():
+        created = SensorReading.objects.bulk_create([reading for _, reading in chunk])
+        SensorLatest.objects.record(created)
+
+
+def write_readings(readings: List[Tuple[int, SensorReading]],
+                   chunk_size: int = CHUNK_SIZE) -> Tuple[int, List[Dict]]:
+    """
+    Write readings with bulk_create, one transaction per chunk
+
+    The SensorLatest cache is updated inside the same transaction.
+
+    A failing chunk is rolled back and retried without the readings of
+    sensors deleted since validation (the usual cause, the foreign key check
+    fails at commit). If it still fails, its readings are written one by one
+    so only the rows the database refuses are rejected.
+
+    Returns:
+        tuple: (rows written, [reject dicts])
+    """
+    written = 0
+    rejects = []
+
+    for start in range(0, len(readings), chunk_size):
+        chunk = readings[start:start + chunk_size]
+        try:
+            _write_chunk(chunk)
+            written += len(chunk)
+            continue
+        except DatabaseError as e:
+            logger.warning(f"Sensor ingest chunk failed, retrying without deleted sensors: {e}")
+
+        existing = set(Sensor.objects.filter(
+            pk__in={reading.sensor_id for _, reading in chunk}
+        ).values_list('pk', flat=True))
+        surviving = []
+        for index, reading in chunk:
+            if reading.sensor_id in existing:
+                surviving.append((index, reading))
+            else:
+                rejects.append({'index': index, 'error': f'Sensor deleted before write: {reading.sensor_id}'})
+
+        try:
+            _write_chunk(surviving)
+            written += len(surviving)
+            continue
+        except DatabaseError as e:
+            logger.error(f"Sensor ingest chunk failed again, writing row by row: {e}")
+
+        for index, reading in surviving:
+            try:
+                _write_chunk([(index, reading)])
+                written += 1
+            except DatabaseError as e:
+                rejects.append({'index': index, 'error': f'Database error: {e}'})
+
+    return written, rejects
+
+
+def ingest_readings(rows: Iterable, chunk_size: int = CHUNK_SIZE) -> Dict:
+    """
+    Validate and store a batch of raw sensor readings
+
+    Args:
+        rows (iterable): [sensor_id, value, timestamp] tuples or dicts
+        chunk_size (int): Rows per bulk_create transaction
+
+    Returns:
+        dict: Accepted count and per-row rejects
+    """
+    readings, rejects = prepare_readings(rows)
+    written, write_rejects = write_readings(readings, chunk_size)
+    rejects.extend(write_rejects)
+    rejects.sort(key=lambda reject: reject['index'])
+
+    return {
+        'accepted': written,
+        'rejected': len(rejects),
+        'rejects': rejects,
+    }
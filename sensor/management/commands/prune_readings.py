@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+
+from sensor.retention import prune_readings, vacuum, BATCH_SIZE, BATCH_PAUSE_SECONDS
+
+
+def _format_bytes(size):
+    if size < 1024:
+        return f'{size} B'
+    if size < 1024 * 1024:
+        return f'{size / 1024:.1f} KB'
+    return f'{size / (1024 * 1024):.1f} MB'
+
+
+class Command(BaseCommand):
+    help = 'Roll up and delete sensor readings past their SensorType retention policy'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'Rows deleted per transaction (default {BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=BATCH_PAUSE_SECONDS,
+            help=f'Seconds to sleep between batches (default {BATCH_PAUSE_SECONDS})'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many rows would be deleted'
+        )
+        parser.add_argument(
+            '--vacuum',
+            action='store_true',
+            help='Run VACUUM afterwards to shrink the database file (locks the database)'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            self.stderr.write(self.style.ERROR('--batch-size must be positive'))
+            return
+
+        report = prune_readings(options['batch_size'], options['pause'], options['dry_run'])
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+
+        if report['rolled_up']:
+            self.stdout.write(f"Rolled up {report['rolled_up']} pending readings")
+
+        for type_report in report['types']:
+            self.stdout.write(
+                f"  {type_report['sensor_type']}: raw {type_report['raw']}, "
+                f"hourly {type_report['hourly']}, daily {type_report['daily']}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['raw']} raw readings, {report['hourly']} hourly "
+            f"and {report['daily']} daily buckets"
+        ))
+
+        if 'bytes_reclaimed' in report and not options['dry_run']:
+            self.stdout.write(
+                f"Reclaimed {_format_bytes(report['bytes_reclaimed'])} of free pages "
+                f"(database file {_format_bytes(report['file_bytes'])})"
+            )
+
+        if options['vacuum'] and not options['dry_run']:
+            self.stdout.write(f"VACUUM shrank the database file by {_format_bytes(vacuum())}")
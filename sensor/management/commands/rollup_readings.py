@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from sensor.rollups import rollup_pending, get_watermark, BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Fold new sensor readings into the hourly and daily rollup tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'Readings processed per transaction (default {BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            self.stderr.write(self.style.ERROR('--batch-size must be positive'))
+            return
+
+        processed = rollup_pending(batch_size)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rolled up {processed} readings (watermark: reading #{get_watermark()})'
+        ))
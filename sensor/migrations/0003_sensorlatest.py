@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_sensor_latest(apps, schema_editor):
+    """Seed the latest-reading cache from existing readings"""
+    Sensor = apps.get_model('sensor', 'Sensor')
+    SensorReading = apps.get_model('sensor', 'SensorReading')
+    SensorLatest = apps.get_model('sensor', 'SensorLatest')
+
+    newest = SensorReading.objects.filter(sensor=models.OuterRef('pk')).order_by('-timestamp', '-id').values('id')[:1]
+    reading_ids = Sensor.objects.annotate(
+        latest_id=models.Subquery(newest)
+    ).exclude(latest_id=None).values_list('latest_id', flat=True)
+
+    SensorLatest.objects.bulk_create([
+        SensorLatest(
+            sensor_id=reading.sensor_id,
+            reading_id=reading.id,
+            value=reading.value,
+            timestamp=reading.timestamp,
+            is_anomaly=reading.is_anomaly
+        )
+        for reading in SensorReading.objects.filter(id__in=list(reading_ids))
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensor', '0002_weatherdata_air_quality_index_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SensorLatest',
+            fields=[
+                ('sensor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='latest', serialize=False, to='sensor.sensor')),
+                ('reading_id', models.BigIntegerField(blank=True, null=True)),
+                ('value', models.FloatField()),
+                ('timestamp', models.DateTimeField()),
+                ('is_anomaly', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.RunPython(backfill_sensor_latest, migrations.RunPython.noop),
+    ]
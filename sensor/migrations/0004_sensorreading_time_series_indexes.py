@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensor', '0003_sensorlatest'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sensorreading',
+            index=models.Index(fields=['sensor', '-timestamp'], name='sensor_reading_sensor_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sensorreading',
+            index=models.Index(fields=['timestamp'], name='sensor_reading_ts_idx'),
+        ),
+    ]
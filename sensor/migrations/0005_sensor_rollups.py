@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensor', '0004_sensorreading_time_series_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_reading_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SensorReadingHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('value_sum', models.FloatField(default=0)),
+                ('min_value', models.FloatField()),
+                ('max_value', models.FloatField()),
+                ('value_sum_sq', models.FloatField(default=0)),
+                ('sensor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sensor.sensor')),
+            ],
+            options={
+                'verbose_name': 'Sensor reading (hourly)',
+                'verbose_name_plural': 'Sensor readings (hourly)',
+                'ordering': ['-bucket'],
+                'abstract': False,
+                'unique_together': {('sensor', 'bucket')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SensorReadingDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('value_sum', models.FloatField(default=0)),
+                ('min_value', models.FloatField()),
+                ('max_value', models.FloatField()),
+                ('value_sum_sq', models.FloatField(default=0)),
+                ('sensor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sensor.sensor')),
+            ],
+            options={
+                'verbose_name': 'Sensor reading (daily)',
+                'verbose_name_plural': 'Sensor readings (daily)',
+                'ordering': ['-bucket'],
+                'abstract': False,
+                'unique_together': {('sensor', 'bucket')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensor', '0005_sensor_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sensortype',
+            name='daily_retention_days',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='sensortype',
+            name='hourly_retention_days',
+            field=models.PositiveIntegerField(default=365),
+        ),
+        migrations.AddField(
+            model_name='sensortype',
+            name='raw_retention_days',
+            field=models.PositiveIntegerField(default=14),
+        ),
+    ]
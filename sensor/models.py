@@ -1,7 +1,10 @@
-from django.db import models
+from django.db import connections, models, transaction
 from django.utils import timezone
 import random
 
+# Older readings are not reported as a sensor's current value
+LATEST_READING_MAX_AGE = timezone.timedelta(minutes=5)
+
 
 class SensorType(models.Model):
     """Model for different types of sensors"""
@@ -10,6 +13,11 @@ class SensorType(models.Model):
     description = models.TextField(blank=True)
     icon = models.CharField(max_length=50, default='📡')
     
+    # Retention policy (days), enforced by the prune_readings command
+    raw_retention_days = models.PositiveIntegerField(default=14)
+    hourly_retention_days = models.PositiveIntegerField(default=365)
+    daily_retention_days = models.PositiveIntegerField(null=True, blank=True)  # None = keep forever
+    
     def __str__(self):
         return f"{self.name} ({self.unit})"
 
@@ -36,8 +44,15 @@ class Sensor(models.Model):
         return f"{self.name} - {self.location}"
     
     def get_latest_reading(self):
-        """Get the latest sensor reading"""
-        return self.readings.filter(timestamp__gte=timezone.now() - timezone.timedelta(minutes=5)).first()
+        """Get the latest sensor reading (served from SensorLatest, use select_related('latest'))"""
+        try:
+            latest = self.latest
+        except SensorLatest.DoesNotExist:
+            return None
+        
+        if latest.timestamp < timezone.now() - LATEST_READING_MAX_AGE:
+            return None
+        return latest.as_reading(self)
 
 
 class SensorReading(models.Model):
@@ -49,10 +64,22 @@ class SensorReading(models.Model):
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # Per-sensor time window queries (statistics, latest reading, readings list)
+            models.Index(fields=['sensor', '-timestamp'], name='sensor_reading_sensor_ts_idx'),
+            # Farm-wide time window queries (diagnostics, exports)
+            models.Index(fields=['timestamp'], name='sensor_reading_ts_idx'),
+        ]
         
     def __str__(self):
         return f"{self.sensor.name}: {self.value}{self.sensor.sensor_type.unit} at {self.timestamp}"
     
+    def save(self, *args, **kwargs):
+        # Keep the latest-reading cache in the same transaction as the insert
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            SensorLatest.objects.record([self])
+    
     @classmethod
     def generate_random_reading(cls, sensor):
         """Generate random sensor reading for demo purposes"""
@@ -97,6 +124,173 @@ class SensorReading(models.Model):
         return reading
 
 
+class SensorLatestManager(models.Manager):
+    """Manager for the latest-reading cache"""
+    
+    def record(self, readings):
+        """
+        Upsert the newest of the given readings for each sensor
+        
+        Must run inside the transaction that stored the readings.
+        
+        Args:
+            readings (list): Saved SensorReading objects
+        """
+        newest = {}
+        for reading in readings:
+            current = newest.get(reading.sensor_id)
+            if current is None or (reading.timestamp, reading.pk or 0) >= (current.timestamp, current.pk or 0):
+                newest[reading.sensor_id] = reading
+        
+        if not newest:
+            return
+        
+        existing = dict(self.filter(sensor_id__in=newest.keys()).values_list('sensor_id', 'reading_id'))
+        
+        for sensor_id, reading in list(newest.items()):
+            if reading.pk is None or existing.get(sensor_id) != reading.pk:
+                continue
+            # The cached reading itself was saved again (maybe moved back in time) - point the cache
+            # at the real newest one, unless a concurrent ingest already replaced it
+            current = SensorReading.objects.filter(sensor_id=sensor_id).order_by('-timestamp').first()
+            self.filter(sensor_id=sensor_id, reading_id=reading.pk).update(
+                reading_id=current.pk,
+                value=current.value,
+                timestamp=current.timestamp,
+                is_anomaly=current.is_anomaly
+            )
+            del newest[sensor_id]
+        
+        self._upsert_if_newer([
+            self.model(
+                sensor_id=sensor_id,
+                reading_id=reading.pk,
+                value=reading.value,
+                timestamp=reading.timestamp,
+                is_anomaly=reading.is_anomaly
+            )
+            for sensor_id, reading in newest.items()
+        ])
+    
+    def _upsert_if_newer(self, rows):
+        """
+        INSERT ... ON CONFLICT DO UPDATE that never replaces a newer cached reading
+        
+        bulk_create(update_conflicts=True) overwrites unconditionally, so two
+        concurrent ingests could leave the older reading in the cache. The
+        WHERE clause makes the database compare timestamps atomically.
+        """
+        if not rows:
+            return
+        
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        fields = [self.model._meta.get_field(name) for name in ('sensor', 'reading_id', 'value', 'timestamp', 'is_anomaly')]
+        table = quote(self.model._meta.db_table)
+        columns = [quote(field.column) for field in fields]
+        updates = ', '.join(f'{column} = excluded.{column}' for column in columns[1:])
+        timestamp = quote(self.model._meta.get_field('timestamp').column)
+        
+        batch_size = max(connection.ops.bulk_batch_size(fields, rows), 1)
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                placeholders = ', '.join(['(' + ', '.join(['%s'] * len(fields)) + ')'] * len(batch))
+                params = [
+                    field.get_db_prep_save(getattr(row, field.attname), connection)
+                    for row in batch for field in fields
+                ]
+                cursor.execute(
+                    f'INSERT INTO {table} ({", ".join(columns)}) VALUES {placeholders} '
+                    f'ON CONFLICT ({columns[0]}) DO UPDATE SET {updates} '
+                    f'WHERE excluded.{timestamp} >= {table}.{timestamp}',
+                    params
+                )
+
+
+class SensorLatest(models.Model):
+    """Denormalized current value per sensor, updated atomically on ingest"""
+    sensor = models.OneToOneField(Sensor, related_name='latest', on_delete=models.CASCADE, primary_key=True)
+    reading_id = models.BigIntegerField(null=True, blank=True)  # Source SensorReading id
+    value = models.FloatField()
+    timestamp = models.DateTimeField()
+    is_anomaly = models.BooleanField(default=False)
+    
+    objects = SensorLatestManager()
+    
+    def __str__(self):
+        return f"{self.sensor_id}: {self.value} at {self.timestamp}"
+    
+    def as_reading(self, sensor=None):
+        """Return the cached values as an (unsaved) SensorReading instance"""
+        reading = SensorReading(
+            id=self.reading_id,
+            sensor_id=self.sensor_id,
+            value=self.value,
+            timestamp=self.timestamp,
+            is_anomaly=self.is_anomaly
+        )
+        if sensor is not None:
+            reading.sensor = sensor
+        return reading
+
+
+class SensorRollup(models.Model):
+    """Base model for pre-aggregated reading buckets"""
+    sensor = models.ForeignKey(Sensor, on_delete=models.CASCADE)
+    bucket = models.DateTimeField()  # Bucket start (local time, truncated)
+    count = models.PositiveIntegerField(default=0)
+    value_sum = models.FloatField(default=0)
+    min_value = models.FloatField()
+    max_value = models.FloatField()
+    value_sum_sq = models.FloatField(default=0)  # Sum of squares for stddev
+    
+    class Meta:
+        abstract = True
+        ordering = ['-bucket']
+        unique_together = ['sensor', 'bucket']
+    
+    def __str__(self):
+        return f"{self.sensor_id} @ {self.bucket}: n={self.count}, avg={self.avg}"
+    
+    @property
+    def avg(self):
+        return self.value_sum / self.count if self.count else None
+    
+    @property
+    def stddev(self):
+        if not self.count:
+            return None
+        variance = self.value_sum_sq / self.count - (self.value_sum / self.count) ** 2
+        return max(variance, 0) ** 0.5
+
+
+class SensorReadingHourly(SensorRollup):
+    """Hourly reading aggregates per sensor"""
+    
+    class Meta(SensorRollup.Meta):
+        verbose_name = 'Sensor reading (hourly)'
+        verbose_name_plural = 'Sensor readings (hourly)'
+
+
+class SensorReadingDaily(SensorRollup):
+    """Daily reading aggregates per sensor"""
+    
+    class Meta(SensorRollup.Meta):
+        verbose_name = 'Sensor reading (daily)'
+        verbose_name_plural = 'Sensor readings (daily)'
+
+
+class RollupCheckpoint(models.Model):
+    """Watermark of the last SensorReading id folded into the rollup tables"""
+    name = models.CharField(max_length=50, unique=True)
+    last_reading_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name}: {self.last_reading_id}"
+
+
 class WeatherData(models.Model):
     """Model for weather data from external API"""
     location = models.CharField(max_length=100, default='Tashkent')
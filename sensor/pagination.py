@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class SensorReadingCursorPagination(CursorPagination):
+    """Keyset pagination for sensor readings, served by the (sensor, -timestamp) index"""
+    ordering = '-timestamp'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
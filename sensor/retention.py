@@ -0,0 +1,150 @@
+"""
+Sensor Retention Module
+Compacts old raw readings into rollups and deletes expired rows in small batches.
+"""
+
+import logging
+import time
+from datetime import timedelta
+from typing import Dict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import SensorType, SensorReading, SensorReadingHourly, SensorReadingDaily
+from .rollups import rollup_pending, get_watermark
+
+logger = logging.getLogger(__name__)
+
+RETENTION_SETTINGS = getattr(settings, 'SENSOR_RETENTION', {})
+BATCH_SIZE = RETENTION_SETTINGS.get('BATCH_SIZE', 1000)
+BATCH_PAUSE_SECONDS = RETENTION_SETTINGS.get('BATCH_PAUSE_SECONDS', 0.05)
+
+
+def database_size() -> Dict:
+    """Page statistics of the SQLite database (empty dict for other backends)"""
+    if connection.vendor != 'sqlite':
+        return {}
+
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA page_size')
+        page_size = cursor.fetchone()[0]
+        cursor.execute('PRAGMA page_count')
+        page_count = cursor.fetchone()[0]
+        cursor.execute('PRAGMA freelist_count')
+        freelist_count = cursor.fetchone()[0]
+
+    return {
+        'file_bytes': page_size * page_count,
+        'free_bytes': page_size * freelist_count,
+    }
+
+
+def delete_in_batches(queryset, batch_size: int = BATCH_SIZE,
+                      pause: float = BATCH_PAUSE_SECONDS, dry_run: bool = False) -> int:
+    """
+    Delete the rows of a queryset, one short transaction per batch
+
+    Each batch selects at most batch_size primary keys and deletes them, so
+    the write lock is released between batches and ingest can continue.
+
+    Returns:
+        int: Number of rows deleted (or matched, for a dry run)
+    """
+    if dry_run:
+        return queryset.count()
+
+    model = queryset.model
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            deleted += model.objects.filter(pk__in=ids).delete()[0]
+        if pause:
+            time.sleep(pause)
+
+    return deleted
+
+
+def prune_readings(batch_size: int = BATCH_SIZE, pause: float = BATCH_PAUSE_SECONDS,
+                   dry_run: bool = False) -> Dict:
+    """
+    Apply the per-SensorType retention policy
+
+    Pending raw readings are first folded into the rollups. Raw rows are
+    only deleted up to the rollup watermark, so nothing is dropped before
+    it has been counted in the hourly and daily buckets.
+
+    Args:
+        batch_size (int): Rows deleted per transaction
+        pause (float): Seconds to sleep between batches
+        dry_run (bool): Only count the rows that would be deleted
+
+    Returns:
+        dict: Per-type and total row counts, database size before/after
+    """
+    size_before = database_size()
+    if dry_run:
+        # A real run rolls up everything first, so every existing row is eligible
+        rolled_up = 0
+        watermark = SensorReading.objects.aggregate(last=Max('id'))['last'] or 0
+    else:
+        rolled_up = rollup_pending()
+        watermark = get_watermark()
+    now = timezone.now()
+
+    report = {'rolled_up': rolled_up, 'types': [], 'raw': 0, 'hourly': 0, 'daily': 0}
+
+    for sensor_type in SensorType.objects.all():
+        policies = [
+            ('raw', SensorReading.objects.filter(
+                sensor__sensor_type=sensor_type, id__lte=watermark
+            ), 'timestamp', sensor_type.raw_retention_days),
+            ('hourly', SensorReadingHourly.objects.filter(
+                sensor__sensor_type=sensor_type
+            ), 'bucket', sensor_type.hourly_retention_days),
+            ('daily', SensorReadingDaily.objects.filter(
+                sensor__sensor_type=sensor_type
+            ), 'bucket', sensor_type.daily_retention_days),
+        ]
+
+        type_report = {'sensor_type': sensor_type.name}
+        for level, queryset, field, days in policies:
+            if days is None:
+                type_report[level] = 0
+                continue
+            expired = queryset.filter(**{f'{field}__lt': now - timedelta(days=days)})
+            type_report[level] = delete_in_batches(expired, batch_size, pause, dry_run)
+            report[level] += type_report[level]
+
+        if any(type_report[level] for level in ('raw', 'hourly', 'daily')):
+            logger.info(f"Retention {sensor_type.name}: {type_report}")
+        report['types'].append(type_report)
+
+    size_after = database_size()
+    if size_before and size_after:
+        report['bytes_reclaimed'] = max(size_after['free_bytes'] - size_before['free_bytes'], 0)
+        report['file_bytes'] = size_after['file_bytes']
+
+    return report
+
+
+def vacuum() -> int:
+    """
+    Return free pages to the filesystem (SQLite only)
+
+    Returns:
+        int: Bytes by which the database file shrank
+    """
+    before = database_size()
+    if not before:
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM')
+
+    return before['file_bytes'] - database_size()['file_bytes']
@@ -0,0 +1,238 @@
+"""
+Sensor Rollup Module
+Incremental hourly/daily aggregates of SensorReading for statistics and charts.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .models import SensorReading, SensorReadingHourly, SensorReadingDaily, RollupCheckpoint
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_SETTINGS = getattr(settings, 'SENSOR_ROLLUPS', {})
+BATCH_SIZE = ROLLUP_SETTINGS.get('BATCH_SIZE', 5000)
+
+CHECKPOINT_NAME = 'sensor_readings'
+
+RESOLUTIONS = {
+    'hour': (SensorReadingHourly, TruncHour),
+    'day': (SensorReadingDaily, TruncDay),
+}
+
+AGGREGATES = {
+    'count': Count('id'),
+    'value_sum': Sum('value'),
+    'min_value': Min('value'),
+    'max_value': Max('value'),
+    'value_sum_sq': Sum(F('value') * F('value')),
+}
+
+ROLLUP_AGGREGATES = {
+    'count': Sum('count'),
+    'value_sum': Sum('value_sum'),
+    'min_value': Min('min_value'),
+    'max_value': Max('max_value'),
+    'value_sum_sq': Sum('value_sum_sq'),
+}
+
+
+def get_watermark() -> int:
+    """Return the last SensorReading id already folded into the rollups"""
+    checkpoint = RollupCheckpoint.objects.filter(name=CHECKPOINT_NAME).first()
+    return checkpoint.last_reading_id if checkpoint else 0
+
+
+def merge_stats(a: Optional[Dict], b: Optional[Dict]) -> Optional[Dict]:
+    """Combine two count/sum/min/max/sum_sq aggregates"""
+    if not a or not a.get('count'):
+        return b
+    if not b or not b.get('count'):
+        return a
+    return {
+        'count': a['count'] + b['count'],
+        'value_sum': a['value_sum'] + b['value_sum'],
+        'min_value': min(a['min_value'], b['min_value']),
+        'max_value': max(a['max_value'], b['max_value']),
+        'value_sum_sq': a['value_sum_sq'] + b['value_sum_sq'],
+    }
+
+
+def _upsert_buckets(model, rows: List[Dict]):
+    """Add freshly aggregated rows onto existing buckets of the rollup model"""
+    if not rows:
+        return
+
+    keys = {(row['sensor_id'], row['bucket']) for row in rows}
+    existing = {
+        (rollup.sensor_id, rollup.bucket): rollup
+        for rollup in model.objects.filter(
+            sensor_id__in={sensor_id for sensor_id, _ in keys},
+            bucket__in={bucket for _, bucket in keys}
+        )
+    }
+
+    merged = {}
+    for row in rows:
+        key = (row['sensor_id'], row['bucket'])
+        current = merged.get(key)
+        if current is None and key in existing:
+            rollup = existing[key]
+            current = {field: getattr(rollup, field) for field in AGGREGATES}
+        merged[key] = merge_stats(current, {field: row[field] for field in AGGREGATES})
+
+    model.objects.bulk_create(
+        [model(sensor_id=sensor_id, bucket=bucket, **stats) for (sensor_id, bucket), stats in merged.items()],
+        update_conflicts=True,
+        unique_fields=['sensor', 'bucket'],
+        update_fields=list(AGGREGATES)
+    )
+
+
+def rollup_batch(batch_size: int = BATCH_SIZE) -> int:
+    """
+    Fold the next batch of new readings into the hourly and daily buckets
+
+    Readings are selected by id above the checkpoint, so late or backdated
+    readings are still counted exactly once. Bucket updates and the
+    checkpoint move commit in one transaction.
+
+    Returns:
+        int: Number of readings processed (0 when up to date)
+    """
+    with transaction.atomic():
+        checkpoint, _ = RollupCheckpoint.objects.get_or_create(name=CHECKPOINT_NAME)
+        start = checkpoint.last_reading_id
+
+        pending = SensorReading.objects.filter(id__gt=start).order_by('id').values_list('id', flat=True)
+        end = next(iter(pending[batch_size - 1:batch_size]), None) or pending.aggregate(end=Max('id'))['end']
+        if end is None:
+            return 0
+
+        batch = SensorReading.objects.filter(id__gt=start, id__lte=end).order_by()
+        processed = batch.count()  # Not end - start: pruned or rolled back ids leave gaps
+        for model, trunc in RESOLUTIONS.values():
+            rows = list(
+                batch.annotate(bucket=trunc('timestamp'))
+                .values('sensor_id', 'bucket')
+                .annotate(**AGGREGATES)
+            )
+            _upsert_buckets(model, rows)
+
+        checkpoint.last_reading_id = end
+        checkpoint.save(update_fields=['last_reading_id', 'updated_at'])
+
+    return processed
+
+
+def rollup_pending(batch_size: int = BATCH_SIZE) -> int:
+    """
+    Process all readings added since the last run, one transaction per batch
+
+    Returns:
+        int: Total number of readings processed
+    """
+    total = 0
+    while True:
+        processed = rollup_batch(batch_size)
+        if not processed:
+            break
+        total += processed
+        logger.info(f"Rolled up {processed} sensor readings (total {total})")
+    return total
+
+
+def _ceil_hour(moment: datetime) -> datetime:
+    """Round an aware datetime up to the next full local hour"""
+    local = timezone.localtime(moment)
+    floor = local.replace(minute=0, second=0, microsecond=0)
+    return floor if floor == local else floor + timedelta(hours=1)
+
+
+def _floor_bucket(moment: datetime, resolution: str) -> datetime:
+    """Start of the local hour or day containing an aware datetime"""
+    local = timezone.localtime(moment).replace(minute=0, second=0, microsecond=0)
+    return local.replace(hour=0) if resolution == 'day' else local
+
+
+def window_statistics(since: datetime, sensor_ids=None) -> Dict[int, Dict]:
+    """
+    Per-sensor count/sum/min/max/sum_sq of readings since a point in time
+
+    Full hours come from SensorReadingHourly. Raw readings are only read for
+    the partial first hour and for rows newer than the rollup checkpoint.
+
+    Args:
+        since (datetime): Window start
+        sensor_ids (iterable): Optional Sensor primary keys to limit to
+
+    Returns:
+        dict: {sensor pk: aggregate dict}
+    """
+    boundary = _ceil_hour(since)
+    watermark = get_watermark()
+
+    rollups = SensorReadingHourly.objects.filter(bucket__gte=boundary)
+    raw = SensorReading.objects.filter(
+        Q(timestamp__gte=since, timestamp__lt=boundary) |
+        Q(id__gt=watermark, timestamp__gte=boundary)
+    )
+    if sensor_ids is not None:
+        rollups = rollups.filter(sensor_id__in=sensor_ids)
+        raw = raw.filter(sensor_id__in=sensor_ids)
+
+    stats = {}
+    for queryset, aggregates in ((rollups, ROLLUP_AGGREGATES), (raw, AGGREGATES)):
+        for row in queryset.order_by().values('sensor_id').annotate(**aggregates):
+            sensor_id = row.pop('sensor_id')
+            stats[sensor_id] = merge_stats(stats.get(sensor_id), row)
+
+    return stats
+
+
+def bucket_series(sensor_id: int, since: datetime, resolution: str = 'hour') -> List[Dict]:
+    """
+    Chart series for one sensor, one point per hour or day
+
+    Args:
+        sensor_id (int): Sensor primary key
+        since (datetime): Series start
+        resolution (str): 'hour' or 'day'
+
+    Returns:
+        list: [{'bucket', 'count', 'avg', 'min', 'max'}] ordered by bucket
+    """
+    model, trunc = RESOLUTIONS[resolution]
+    watermark = get_watermark()
+    start = _floor_bucket(since, resolution)
+
+    buckets = {}
+    rollups = model.objects.filter(sensor_id=sensor_id, bucket__gte=start).values('bucket', *AGGREGATES)
+    tail = (
+        SensorReading.objects.filter(sensor_id=sensor_id, id__gt=watermark, timestamp__gte=start)
+        .order_by()
+        .annotate(bucket=trunc('timestamp'))
+        .values('bucket')
+        .annotate(**AGGREGATES)
+    )
+    for row in list(rollups) + list(tail):
+        bucket = row.pop('bucket')
+        buckets[bucket] = merge_stats(buckets.get(bucket), row)
+
+    return [
+        {
+            'bucket': timezone.localtime(bucket).isoformat(),
+            'count': stats['count'],
+            'avg': round(stats['value_sum'] / stats['count'], 2),
+            'min': stats['min_value'],
+            'max': stats['max_value'],
+        }
+        for bucket, stats in sorted(buckets.items())
+    ]
@@ -5,11 +5,14 @@ urlpatterns = [
     path('sensors/', views.SensorListCreateView.as_view(), name='sensor-list'),
     path('sensors/<int:pk>/', views.SensorDetailView.as_view(), name='sensor-detail'),
     path('readings/', views.SensorReadingListView.as_view(), name='sensor-readings'),
+    path('readings/bulk/', views.bulk_ingest_readings, name='sensor-readings-bulk'),
+    path('readings/export/', views.export_readings, name='sensor-readings-export'),
     path('weather/', views.get_weather_data, name='weather-data'),
     path('weather-forecast/', views.get_weather_forecast, name='weather-forecast'),
     path('dashboard/', views.get_dashboard_data, name='dashboard-data'),
     path('realtime/', views.get_realtime_data, name='realtime-data'),
     path('statistics/', views.get_sensor_statistics, name='sensor-statistics'),
+    path('history/', views.get_sensor_history, name='sensor-history'),
     path('generate-sample-data/', views.generate_sample_data, name='generate-sample-data'),
     path('refresh-sensors/', views.refresh_sensor_data, name='refresh-sensor-data'),
 ]
\ No newline at end of file
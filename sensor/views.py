@@ -1,6 +1,8 @@
 from rest_framework import generics, status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 from django.utils import timezone
 from datetime import timedelta
 import random
@@ -12,23 +14,29 @@ from .serializers import (
     SensorSerializer, SensorTypeSerializer, SensorReadingSerializer,
     WeatherDataSerializer, SystemStatusSerializer, DashboardDataSerializer, WeatherForecastSerializer
 )
+from .ingest import ingest_readings, MAX_BATCH_ROWS
+from .write_buffer import buffer_readings, BufferFull, BUFFER_ENABLED
+from .rollups import window_statistics, bucket_series, RESOLUTIONS
+from .pagination import SensorReadingCursorPagination
+from .export import export_rows, parse_export_time, STREAM_RENDERERS, EXPORT_FORMATS
 
 
 class SensorListCreateView(generics.ListCreateAPIView):
-    queryset = Sensor.objects.all()
+    queryset = Sensor.objects.select_related('sensor_type', 'latest')
     serializer_class = SensorSerializer
 
 
 class SensorDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Sensor.objects.all()
+    queryset = Sensor.objects.select_related('sensor_type', 'latest')
     serializer_class = SensorSerializer
 
 
 class SensorReadingListView(generics.ListCreateAPIView):
     serializer_class = SensorReadingSerializer
+    pagination_class = SensorReadingCursorPagination
     
     def get_queryset(self):
-        queryset = SensorReading.objects.all()
+        queryset = SensorReading.objects.select_related('sensor__sensor_type')
         sensor_id = self.request.query_params.get('sensor_id')
         hours = self.request.query_params.get('hours', 24)
         
@@ -42,6 +50,91 @@ class SensorReadingListView(generics.ListCreateAPIView):
         return queryset
 
 
+@api_view(['POST'])
+def bulk_ingest_readings(request):
+    """Bulk ingest sensor readings as (sensor_id, value, timestamp) tuples"""
+    rows = request.data.get('readings') if isinstance(request.data, dict) else request.data
+
+    if not isinstance(rows, list):
+        return Response({
+            'error': 'readings list is required',
+            'message': 'Ma\'lumotlar ro\'yxati yuborilmadi'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if len(rows) > MAX_BATCH_ROWS:
+        return Response({
+            'error': f'Too many readings in one batch (max {MAX_BATCH_ROWS})',
+            'received': len(rows)
+        }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    try:
+        if BUFFER_ENABLED:
+            # Validated now, written by the write buffer within BUFFER_FLUSH_INTERVAL
+            result = buffer_readings(rows)
+            success = result['queued'] > 0 or not rows
+            success_status = status.HTTP_202_ACCEPTED
+        else:
+            result = ingest_readings(rows)
+            success = result['accepted'] > 0 or not rows
+            success_status = status.HTTP_201_CREATED
+
+        # Partial batches are still accepted - rejected rows are reported per index
+        return Response({
+            'success': success,
+            'received': len(rows),
+            **result,
+            'timestamp': timezone.now().isoformat()
+        }, status=success_status if success else status.HTTP_400_BAD_REQUEST)
+
+    except BufferFull as e:
+        response = Response({
+            'success': False,
+            'error': str(e),
+            'message': 'Server band, keyinroq qayta yuboring'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        response['Retry-After'] = '1'
+        return response
+    except Exception as e:
+        return Response({
+            'success': False,
+            'error': str(e),
+            'message': 'Ma\'lumotlarni saqlashda xatolik'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@require_GET
+def export_readings(request):
+    """
+    Stream sensor reading history as CSV or NDJSON
+    
+    Query params: sensor_id (comma separated), start/end (ISO date or datetime),
+    format (csv | ndjson). A plain Django view, so DRF does not treat
+    'format' as a renderer override.
+    """
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in STREAM_RENDERERS:
+        return JsonResponse({
+            'error': f'Unsupported format: {export_format}',
+            'supported_formats': list(STREAM_RENDERERS)
+        }, status=400)
+    
+    try:
+        start = parse_export_time(request.GET.get('start'))
+        end = parse_export_time(request.GET.get('end'), end_of_day=True)
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'message': 'Sana formati noto\'g\'ri'}, status=400)
+    
+    sensor_ids = [value for value in request.GET.get('sensor_id', '').split(',') if value]
+    
+    response = StreamingHttpResponse(
+        STREAM_RENDERERS[export_format](export_rows(sensor_ids, start, end)),
+        content_type=EXPORT_FORMATS[export_format]
+    )
+    filename = f"sensor_readings_{timezone.localtime():%Y%m%d_%H%M}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
 @api_view(['POST'])
 def generate_sample_data(request):
     """Generate sample sensor data for testing"""
@@ -503,7 +596,7 @@ def get_dashboard_data(request):
         system_status = SystemStatus.objects.first()
         
         # Get all sensors with latest readings
-        sensors = Sensor.objects.all()
+        sensors = Sensor.objects.select_related('sensor_type', 'latest')
         
         # Get latest weather data
         weather = WeatherData.objects.first()
@@ -564,28 +657,27 @@ def get_dashboard_data(request):
 def get_sensor_statistics(request):
     """Get sensor statistics for the last 24 hours"""
     try:
-        sensors = Sensor.objects.all()
+        sensors = Sensor.objects.select_related('sensor_type', 'latest')
+        window = window_statistics(timezone.now() - timedelta(hours=24))
         statistics = []
         
         for sensor in sensors:
-            readings = SensorReading.objects.filter(
-                sensor=sensor,
-                timestamp__gte=timezone.now() - timedelta(hours=24)
-            )
+            stats = window.get(sensor.id)
+            if not stats or not hasattr(sensor, 'latest'):
+                continue
             
-            if readings.exists():
-                values = [r.value for r in readings]
-                stat = {
-                    'sensor_name': sensor.name,
-                    'sensor_icon': sensor.sensor_type.icon,
-                    'current_value': readings.first().value,
-                    'unit': sensor.sensor_type.unit,
-                    'min_value': min(values),
-                    'max_value': max(values),
-                    'avg_value': round(sum(values) / len(values), 2),
-                    'status': _get_sensor_status(sensor, readings.first().value),
-                }
-                statistics.append(stat)
+            current_value = sensor.latest.value
+            stat = {
+                'sensor_name': sensor.name,
+                'sensor_icon': sensor.sensor_type.icon,
+                'current_value': current_value,
+                'unit': sensor.sensor_type.unit,
+                'min_value': stats['min_value'],
+                'max_value': stats['max_value'],
+                'avg_value': round(stats['value_sum'] / stats['count'], 2),
+                'status': _get_sensor_status(sensor, current_value),
+            }
+            statistics.append(stat)
         
         return Response(statistics)
         
@@ -593,6 +685,44 @@ def get_sensor_statistics(request):
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+def get_sensor_history(request):
+    """Chart series for one sensor from the hourly/daily rollups"""
+    try:
+        sensor_id = request.query_params.get('sensor_id')
+        hours = int(request.query_params.get('hours', 24))
+        resolution = request.query_params.get('resolution', 'hour' if hours <= 72 else 'day')
+        
+        if resolution not in RESOLUTIONS:
+            return Response({
+                'error': f'Invalid resolution: {resolution}',
+                'message': "resolution 'hour' yoki 'day' bo'lishi kerak"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        sensor = Sensor.objects.select_related('sensor_type').filter(sensor_id=sensor_id).first()
+        if sensor is None:
+            return Response({
+                'error': f'Unknown sensor_id: {sensor_id}',
+                'message': 'Datchik topilmadi'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        series = bucket_series(sensor.id, timezone.now() - timedelta(hours=hours), resolution)
+        
+        return Response({
+            'sensor_id': sensor.sensor_id,
+            'sensor_name': sensor.name,
+            'unit': sensor.sensor_type.unit,
+            'resolution': resolution,
+            'hours': hours,
+            'series': series,
+        })
+        
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 def _get_sensor_status(sensor, current_value):
     """Determine sensor status based on current value"""
     if sensor.sensor_type.name == 'Soil Moisture':
@@ -650,12 +780,12 @@ def get_realtime_data(request):
     """Get ALWAYS FRESH real-time sensor data - completely dynamic - NEVER FAILS"""
     try:
         # Har gal har bitta sensor uchun YANGI random qiymatlar
-        sensors = Sensor.objects.filter(status='active')
+        sensors = Sensor.objects.filter(status='active').select_related('sensor_type', 'latest')
         
         # Agar bazada sensorlar yo'q bo'lsa, sample data yaratish
         if not sensors.exists():
             generate_sample_data(request)
-            sensors = Sensor.objects.filter(status='active')
+            sensors = Sensor.objects.filter(status='active').select_related('sensor_type', 'latest')
         
         realtime_data = []
         for sensor in sensors:
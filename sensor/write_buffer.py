@@ -0,0 +1,167 @@
+"""
+Sensor Write Buffer Module
+Write-behind queue that batches validated sensor readings into bulk inserts.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import close_old_connections
+
+from .ingest import INGEST_SETTINGS, CHUNK_SIZE, prepare_readings, write_readings
+from .models import SensorReading
+
+logger = logging.getLogger(__name__)
+
+BUFFER_ENABLED = INGEST_SETTINGS.get('BUFFER_ENABLED', True)
+BUFFER_MAX_ROWS = INGEST_SETTINGS.get('BUFFER_MAX_ROWS', 50000)
+BUFFER_FLUSH_ROWS = INGEST_SETTINGS.get('BUFFER_FLUSH_ROWS', 2000)
+BUFFER_FLUSH_INTERVAL = INGEST_SETTINGS.get('BUFFER_FLUSH_INTERVAL', 1.0)
+
+
+class BufferFull(Exception):
+    """Raised when the buffer cannot take a batch without exceeding its capacity"""
+
+    def __init__(self, pending: int, capacity: int):
+        super().__init__(f'Write buffer full ({pending}/{capacity} readings pending)')
+        self.pending = pending
+        self.capacity = capacity
+
+
+class ReadingWriteBuffer:
+    """
+    Bounded in-memory queue of SensorReading rows flushed by a background thread
+
+    A flush happens when flush_rows readings are pending or flush_interval
+    seconds have passed, whichever comes first. Submitting more than
+    max_rows pending readings raises BufferFull so callers can shed load.
+    Pending readings are flushed at interpreter exit; a killed process
+    (SIGKILL, OOM killer) loses them, see SENSOR_INGEST['BUFFER_ENABLED'].
+    """
+
+    def __init__(self, max_rows: int = BUFFER_MAX_ROWS, flush_rows: int = BUFFER_FLUSH_ROWS,
+                 flush_interval: float = BUFFER_FLUSH_INTERVAL, chunk_size: int = CHUNK_SIZE):
+        self.max_rows = max_rows
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.chunk_size = chunk_size
+
+        self._pending: deque = deque()
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()  # One writer at a time (flusher thread or flush())
+        self._thread = None
+        self._stats = {'queued': 0, 'written': 0, 'failed': 0, 'flushes': 0, 'rejected_full': 0}
+
+        atexit.register(self.flush)
+
+    def submit(self, readings: List[Tuple[int, SensorReading]]) -> int:
+        """
+        Queue prepared readings for writing
+
+        Returns:
+            int: Number of readings now pending
+
+        Raises:
+            BufferFull: If the batch does not fit
+        """
+        with self._condition:
+            pending = len(self._pending)
+            if pending + len(readings) > self.max_rows:
+                self._stats['rejected_full'] += len(readings)
+                raise BufferFull(pending, self.max_rows)
+
+            self._pending.extend(readings)
+            self._stats['queued'] += len(readings)
+            if len(self._pending) >= self.flush_rows:
+                self._condition.notify()
+            pending = len(self._pending)
+
+        self._ensure_flusher()
+        return pending
+
+    def _ensure_flusher(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._condition:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='sensor-write-buffer', daemon=True)
+                self._thread.start()
+
+    def _take(self, limit: int) -> List[Tuple[int, SensorReading]]:
+        with self._condition:
+            count = min(limit, len(self._pending))
+            return [self._pending.popleft() for _ in range(count)]
+
+    def _write(self, batch: List[Tuple[int, SensorReading]]):
+        written, rejects = write_readings(batch, self.chunk_size)
+        self._stats['written'] += written
+        self._stats['failed'] += len(rejects)
+        self._stats['flushes'] += 1
+        if rejects:
+            logger.error(f"Write buffer dropped {len(rejects)} readings: {rejects[0]['error']}")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: len(self._pending) >= self.flush_rows, timeout=self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Write buffer flush failed: {e}")
+            finally:
+                close_old_connections()
+
+    def flush(self) -> int:
+        """
+        Write everything pending now, in flush_rows batches
+
+        Returns:
+            int: Number of readings taken from the queue
+        """
+        flushed = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take(self.flush_rows)
+                if not batch:
+                    break
+                self._write(batch)
+                flushed += len(batch)
+        return flushed
+
+    def stats(self) -> Dict:
+        with self._condition:
+            pending = len(self._pending)
+        return {**self._stats, 'pending': pending, 'capacity': self.max_rows}
+
+
+reading_buffer = ReadingWriteBuffer()
+
+
+def buffer_readings(rows: Iterable) -> Dict:
+    """
+    Validate raw rows now and queue the valid readings for a background write
+
+    Args:
+        rows (iterable): [sensor_id, value, timestamp] tuples or dicts
+
+    Returns:
+        dict: Queued count, per-row rejects and the current buffer depth
+
+    Raises:
+        BufferFull: If the buffer cannot take the batch
+    """
+    started = time.monotonic()
+    readings, rejects = prepare_readings(rows)
+    pending = reading_buffer.submit(readings) if readings else reading_buffer.stats()['pending']
+
+    return {
+        'queued': len(readings),
+        'rejected': len(rejects),
+        'rejects': rejects,
+        'pending': pending,
+        'elapsed_ms': round((time.monotonic() - started) * 1000, 1),
+    }